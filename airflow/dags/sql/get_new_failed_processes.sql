@@ -15,6 +15,8 @@ LEFT JOIN
     alert_history ah ON pe.id = ah.process_execution_id
 WHERE 
     pe.success = 'FAILED'
+    -- 파티션 키(start_time) 조건으로 최근 파티션만 조회 (24시간 넘게 실행된 작업까지 포함하도록 여유를 둠)
+    AND pe.start_time > DATE_SUB(NOW(), INTERVAL 7 DAY)
     AND pe.end_time > DATE_SUB(NOW(), INTERVAL 24 HOUR)
     AND ah.id IS NULL  -- 알람 이력이 없는 항목만 선택
 ORDER BY 
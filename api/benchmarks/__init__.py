@@ -0,0 +1 @@
+"""OtelMon API 성능 측정 스크립트 모음 (api 디렉토리에서 python -m benchmarks.<name> 으로 실행)"""
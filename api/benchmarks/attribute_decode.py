@@ -0,0 +1,174 @@
+"""
+수동계측 스팬 속성 → ProcessExecutionData 변환의 이전 방식(if/elif 값 디코딩 + 키별 attributes.get)과
+테이블 방식(ETL_ATTRIBUTE_FIELDS 조회 + 필드별 변환 함수) 비교 마이크로벤치마크
+
+이미 파싱된 Span 메시지를 입력으로 쓰므로 protobuf 파싱 비용은 포함하지 않습니다.
+
+    decode   속성 값 디코딩만 (수동계측 + 자동계측 스팬)
+    convert  디코딩 + ProcessExecutionData 생성 (수동계측 스팬)
+
+사용 예:
+    cd api
+    python -m benchmarks.attribute_decode --traces 1000 --repeat 20
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from opentelemetry.proto.common.v1 import common_pb2
+
+from benchmarks.payloads import make_export_request
+from utils.trace_processor import (
+    ManualSpan,
+    ProcessExecutionData,
+    _decode_proto_attributes,
+    _decode_proto_fields,
+    span_to_execution_data,
+)
+
+
+def _legacy_decode_value(value: common_pb2.AnyValue) -> Any:
+    """이전 방식: oneof 종류별 if/elif (배열/키-값 목록은 None으로 버려짐)"""
+    kind = value.WhichOneof("value")
+    if kind == "string_value":
+        return value.string_value
+    elif kind == "int_value":
+        return value.int_value
+    elif kind == "bool_value":
+        return value.bool_value
+    elif kind == "double_value":
+        return value.double_value
+    return None
+
+
+def _legacy_decode_attributes(attributes) -> Dict[str, Any]:
+    decoded = {}
+    for attr in attributes:
+        value = _legacy_decode_value(attr.value)
+        if value is not None:
+            decoded[attr.key] = value
+    return decoded
+
+
+def _legacy_convert(span, resource_attributes: Dict[str, str]) -> ProcessExecutionData:
+    """이전 방식: 모든 속성을 디코딩한 ManualSpan 생성 후 etl.* 키마다 attributes.get 호출로 개별 변환"""
+    manual_span = ManualSpan(
+        name=span.name,
+        start_time_unix_nano=span.start_time_unix_nano,
+        end_time_unix_nano=span.end_time_unix_nano,
+        failed=False,
+        trace_id=None,
+        fields=_legacy_decode_attributes(span.attributes),
+        resource_attributes=resource_attributes,
+    )
+    attributes = manual_span.fields
+    resource_attributes = manual_span.resource_attributes
+    start_time_str = attributes.get("etl.start_time")
+    end_time_str = attributes.get("etl.end_time")
+    if start_time_str and end_time_str:
+        start_time = datetime.fromisoformat(start_time_str)
+        end_time = datetime.fromisoformat(end_time_str)
+    else:
+        start_time = datetime.fromtimestamp(span.start_time_unix_nano / 1e9)
+        end_time = datetime.fromtimestamp(span.end_time_unix_nano / 1e9)
+    if "etl.platform" in attributes:
+        platform_type = attributes["etl.platform"]
+    elif "airflow" in span.name.lower() or "dag" in attributes.get("etl.group_name", "").lower():
+        platform_type = "AirFlow"
+    else:
+        platform_type = "NiFi"
+    source_count = attributes.get("etl.source_count", None)
+    target_count = attributes.get("etl.target_count", None)
+    if isinstance(source_count, str) and source_count.isdigit():
+        source_count = int(source_count)
+    if isinstance(target_count, str) and target_count.isdigit():
+        target_count = int(target_count)
+    return ProcessExecutionData(
+        host_name=resource_attributes.get("host.name", "unknown"),
+        platform_type=platform_type,
+        group_name=attributes.get("etl.group_name", "unknown"),
+        process_name=attributes.get("etl.process_name", span.name),
+        script_name=attributes.get("etl.script_name", None),
+        success="FAILED" if manual_span.failed else "SUCCESS",
+        start_time=start_time,
+        end_time=end_time,
+        duration_seconds=(end_time - start_time).total_seconds(),
+        error_message=attributes.get("etl.error", None),
+        error_type=attributes.get("etl.error_type", None),
+        source_system_type=attributes.get("etl.source_system_type", None),
+        source_system_name=attributes.get("etl.source_system_name", None),
+        source_endpoint=attributes.get("etl.source_endpoint", None),
+        source_object_name=attributes.get("etl.source_object_name", None),
+        source_count=source_count,
+        target_system_type=attributes.get("etl.target_system_type", None),
+        target_system_name=attributes.get("etl.target_system_name", None),
+        target_endpoint=attributes.get("etl.target_endpoint", None),
+        target_object_name=attributes.get("etl.target_object_name", None),
+        target_count=target_count,
+    )
+
+
+def _table_convert(span, resource_attributes: Dict[str, str]) -> ProcessExecutionData:
+    manual_span = ManualSpan(
+        name=span.name,
+        start_time_unix_nano=span.start_time_unix_nano,
+        end_time_unix_nano=span.end_time_unix_nano,
+        failed=False,
+        trace_id=None,
+        fields=_decode_proto_fields(span.attributes),
+        resource_attributes=resource_attributes,
+    )
+    return span_to_execution_data(manual_span, {})
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", type=int, default=1000)
+    parser.add_argument("--auto-spans", type=int, default=5, help="트레이스당 자동계측 스팬 수")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    request = make_export_request(traces=args.traces, auto_spans_per_trace=args.auto_spans, hosts=1, seed=0)
+    resource_span = request.resource_spans[0]
+    resource_attributes = {attr.key: attr.value.string_value for attr in resource_span.resource.attributes}
+    spans = [span for scope_span in resource_span.scope_spans for span in scope_span.spans]
+    is_manual = [any(attr.key.startswith("etl.") for attr in span.attributes) for span in spans]
+    manual: List = [span for span, flag in zip(spans, is_manual) if flag]
+    auto: List = [span for span, flag in zip(spans, is_manual) if not flag]
+
+    cases = {
+        "decode": (
+            lambda: [_legacy_decode_attributes(span.attributes) for span in spans],
+            lambda: ([_decode_proto_fields(span.attributes) for span in manual],
+                     [_decode_proto_attributes(span.attributes) for span in auto]),
+            len(spans),
+        ),
+        "convert": (
+            lambda: [_legacy_convert(span, resource_attributes) for span in manual],
+            lambda: [_table_convert(span, resource_attributes) for span in manual],
+            len(manual),
+        ),
+    }
+
+    print(f"traces={args.traces} auto_spans={args.auto_spans} repeat={args.repeat}")
+    print(f"{'case':>8} {'spans':>7} | {'legacy us/span':>14} {'table us/span':>14} {'speedup':>8}")
+    for name, (legacy, table, count) in cases.items():
+        legacy_seconds = _measure(legacy, args.repeat)
+        table_seconds = _measure(table, args.repeat)
+        print(f"{name:>8} {count:>7} | {legacy_seconds / count * 1e6:>14.2f} {table_seconds / count * 1e6:>14.2f} "
+              f"{legacy_seconds / table_seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+ResourceSpans 하나의 인라인 처리와 프로세스 풀 처리의 단계별 소요 시간 비교 (DECODE_OFFLOAD_THRESHOLD_BYTES 결정용)
+
+인라인 처리는 전체 시간만큼 이벤트 루프를 막고, 프로세스 풀은 ipc(직렬화/전달) 비용을 더 내는 대신
+이벤트 루프를 막지 않습니다. ipc 비용이 인라인 처리 시간보다 충분히 작아지는 크기(압축 해제 후
+ResourceSpans 크기)가 임계값 후보입니다.
+
+사용 예:
+    cd api
+    python -m benchmarks.decode_offload --traces 10 100 1000 5000 20000
+"""
+import argparse
+import multiprocessing
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.payloads import make_export_request
+from utils.otlp_decoder import extract_resource_spans
+
+
+def _median_ms(samples):
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", type=int, nargs="+", default=[10, 100, 1000, 5000, 20000])
+    parser.add_argument("--auto-spans", type=int, default=5, help="트레이스당 자동계측 스팬 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    # 워커 기동 비용이 측정에 섞이지 않도록 미리 한 번 실행
+    warmup = make_export_request(traces=1, hosts=1).resource_spans[0].SerializeToString()
+    pool.submit(extract_resource_spans, warmup).result()
+
+    print(f"{'traces':>7} {'spans':>8} {'segment KB':>11} | {'parse':>8} {'extract':>8} {'inline ms':>10} | "
+          f"{'pool ms':>8} {'ipc ms':>8}")
+    try:
+        for traces in args.traces:
+            request = make_export_request(traces=traces, auto_spans_per_trace=args.auto_spans, hosts=1, seed=traces)
+            segment = request.resource_spans[0].SerializeToString()
+            spans = traces * (args.auto_spans + 1)
+
+            stages = {"parse": [], "extract": []}
+            inline_totals, pool_totals, ipc_totals = [], [], []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                _, timings = extract_resource_spans(segment)
+                inline_totals.append(time.perf_counter() - started)
+                for stage in stages:
+                    stages[stage].append(timings[stage])
+
+                started = time.perf_counter()
+                _, timings = pool.submit(extract_resource_spans, segment).result()
+                elapsed = time.perf_counter() - started
+                pool_totals.append(elapsed)
+                ipc_totals.append(elapsed - sum(timings.values()))
+
+            print(f"{traces:>7} {spans:>8} {len(segment) / 1024:>11.1f} | "
+                  f"{_median_ms(stages['parse']):>8.2f} {_median_ms(stages['extract']):>8.2f} "
+                  f"{_median_ms(inline_totals):>10.2f} | "
+                  f"{_median_ms(pool_totals):>8.2f} {_median_ms(ipc_totals):>8.2f}")
+    finally:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
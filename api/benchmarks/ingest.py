@@ -0,0 +1,275 @@
+"""
+/exporter/v1/traces 수신 처리량 벤치마크 (단계별 spans/s, 요청 지연 p50/p99, 최대 RSS)
+
+trace_log.traced 형태의 합성 요청(benchmarks.payloads)을 만들어 파이프라인 단계별로 측정합니다.
+단계마다 별도 프로세스에서 실행하므로 RSS는 서로 섞이지 않으며, 입력 준비 후 대비 증가분도 함께 출력합니다.
+
+    decompress  gzip 해제 (StreamingDecompressor)
+    parse       ResourceSpans 단위 protobuf 파싱 (ResourceSpansReader + FromString)
+    extract     실행 정보 추출 (trace_processor.ExecutionExtractor)
+    save        일괄 저장 (ProcessExecutionService.save_executions, SQLite)
+    http        FastAPI 앱 전체 경로 (httpx ASGITransport → lifespan 포함, SQLite)
+
+사용 예 (httpx 필요: pip install httpx):
+    cd api
+    python -m benchmarks.ingest --traces 100 1000 --auto-spans 5 --requests 50
+    python -m benchmarks.ingest --traces 1000 --no-gzip --stages extract save --json-output /tmp/ingest.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.payloads import encode_request, make_export_request
+
+STAGES = ["decompress", "parse", "extract", "save", "http"]
+# 서로 다른 요청 본문 수 (요청마다 새로 생성하지 않고 순환 사용)
+DISTINCT_PAYLOADS = 5
+
+
+def _peak_rss_mb() -> float:
+    # Linux ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _make_requests(args):
+    return [
+        make_export_request(
+            traces=args.traces,
+            auto_spans_per_trace=args.auto_spans,
+            hosts=args.hosts,
+            failure_ratio=args.failure_ratio,
+            seed=seed,
+        )
+        for seed in range(DISTINCT_PAYLOADS)
+    ]
+
+
+def _bench_decompress(args, requests) -> Callable[[], List[float]]:
+    from utils.otlp_decoder import StreamingDecompressor
+
+    bodies = [encode_request(request, gzipped=args.gzip) for request in requests]
+
+    def run():
+        latencies = []
+        for index in range(args.requests):
+            body = bodies[index % len(bodies)]
+            started = time.perf_counter()
+            decompressor = StreamingDecompressor("gzip" if args.gzip else "", sys.maxsize)
+            decompressor.feed(body)
+            decompressor.flush()
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    return run
+
+
+def _bench_parse(args, requests) -> Callable[[], List[float]]:
+    from opentelemetry.proto.trace.v1 import trace_pb2
+    from utils.otlp_decoder import ResourceSpansReader
+
+    payloads = [request.SerializeToString() for request in requests]
+
+    def run():
+        latencies = []
+        for index in range(args.requests):
+            payload = payloads[index % len(payloads)]
+            started = time.perf_counter()
+            reader = ResourceSpansReader()
+            for segment in reader.feed(payload):
+                trace_pb2.ResourceSpans.FromString(segment)
+            reader.close()
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    return run
+
+
+def _bench_extract(args, requests) -> Callable[[], List[float]]:
+    from utils.trace_processor import ExecutionExtractor
+
+    def run():
+        latencies = []
+        for index in range(args.requests):
+            request = requests[index % len(requests)]
+            started = time.perf_counter()
+            extractor = ExecutionExtractor()
+            for resource_span in request.resource_spans:
+                extractor.add_resource_spans(resource_span)
+            extractor.finish()
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    return run
+
+
+def _bench_save(args, requests) -> Callable[[], List[float]]:
+    import migrations
+    from config import get_settings
+    from services.database import ProcessExecutionService
+    from utils.trace_processor import ExecutionExtractor
+
+    def extract(request):
+        extractor = ExecutionExtractor()
+        for resource_span in request.resource_spans:
+            extractor.add_resource_spans(resource_span)
+        return extractor.finish()
+
+    batches = [extract(request) for request in requests]
+    service = ProcessExecutionService(get_settings())
+    migrations.upgrade(service.engine)
+
+    async def save_all():
+        latencies = []
+        for index in range(args.requests):
+            batch = batches[index % len(batches)]
+            started = time.perf_counter()
+            await service.save_executions(batch)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    def run():
+        try:
+            return asyncio.run(save_all())
+        finally:
+            service.dispose()
+
+    return run
+
+
+def _bench_http(args, requests) -> Callable[[], List[float]]:
+    import httpx
+    from main import app
+
+    bodies = [encode_request(request, gzipped=args.gzip) for request in requests]
+    headers = {"Content-Type": "application/x-protobuf"}
+    if args.gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    async def post_all():
+        latencies = []
+        # ASGITransport는 lifespan을 실행하지 않으므로 직접 진입
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for index in range(args.requests):
+                    body = bodies[index % len(bodies)]
+                    started = time.perf_counter()
+                    response = await client.post("/exporter/v1/traces", content=body, headers=headers)
+                    latencies.append(time.perf_counter() - started)
+                    if response.status_code != 200:
+                        raise RuntimeError(f"export failed: {response.status_code} {response.content!r}")
+        return latencies
+
+    return lambda: asyncio.run(post_all())
+
+
+_STAGE_FUNCTIONS = {
+    "decompress": _bench_decompress,
+    "parse": _bench_parse,
+    "extract": _bench_extract,
+    "save": _bench_save,
+    "http": _bench_http,
+}
+
+
+def run_stage(args) -> Dict:
+    """하위 프로세스에서 단계 하나를 측정해 결과 반환"""
+    requests = _make_requests(args)
+    spans_per_request = args.traces * (args.auto_spans + 1)
+    # 모듈 import와 입력 준비까지 끝낸 뒤의 RSS를 기준으로 단계별 증가분 계산
+    run = _STAGE_FUNCTIONS[args.child](args, requests)
+    baseline_rss = _peak_rss_mb()
+
+    latencies = run()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "stage": args.child,
+        "traces": args.traces,
+        "spans_per_request": spans_per_request,
+        "requests": len(latencies),
+        "spans_per_second": spans_per_request * len(latencies) / total if total else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000,
+        "peak_rss_mb": _peak_rss_mb(),
+        "rss_growth_mb": _peak_rss_mb() - baseline_rss,
+    }
+
+
+def _spawn_stage(stage: str, traces: int, args, workdir: str) -> Dict:
+    """단계 하나를 새 프로세스로 실행 (DB/로그는 임시 디렉토리, 기동 시 마이그레이션, gRPC/스풀 비활성화, 메일은 localhost로)"""
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, f'{stage}-{traces}.db')}",
+        LOG_DIR=os.path.join(workdir, "logs"),
+        DB_MIGRATE_ON_START="true",
+        GRPC_ENABLED="false",
+        SPOOL_ENABLED="false",
+        DECODE_WORKERS=str(args.decode_workers),
+        SMTP_SERVER="localhost",
+        SMTP_PORT="1",
+    )
+    command = [
+        sys.executable, "-m", "benchmarks.ingest", "--child", stage,
+        "--traces", str(traces),
+        "--auto-spans", str(args.auto_spans),
+        "--hosts", str(args.hosts),
+        "--requests", str(args.requests),
+        "--failure-ratio", str(args.failure_ratio),
+        "--gzip" if args.gzip else "--no-gzip",
+    ]
+    completed = subprocess.run(command, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"stage {stage} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", type=int, nargs="+", default=[100, 1000], help="요청당 트레이스 수")
+    parser.add_argument("--auto-spans", type=int, default=5, help="트레이스당 자동계측 스팬 수")
+    parser.add_argument("--hosts", type=int, default=2, help="요청당 리소스(호스트) 수")
+    parser.add_argument("--requests", type=int, default=50, help="단계별 측정 요청 수")
+    parser.add_argument("--failure-ratio", type=float, default=0.0,
+                        help="실패 트레이스 비율 (http 단계에서는 알림 발송 시도가 포함됨)")
+    parser.add_argument("--gzip", action=argparse.BooleanOptionalAction, default=True)
+    parser.add_argument("--decode-workers", type=int, default=0, help="http 단계의 DECODE_WORKERS")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--json-output", help="결과를 JSON으로 저장할 경로 (회귀 비교용)")
+    parser.add_argument("--child", choices=STAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.traces = args.traces[0]
+        print(json.dumps(run_stage(args)))
+        return
+
+    results = []
+    print(f"gzip={args.gzip} auto_spans={args.auto_spans} hosts={args.hosts} requests={args.requests}")
+    print(f"{'stage':>10} {'traces':>7} {'spans/req':>9} | {'spans/s':>10} {'p50 ms':>9} {'p99 ms':>9} | "
+          f"{'peak RSS MB':>11} {'growth MB':>9}")
+    with tempfile.TemporaryDirectory(prefix="otelmon-bench-") as workdir:
+        for traces in args.traces:
+            for stage in args.stages:
+                result = _spawn_stage(stage, traces, args, workdir)
+                results.append(result)
+                print(f"{stage:>10} {traces:>7} {result['spans_per_request']:>9} | "
+                      f"{result['spans_per_second']:>10,.0f} {result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} | "
+                      f"{result['peak_rss_mb']:>11.1f} {result['rss_growth_mb']:>9.1f}")
+
+    if args.json_output:
+        with open(args.json_output, "w") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k != "child"}, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+trace_log.traced가 내보내는 형태의 합성 OTLP ExportTraceServiceRequest 생성기
+
+트레이스 하나는 etl.* 속성을 가진 수동계측 루트 스팬 1개와
+requests/SQLAlchemy 자동계측 자식 스팬 N개로 구성됩니다.
+"""
+import gzip
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
+from opentelemetry.proto.common.v1 import common_pb2
+from opentelemetry.proto.trace.v1 import trace_pb2
+
+
+def _key_value(key: str, value) -> common_pb2.KeyValue:
+    """파이썬 값을 OTLP KeyValue로 변환"""
+    attr = common_pb2.KeyValue(key=key)
+    if isinstance(value, bool):
+        attr.value.bool_value = value
+    elif isinstance(value, int):
+        attr.value.int_value = value
+    elif isinstance(value, float):
+        attr.value.double_value = value
+    else:
+        attr.value.string_value = str(value)
+    return attr
+
+
+def _unix_nano(value: datetime) -> int:
+    return int(value.timestamp() * 1e9)
+
+
+def _add_auto_span(scope_span, rnd: random.Random, trace_id: bytes, parent_span_id: bytes,
+                   started: datetime, index: int):
+    """requests 또는 SQLAlchemy 자동계측 자식 스팬 추가"""
+    span_start = started + timedelta(milliseconds=10 * index)
+    span_end = span_start + timedelta(milliseconds=rnd.randint(1, 50))
+    span = scope_span.spans.add(
+        trace_id=trace_id,
+        span_id=os.urandom(8),
+        parent_span_id=parent_span_id,
+        start_time_unix_nano=_unix_nano(span_start),
+        end_time_unix_nano=_unix_nano(span_end),
+        kind=trace_pb2.Span.SPAN_KIND_CLIENT,
+    )
+    if index % 2:
+        span.name = "SELECT otelmon"
+        span.attributes.extend([
+            _key_value("db.system", "mysql"),
+            _key_value("db.name", "otelmon"),
+            _key_value("db.statement", "SELECT id, name FROM source_table WHERE updated_at > %(updated_at)s"),
+            _key_value("net.peer.name", "mariadb"),
+            _key_value("net.peer.port", 3306),
+        ])
+    else:
+        span.name = "GET"
+        span.attributes.extend([
+            _key_value("http.method", "GET"),
+            _key_value("http.url", f"http://apis.data.go.kr/1262000/OverviewEconomicService?pageNo={index}"),
+            _key_value("http.status_code", 200),
+            _key_value("http.response_content_length", rnd.randint(100, 10000)),
+        ])
+
+
+def make_export_request(
+        traces: int = 100,
+        auto_spans_per_trace: int = 5,
+        hosts: int = 2,
+        failure_ratio: float = 0.05,
+        seed: Optional[int] = None,
+    ) -> trace_service_pb2.ExportTraceServiceRequest:
+    """호스트(리소스)별로 트레이스를 나눠 담은 ExportTraceServiceRequest 생성"""
+    rnd = random.Random(seed)
+    request = trace_service_pb2.ExportTraceServiceRequest()
+    now = datetime.now()
+
+    resource_spans = []
+    for host in range(hosts):
+        resource_span = request.resource_spans.add()
+        resource_span.resource.attributes.extend([
+            _key_value("service.name", "trace_log"),
+            _key_value("service.version", "1.0.0"),
+            _key_value("host.name", f"bench-host-{host}"),
+            _key_value("timezone", "Asia/Seoul"),
+        ])
+        manual_scope = resource_span.scope_spans.add()
+        manual_scope.scope.name = "trace_log"
+        auto_scope = resource_span.scope_spans.add()
+        auto_scope.scope.name = "opentelemetry.instrumentation.requests"
+        resource_spans.append((manual_scope, auto_scope))
+
+    for index in range(traces):
+        manual_scope, auto_scope = resource_spans[index % hosts]
+        trace_id = os.urandom(16)
+        root_span_id = os.urandom(8)
+        started = now - timedelta(seconds=index)
+        ended = started + timedelta(seconds=rnd.uniform(0.2, 3.0))
+        failed = rnd.random() < failure_ratio
+
+        # 자식 스팬이 먼저 종료되므로 자동계측 스팬을 먼저 기록
+        for auto_index in range(auto_spans_per_trace):
+            _add_auto_span(auto_scope, rnd, trace_id, root_span_id, started, auto_index)
+
+        span = manual_scope.spans.add(
+            trace_id=trace_id,
+            span_id=root_span_id,
+            name=f"process_{index % 50}",
+            start_time_unix_nano=_unix_nano(started),
+            end_time_unix_nano=_unix_nano(ended),
+            kind=trace_pb2.Span.SPAN_KIND_INTERNAL,
+        )
+        span.attributes.extend([
+            _key_value("etl.platform", "NiFi" if index % 2 else "AirFlow"),
+            _key_value("etl.group_name", f"bench-group-{index % 10}"),
+            _key_value("etl.process_name", f"bench-process-{index % 50}"),
+            _key_value("etl.script_name", "bench_script.py"),
+            _key_value("etl.start_time", started.isoformat()),
+            _key_value("etl.process_count", rnd.randint(1, 10000)),
+            _key_value("etl.source_system_type", "DB"),
+            _key_value("etl.source_system_name", "source-db"),
+            _key_value("etl.source_object_name", "source_table"),
+            _key_value("etl.source_count", str(rnd.randint(1, 10000))),
+            _key_value("etl.target_system_type", "DB"),
+            _key_value("etl.target_system_name", "otelmon"),
+            _key_value("etl.target_object_name", "target_table"),
+            _key_value("etl.target_count", str(rnd.randint(1, 10000))),
+        ])
+        if failed:
+            span.attributes.extend([
+                _key_value("etl.error", "Transform error!"),
+                _key_value("etl.error_type", "ValueError"),
+                _key_value("etl.stacktrace", "Traceback (most recent call last):\n  ...\nValueError: Transform error!"),
+            ])
+            span.status.code = trace_pb2.Status.STATUS_CODE_ERROR
+            span.status.message = "Transform error!"
+        else:
+            span.status.code = trace_pb2.Status.STATUS_CODE_OK
+        span.attributes.extend([
+            _key_value("etl.duration", (ended - started).total_seconds()),
+            _key_value("etl.end_time", ended.isoformat()),
+        ])
+
+    return request
+
+
+def encode_request(request: trace_service_pb2.ExportTraceServiceRequest, gzipped: bool = True) -> bytes:
+    """collector otlphttp exporter와 같은 형태(protobuf, 선택적 gzip)로 직렬화"""
+    payload = request.SerializeToString()
+    return gzip.compress(payload) if gzipped else payload
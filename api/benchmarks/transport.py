@@ -0,0 +1,113 @@
+"""
+OTLP/HTTP(POST /exporter/v1/traces)와 OTLP/gRPC(TraceService/Export) 수신 처리량 비교
+
+실행 중인 API 서버에 같은 gzip 요청 본문을 동시 요청 수(--concurrency)만큼 병렬로 보내고
+요청/초, 스팬/초, 지연 시간 p50/p99를 출력합니다. HTTP는 커넥션 풀(HTTP/1.1, 요청마다 커넥션 하나 점유),
+gRPC는 채널 하나(HTTP/2 커넥션 하나에 요청 다중화)를 사용합니다.
+클라이언트 직렬화 비용이 섞이지 않도록 요청은 미리 직렬화해 둡니다.
+
+사용 예 (HTTP 클라이언트로 httpx 필요: pip install httpx):
+    cd api
+    DATABASE_URL=sqlite:////tmp/otelmon.db DB_MIGRATE_ON_START=true DECODE_WORKERS=0 uvicorn main:app --port 8090 &
+    python -m benchmarks.transport --traces 10 100 --concurrency 1 8 32
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+import grpc
+import httpx
+from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
+
+from benchmarks.payloads import encode_request, make_export_request
+from services.grpc_receiver import TRACE_SERVICE_NAME
+
+
+async def _run(send: Callable[[], Awaitable[None]], requests: int, concurrency: int) -> List[float]:
+    """concurrency개의 작업이 나눠서 총 requests번 전송하고 요청별 지연 시간(초) 반환"""
+    latencies = []
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            await send()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def _report(transport: str, traces: int, spans: int, concurrency: int, latencies: List[float], elapsed: float):
+    latencies = sorted(latencies)
+    p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+    print(f"{transport:>5} {traces:>7} {concurrency:>5} | {len(latencies) / elapsed:>8.1f} "
+          f"{len(latencies) * spans / elapsed:>10.0f} | {statistics.median(latencies) * 1000:>8.1f} {p99 * 1000:>8.1f}")
+
+
+async def bench_http(url: str, body: bytes, requests: int, concurrency: int) -> Tuple[List[float], float]:
+    headers = {"Content-Type": "application/x-protobuf", "Content-Encoding": "gzip"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        async def send():
+            response = await client.post(url, content=body, headers=headers)
+            response.raise_for_status()
+
+        await send()    # 커넥션 수립 비용 제외
+        started = time.perf_counter()
+        latencies = await _run(send, requests, concurrency)
+        return latencies, time.perf_counter() - started
+
+
+async def bench_grpc(target: str, body: bytes, requests: int, concurrency: int) -> Tuple[List[float], float]:
+    async with grpc.aio.insecure_channel(target, compression=grpc.Compression.Gzip) as channel:
+        export = channel.unary_unary(
+            f"/{TRACE_SERVICE_NAME}/Export",
+            request_serializer=None,
+            response_deserializer=trace_service_pb2.ExportTraceServiceResponse.FromString,
+        )
+
+        async def send():
+            await export(body, timeout=60)
+
+        await send()
+        started = time.perf_counter()
+        latencies = await _run(send, requests, concurrency)
+        return latencies, time.perf_counter() - started
+
+
+async def run(args):
+    print(f"{'':>5} {'traces':>7} {'conc':>5} | {'req/s':>8} {'spans/s':>10} | {'p50 ms':>8} {'p99 ms':>8}")
+    for traces in args.traces:
+        request = make_export_request(traces=traces, auto_spans_per_trace=args.auto_spans, hosts=args.hosts, seed=traces)
+        spans = traces * (args.auto_spans + 1)
+        http_body = encode_request(request, gzipped=True)
+        # gRPC는 채널에서 gzip 압축하므로 압축 전 본문 전달
+        grpc_body = encode_request(request, gzipped=False)
+        for concurrency in args.concurrency:
+            if args.http_url:
+                latencies, elapsed = await bench_http(args.http_url, http_body, args.requests, concurrency)
+                _report("http", traces, spans, concurrency, latencies, elapsed)
+            if args.grpc_target:
+                latencies, elapsed = await bench_grpc(args.grpc_target, grpc_body, args.requests, concurrency)
+                _report("grpc", traces, spans, concurrency, latencies, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--http-url", default="http://localhost:8090/exporter/v1/traces", help="빈 값이면 HTTP 측정 생략")
+    parser.add_argument("--grpc-target", default="localhost:4317", help="빈 값이면 gRPC 측정 생략")
+    parser.add_argument("--traces", type=int, nargs="+", default=[10, 100, 1000], help="요청당 트레이스 수")
+    parser.add_argument("--auto-spans", type=int, default=5, help="트레이스당 자동계측 스팬 수")
+    parser.add_argument("--hosts", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="측정 조합별 요청 수")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
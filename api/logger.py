@@ -2,46 +2,183 @@ import logging
 import sys
 from pathlib import Path
 import json
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import atexit
 import os
+import queue
+import random
+import threading
+import time
+from datetime import datetime
 
 # 환경 변수에서 로그 디렉토리 가져오기, 기본값은 상대 경로
 LOG_DIR = Path(os.environ.get("LOG_DIR", "./logs"))
 LOG_DIR.mkdir(exist_ok=True)
 
+# 로거 레벨 (DEBUG로 낮추면 요청별 상세 로그까지 기록)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# 파일 로그 형식: json(구조화) 또는 text
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "json").lower()
+# 로그 큐 최대 길이 (가득 차면 요청 처리를 막지 않고 버림)
+LOG_QUEUE_SIZE = int(os.environ.get("LOG_QUEUE_SIZE", "10000"))
+# 요청마다 남는 INFO 로그의 기본 샘플링 비율 (extra={"sample_rate": LOG_SAMPLE_RATE})
+LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", "0.1"))
+# 호출 위치(파일, 줄)별 초당 최대 INFO/DEBUG 로그 수 (0이면 제한 없음, WARNING 이상은 항상 기록)
+LOG_RATE_LIMIT = float(os.environ.get("LOG_RATE_LIMIT", "50"))
+
+# 로그 포맷 (이미지에 표시된 형식)
+log_format = '[%(asctime)s] %(process)d, "%(filename)s", %(lineno)d, %(funcName)s : %(message)s'
+date_format = '%Y/%m/%d %H:%M:%S'
+
+# LogRecord 기본 속성 (이외의 속성은 extra로 넘어온 값)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 기록 (extra로 넘긴 request_id 등도 필드로 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "pid": record.process,
+            "file": record.filename,
+            "line": record.lineno,
+            "func": record.funcName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """INFO/DEBUG 로그 샘플링 및 호출 위치별 초당 건수 제한
+
+    - extra={"sample_rate": 0.1}처럼 넘기면 그 비율만큼만 기록합니다.
+    - 같은 호출 위치에서 초당 rate_limit건을 넘으면 버리고, 버린 건수는 다음에 기록되는 로그의 suppressed 필드로 남깁니다.
+    - WARNING 이상은 항상 기록합니다.
+    """
+
+    def __init__(self, rate_limit: float):
+        super().__init__()
+        self.rate_limit = rate_limit
+        # (경로, 줄) → [남은 토큰, 마지막 갱신 시각, 버린 건수]
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        sample_rate = getattr(record, "sample_rate", 1.0)
+        if sample_rate < 1.0 and random.random() >= sample_rate:
+            return False
+        if self.rate_limit <= 0:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.rate_limit, now, 0]
+            bucket[0] = min(self.rate_limit, bucket[0] + (now - bucket[1]) * self.rate_limit)
+            bucket[1] = now
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """큐에 넣기만 하는 핸들러 (포맷/파일 쓰기는 리스너 스레드에서 수행, 큐가 가득 차면 버림)"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 같은 프로세스의 리스너가 읽으므로 메시지 포맷/복사 없이 그대로 전달
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.dropped:
+            record.dropped = self.dropped
+        try:
+            self.queue.put_nowait(record)
+            self.dropped = 0
+        except queue.Full:
+            self.dropped += 1
+
+
+class RoutingFileHandler(logging.Handler):
+    """로거 이름별 파일({name}.log)로 나눠 기록 (리스너 스레드에서만 호출)"""
+
+    def __init__(self, formatter: logging.Formatter):
+        super().__init__(logging.DEBUG)
+        self.setFormatter(formatter)
+        self._handlers = {}
+
+    def emit(self, record: logging.LogRecord):
+        handler = self._handlers.get(record.name)
+        if handler is None:
+            handler = RotatingFileHandler(
+                LOG_DIR / f"{record.name}.log",
+                maxBytes=10000000,  # 10MB
+                backupCount=9,
+                encoding="utf-8"
+            )
+            handler.setFormatter(self.formatter)
+            self._handlers[record.name] = handler
+        handler.emit(record)
+
+    def close(self):
+        for handler in self._handlers.values():
+            handler.close()
+        super().close()
+
+
+def _create_listener() -> QueueListener:
+    text_formatter = logging.Formatter(log_format, datefmt=date_format)
+
+    # 콘솔 핸들러
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(text_formatter)
+
+    # 파일 핸들러 (로거 이름별 파일)
+    file_handler = RoutingFileHandler(JsonFormatter() if LOG_FORMAT == "json" else text_formatter)
+
+    listener = QueueListener(queue.Queue(LOG_QUEUE_SIZE), console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    # 종료 시 큐에 남은 로그 기록
+    atexit.register(listener.stop)
+    return listener
+
+
+_listener = _create_listener()
+_queue_handler = NonBlockingQueueHandler(_listener.queue)
+_queue_handler.addFilter(SamplingFilter(LOG_RATE_LIMIT))
+
+
 def get_logger(name: str) -> logging.Logger:
-    """지정된 이름으로 로거를 생성합니다."""
+    """지정된 이름으로 로거를 생성합니다. (모든 로거가 하나의 큐/리스너를 공유)"""
     logger = logging.getLogger(name)
-    
+
     # 이미 핸들러가 설정되어 있으면 반환
     if logger.handlers:
         return logger
-        
-    logger.setLevel(logging.DEBUG)  # 로거 레벨 설정
-    
-    # 로그 포맷 (이미지에 표시된 형식)
-    log_format = '[%(asctime)s] %(process)d, "%(filename)s", %(lineno)d, %(funcName)s : %(message)s'
-    date_format = '%Y/%m/%d %H:%M:%S'
-    formatter = logging.Formatter(log_format, datefmt=date_format)
-    
-    # 콘솔 핸들러 추가
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # 파일 핸들러 추가
-    log_file = LOG_DIR / f"{name}.log"
-    file_handler = RotatingFileHandler(
-        log_file, 
-        maxBytes=10000000,  # 10MB
-        backupCount=9,
-        encoding="utf-8"
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
+
+    logger.setLevel(LOG_LEVEL)  # 로거 레벨 설정
+    logger.addHandler(_queue_handler)
     return logger
 
 # 기본 앱 로거
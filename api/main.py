@@ -1,10 +1,14 @@
 import os
+import asyncio
 import logging
 from logging.handlers import RotatingFileHandler
 import configparser
 import uuid
 import time
+import multiprocessing
 from collections.abc import Callable
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
 
 from fastapi import FastAPI, Request, Response, HTTPException
 from fastapi.responses import JSONResponse
@@ -12,11 +16,84 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.encoders import jsonable_encoder
 
-from routers import exporter
-from logger import app_logger
+import migrations
+from routers import executions, exporter, metrics, stats
+from logger import app_logger, LOG_SAMPLE_RATE
+from config import get_settings
+from services.database import ProcessExecutionService
+from services.notification import NotificationService
+from services.partition import PartitionManager
+from services.ingest import IngestService
+from services.grpc_receiver import start_grpc_server
+from services.self_trace import SelfTracer
+from services.spool import Spool
 
-app = FastAPI(title="OTLP Custom Exporter")
+@asynccontextmanager
+async def lifespan(app:FastAPI):
+    """애플리케이션 수명 동안 공유할 서비스 생성 및 종료 시 정리"""
+    settings = get_settings()
+    app.state.db_service = ProcessExecutionService(settings)
+    # 스키마는 배포 단계에서 마이그레이션으로 준비하고 기동 시에는 버전만 확인
+    migrations.ensure_schema(app.state.db_service.engine, apply=settings.DB_MIGRATE_ON_START)
+    app.state.notification_service = NotificationService(settings)
+    # start_time 기준 파티션 관리 및 보존 기간 삭제 (파티션 변환은 migrations upgrade에서 수행, 여기서는 상태만 기록)
+    partition_manager = PartitionManager(settings, app.state.db_service)
+    partition_manager.check()
+    partition_task = asyncio.create_task(partition_manager.run())
+    # 큰 배치의 디코딩을 위한 프로세스 풀 (스레드가 떠 있는 상태에서 fork하지 않도록 spawn 사용)
+    app.state.decode_pool = None
+    if settings.DECODE_WORKERS > 0:
+        app.state.decode_pool = ProcessPoolExecutor(
+            max_workers=settings.DECODE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    # 수신 스풀 (활성화 시 요청은 디스크 기록 후 바로 응답하고 drain 작업이 DB에 저장)
+    spool = None
+    if settings.SPOOL_ENABLED:
+        spool = Spool(settings.SPOOL_DIR, settings.SPOOL_SEGMENT_BYTES, settings.SPOOL_MAX_BYTES)
+        spool.open()
+    # 수신 파이프라인 단계별 소요 시간 샘플링 전송 (수신 경로와 분리된 엔드포인트로만 전송)
+    self_tracer = SelfTracer(settings)
+    # HTTP 엔드포인트와 gRPC 수신기가 공유하는 수신 처리 서비스
+    app.state.ingest_service = IngestService(
+        settings, app.state.db_service, app.state.notification_service, app.state.decode_pool, spool, self_tracer
+    )
+    drain_task = asyncio.create_task(app.state.ingest_service.drain_spool()) if spool is not None else None
+    # 배치 간 연결을 위해 보류한 실행 정보를 TTL 만료 시 저장
+    sweep_task = None
+    if app.state.ingest_service.trace_buffer is not None:
+        sweep_task = asyncio.create_task(app.state.ingest_service.sweep_trace_buffer())
+    app.state.grpc_server = None
+    if settings.GRPC_ENABLED:
+        app.state.grpc_server = await start_grpc_server(settings, app.state.ingest_service)
+    try:
+        yield
+    finally:
+        if app.state.grpc_server is not None:
+            # 처리 중인 요청은 유예 시간 동안 마무리
+            await app.state.grpc_server.stop(grace=5)
+        if drain_task is not None:
+            # 저장 중이던 레코드는 checkpoint 이후이므로 다음 기동 시 다시 처리됨
+            drain_task.cancel()
+            await asyncio.gather(drain_task, return_exceptions=True)
+            await spool.close()
+        if sweep_task is not None:
+            sweep_task.cancel()
+            await asyncio.gather(sweep_task, return_exceptions=True)
+        partition_task.cancel()
+        await asyncio.gather(partition_task, return_exceptions=True)
+        await app.state.ingest_service.flush_trace_buffer()
+        await app.state.ingest_service.close()
+        self_tracer.close()
+        if app.state.decode_pool is not None:
+            app.state.decode_pool.shutdown(wait=True, cancel_futures=True)
+        app.state.db_service.dispose()
+
+app = FastAPI(title="OTLP Custom Exporter", lifespan=lifespan)
 app.include_router(exporter.router)
+app.include_router(metrics.router)
+app.include_router(stats.router)
+app.include_router(executions.router)
 
 
 app.add_middleware(
@@ -43,7 +120,7 @@ async def log_request(request:Request, call_next:Callable) -> Response:
     request_id = str(uuid.uuid4())
     request.state.request_id = request_id
     
-    app_logger.info(
+    app_logger.debug(
         f"Request started: {request.method} {request.url.path}",
         extra={"request_id": request_id}
     )
@@ -52,10 +129,14 @@ async def log_request(request:Request, call_next:Callable) -> Response:
     response = await call_next(request)
     process_time = time.time() - start_time
     
+    # 정상 응답은 샘플링해서 기록, 오류 응답은 항상 기록
     app_logger.info(
         f"Request completed: {request.method} {request.url.path} "
         f"Status: {response.status_code} Duration: {process_time:.3f}s",
-        extra={"request_id": request_id}
+        extra={
+            "request_id": request_id,
+            "sample_rate": LOG_SAMPLE_RATE if response.status_code < 400 else 1.0,
+        }
     )
     
     response.headers["X-Request-ID"] = request_id
@@ -0,0 +1,36 @@
+from prometheus_client import Counter, Histogram
+
+# 요청 본문 크기 버킷 (1KB ~ 64MB, MAX_DECOMPRESSED_BYTES 기본값까지)
+SIZE_BUCKETS = tuple(1024 * 4 ** exponent for exponent in range(9))
+# 단계별 소요 시간 버킷 (0.5ms ~ 10s)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 요청당 스팬 수 버킷 (collector batch send_batch_size 전후)
+SPAN_BUCKETS = (1, 10, 50, 100, 250, 500, 1024, 2048, 5000, 10000, 50000)
+
+# 수신 요청 크기 (wire: 받은 그대로, decoded: 압축 해제 후)
+REQUEST_BYTES = Histogram(
+    "otelmon_ingest_request_bytes", "Export request body size", ["form"], buckets=SIZE_BUCKETS
+)
+# 수신 처리 단계별 소요 시간 (decompress/parse/extract/ipc/persist/notify)
+STAGE_SECONDS = Histogram(
+    "otelmon_ingest_stage_seconds", "Ingest pipeline stage latency", ["stage"], buckets=LATENCY_BUCKETS
+)
+SPANS_PER_BATCH = Histogram(
+    "otelmon_ingest_spans_per_batch", "Spans per export request", buckets=SPAN_BUCKETS
+)
+# 저장하지 않은 스팬 (rejected: etl.* 속성 오류, unlinked_auto: 연결할 수동계측 스팬 없음/trace당 최대 수 초과)
+SPANS_DROPPED = Counter("otelmon_ingest_spans_dropped", "Spans not stored", ["reason"])
+
+# DB 호출 대기 시간 (executor: DB 스레드 풀 대기, connection: 커넥션 풀 checkout)
+DB_WAIT_SECONDS = Histogram(
+    "otelmon_db_wait_seconds", "Time waiting for a DB worker thread or pooled connection", ["resource"],
+    buckets=LATENCY_BUCKETS,
+)
+ROWS_WRITTEN = Counter("otelmon_rows_written", "process_executions rows inserted")
+# 중복으로 저장하지 않은 실행 정보 (cache: 최근 저장 키 캐시, db: 기존 키 조회)
+ROWS_DEDUPLICATED = Counter("otelmon_rows_deduplicated", "Executions skipped as already stored", ["source"])
+
+NOTIFICATIONS = Counter("otelmon_notifications", "Failure notifications", ["channel", "result"])
+
+# 자체 추적 트리 전송 결과 (exported/failed: OTLP 전송, dropped: 전송 큐 가득 참)
+SELF_TRACES = Counter("otelmon_self_traces", "Sampled ingest stage trees sent to the self-tracing endpoint", ["result"])
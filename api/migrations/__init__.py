@@ -0,0 +1,122 @@
+"""
+버전별 스키마 마이그레이션
+
+스키마 변경은 이 패키지에 번호를 붙인 모듈(mNNNN_<설명>.py)로 추가하고, 적용한 버전은 schema_migrations 테이블에 기록합니다.
+각 모듈은 upgrade(connection) 함수를 가지며 모듈 docstring 첫 줄이 설명으로 기록됩니다.
+애플리케이션은 기동 시 스키마를 변경하지 않고 버전만 확인하므로 배포 단계에서 먼저 적용해야 합니다.
+
+    cd api
+    python -m migrations status
+    python -m migrations upgrade
+
+MariaDB의 DDL은 즉시 커밋되어 중간에 실패한 마이그레이션을 되돌릴 수 없으므로,
+upgrade는 컬럼/인덱스 존재 여부를 확인하고 변경해 다시 실행해도 되도록 작성합니다.
+"""
+import importlib
+import pkgutil
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+from typing import List, Optional, Set
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, insert, select
+from sqlalchemy.engine import Engine
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+VERSION_TABLE = "schema_migrations"
+_MODULE_NAME = re.compile(r"^m(\d{4})_\w+$")
+
+schema_migrations = Table(
+    VERSION_TABLE,
+    MetaData(),
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class SchemaOutdatedError(RuntimeError):
+    """DB 스키마가 코드가 기대하는 버전보다 낮음 (python -m migrations upgrade 필요)"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    module: ModuleType
+
+    @property
+    def description(self) -> str:
+        doc = (self.module.__doc__ or "").strip()
+        return doc.splitlines()[0] if doc else ""
+
+
+def discover() -> List[Migration]:
+    """패키지 안의 마이그레이션 모듈을 버전 순서로 반환"""
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        match = _MODULE_NAME.match(module_info.name)
+        if match is None:
+            continue
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        migrations.append(Migration(int(match.group(1)), module_info.name, module))
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"duplicate migration versions: {versions}")
+    return migrations
+
+
+def head() -> int:
+    """코드가 기대하는 스키마 버전 (마지막 마이그레이션 번호)"""
+    migrations = discover()
+    return migrations[-1].version if migrations else 0
+
+
+def applied_versions(engine: Engine) -> Set[int]:
+    """적용된 버전 목록 (schema_migrations 테이블이 없으면 빈 집합)"""
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(VERSION_TABLE):
+            return set()
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending(engine: Engine) -> List[Migration]:
+    """적용되지 않은 마이그레이션 목록"""
+    applied = applied_versions(engine)
+    return [migration for migration in discover() if migration.version not in applied]
+
+
+def upgrade(engine: Engine, target: Optional[int] = None) -> List[Migration]:
+    """target 버전(기본: 마지막)까지 적용되지 않은 마이그레이션을 순서대로 적용하고 적용한 목록 반환"""
+    schema_migrations.create(engine, checkfirst=True)
+    applied = []
+    for migration in pending(engine):
+        if target is not None and migration.version > target:
+            break
+        logger.info(f"마이그레이션 적용: {migration.name} ({migration.description})")
+        with engine.begin() as connection:
+            migration.module.upgrade(connection)
+            connection.execute(insert(schema_migrations).values(
+                version=migration.version, name=migration.name, applied_at=datetime.now()
+            ))
+        applied.append(migration)
+    return applied
+
+
+def ensure_schema(engine: Engine, apply: bool = False):
+    """기동 시 스키마 버전 확인 (apply면 미적용 마이그레이션을 적용, 아니면 SchemaOutdatedError)"""
+    waiting = pending(engine)
+    if not waiting:
+        return
+    if apply:
+        upgrade(engine)
+        return
+    names = ", ".join(migration.name for migration in waiting)
+    raise SchemaOutdatedError(
+        f"database schema is behind by {len(waiting)} migration(s) ({names}); run `python -m migrations upgrade`"
+    )
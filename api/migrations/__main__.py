@@ -0,0 +1,53 @@
+"""
+스키마 마이그레이션 CLI
+
+upgrade는 마이그레이션을 모두 적용한 뒤 MariaDB의 process_executions/process_execution_details가
+아직 파티션 테이블이 아니면 변환합니다 (테이블 복사, PARTITION_CONVERT_MAX_ROWS 이하일 때만).
+버전으로 기록하지 않으므로 한도를 넘어 건너뛴 경우 한도를 올려 다시 실행하면 변환됩니다.
+
+사용 예:
+    cd api
+    python -m migrations status
+    python -m migrations upgrade
+    python -m migrations upgrade --target 2 --database-url sqlite:////tmp/otelmon.db
+"""
+import argparse
+
+from config import get_settings
+from migrations import applied_versions, discover, head, upgrade
+from services.database import ProcessExecutionService
+from services.partition import PartitionManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["status", "upgrade"])
+    parser.add_argument("--database-url", default=None, help="기본값은 설정의 DATABASE_URL")
+    parser.add_argument("--target", type=int, default=None, help="이 버전까지만 적용 (기본: 마지막 버전)")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if args.database_url:
+        settings = settings.model_copy(update={"DATABASE_URL": args.database_url})
+    db_service = ProcessExecutionService(settings)
+    engine = db_service.engine
+    try:
+        if args.command == "upgrade":
+            applied = upgrade(engine, args.target)
+            print(f"applied {len(applied)} migration(s)")
+            for migration in applied:
+                print(f"  {migration.version:04d} {migration.description}")
+            if args.target is None or args.target >= head():
+                # 파티션 변환은 마지막 버전의 테이블/키를 전제로 함
+                PartitionManager(settings, db_service).ensure()
+        else:
+            applied = applied_versions(engine)
+            for migration in discover():
+                state = "applied" if migration.version in applied else "pending"
+                print(f"{migration.version:04d} {state:<8} {migration.description}")
+    finally:
+        db_service.dispose()
+
+
+if __name__ == "__main__":
+    main()
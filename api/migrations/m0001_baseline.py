@@ -0,0 +1,86 @@
+"""마이그레이션 도입 시점의 테이블 생성 (이전에 create_all로 만든 테이블은 그대로 두고 없는 테이블만 생성)
+
+이후 모델이 바뀌어도 이 버전의 결과가 달라지지 않도록 models.telemetry를 쓰지 않고 당시 정의를 그대로 둡니다.
+"""
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Float, Index, Integer, LargeBinary, MetaData, String, Table, Text, UniqueConstraint,
+)
+
+metadata = MetaData()
+
+Table(
+    "process_executions",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("host_name", String(100), nullable=False, index=True),
+    Column("platform_type", String(20), nullable=False, index=True),
+    Column("group_name", String(200), nullable=False, index=True),
+    Column("process_name", String(200), nullable=False, index=True),
+    Column("script_name", String(200), nullable=False, index=True),
+    Column("success", String(10), nullable=False, index=True),
+    Column("error_message", Text, nullable=True),
+    Column("error_type", String(100), nullable=True),
+    Column("source_system_type", String(50), comment='출처시스템타입'),
+    Column("source_system_name", String(100), comment='출처시스템명'),
+    Column("source_endpoint", String(500), comment='출처종료포인트명명'),
+    Column("source_object_name", String(200), comment='출처시스템객체명'),
+    Column("source_count", Integer, comment='출처시스템처리건수'),
+    Column("target_system_type", String(50), comment='대상시스템타입'),
+    Column("target_system_name", String(100), comment='대상시스템명'),
+    Column("target_endpoint", String(500), comment='대상종료포인트명명'),
+    Column("target_object_name", String(200), comment='대상시스템객체명'),
+    Column("target_count", Integer, comment='대상시스템처리건수'),
+    Column("start_time", DateTime, nullable=False, index=True),
+    Column("end_time", DateTime, nullable=False),
+    Column("duration_seconds", Float, nullable=False),
+    Column("trace_id", String(32), nullable=True, comment='트레이스ID(hex)'),
+    Column("span_id", String(16), nullable=True, comment='스팬ID(hex)'),
+    Column("created_at", DateTime),
+    UniqueConstraint("trace_id", "span_id", name="uq_process_executions_trace_span"),
+)
+
+Table(
+    "process_execution_details",
+    metadata,
+    Column("execution_id", Integer, primary_key=True, comment='process_executions.id'),
+    Column("start_time", DateTime, nullable=True, comment='시작시간(파티션 키)'),
+    Column("encoding", String(10), nullable=False, comment='압축방식'),
+    Column("span_count", Integer, nullable=False, comment='자동계측스팬수'),
+    Column("raw_size", Integer, nullable=False, comment='압축전크기'),
+    Column("auto_spans", LargeBinary(16 * 1024 * 1024), nullable=False, comment='자동계측속성(JSON 압축)'),
+)
+
+Table(
+    "process_execution_hourly",
+    metadata,
+    Column("bucket_start", DateTime, primary_key=True, comment='집계시작시각(정시)'),
+    Column("platform_type", String(20), primary_key=True),
+    Column("group_name", String(200), primary_key=True),
+    Column("process_name", String(200), primary_key=True),
+    Column("host_name", String(100), primary_key=True),
+    Column("run_count", Integer, nullable=False, comment='실행수'),
+    Column("failure_count", Integer, nullable=False, comment='실패수'),
+    Column("duration_sum", Float, nullable=False, comment='실행시간합계(초)'),
+    Column("duration_min", Float, nullable=False, comment='최소실행시간(초)'),
+    Column("duration_max", Float, nullable=False, comment='최대실행시간(초)'),
+    Column("source_count_sum", BigInteger, nullable=False, comment='출처시스템처리건수합계'),
+    Column("target_count_sum", BigInteger, nullable=False, comment='대상시스템처리건수합계'),
+    Index("ix_process_execution_hourly_group_process_bucket", "group_name", "process_name", "bucket_start"),
+)
+
+Table(
+    "process_duration_sketches",
+    metadata,
+    Column("bucket_start", DateTime, primary_key=True, comment='집계시작시각(정시)'),
+    Column("platform_type", String(20), primary_key=True),
+    Column("group_name", String(200), primary_key=True),
+    Column("process_name", String(200), primary_key=True),
+    Column("host_name", String(100), primary_key=True),
+    Column("sample_count", Integer, nullable=False, comment='실행수'),
+    Column("sketch", LargeBinary(1024 * 1024), nullable=False, comment='실행시간 DDSketch(utils.ddsketch)'),
+    Index("ix_process_duration_sketches_group_process_bucket", "group_name", "process_name", "bucket_start"),
+)
+
+
+def upgrade(connection):
+    metadata.create_all(connection, checkfirst=True)
@@ -0,0 +1,30 @@
+"""마이그레이션 도입 전 기동 시 보정하던 컬럼 추가 (trace_id/span_id 중복 방지 키, 상세 테이블 start_time)
+
+create_all은 기존 테이블을 변경하지 않아 서비스 기동 시 ALTER로 보정했던 내용이며, 이미 있는 컬럼은 건너뜁니다.
+"""
+from sqlalchemy import inspect, text
+
+from migrations import logger
+
+
+def upgrade(connection):
+    inspector = inspect(connection)
+
+    columns = {column["name"] for column in inspector.get_columns("process_executions")}
+    if "trace_id" not in columns:
+        connection.execute(text("ALTER TABLE process_executions ADD COLUMN trace_id VARCHAR(32) NULL"))
+        connection.execute(text("ALTER TABLE process_executions ADD COLUMN span_id VARCHAR(16) NULL"))
+        connection.execute(text(
+            "CREATE UNIQUE INDEX uq_process_executions_trace_span ON process_executions (trace_id, span_id)"
+        ))
+        logger.info("process_executions에 trace_id/span_id 컬럼 추가")
+
+    columns = {column["name"] for column in inspector.get_columns("process_execution_details")}
+    if "start_time" not in columns:
+        connection.execute(text("ALTER TABLE process_execution_details ADD COLUMN start_time DATETIME NULL"))
+        connection.execute(text(
+            "UPDATE process_execution_details SET start_time = ("
+            "SELECT e.start_time FROM process_executions e WHERE e.id = process_execution_details.execution_id"
+            ") WHERE start_time IS NULL"
+        ))
+        logger.info("process_execution_details에 start_time 컬럼 추가")
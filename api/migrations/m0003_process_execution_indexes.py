@@ -0,0 +1,45 @@
+"""process_executions 단일 컬럼 인덱스를 조회 패턴에 맞춘 복합 인덱스로 교체
+
+컬럼마다 둔 인덱스는 INSERT마다 갱신 비용만 늘리고 실제 조회(상태 + 시간 범위 등)에는 하나씩만 쓰여 범위 조건을 걸러내지 못했습니다.
+
+    (success, end_time)                      알람 DAG: success='FAILED' AND end_time > ... ORDER BY end_time DESC
+    (success, start_time)                    최근 실패 목록: success='FAILED' AND start_time >= ... ORDER BY start_time DESC
+    (group_name, process_name, start_time)   프로세스별 실행 이력: group/process 일치 + start_time 범위/정렬
+    (start_time)                             최근 실행 목록, 보존 기간 삭제 (기존 인덱스 유지)
+
+group_name/success 단독 조건은 복합 인덱스의 앞 컬럼으로 처리되며, host_name/platform_type/script_name 조건은
+시간별 집계 테이블(process_execution_hourly)에서 조회합니다. 인덱스 선택은 benchmarks.query_plans로 확인합니다.
+"""
+from sqlalchemy import Index, MetaData, Table, inspect
+
+from migrations import logger
+
+DROPPED = (
+    "ix_process_executions_host_name",
+    "ix_process_executions_platform_type",
+    "ix_process_executions_group_name",
+    "ix_process_executions_process_name",
+    "ix_process_executions_script_name",
+    "ix_process_executions_success",
+)
+
+CREATED = {
+    "ix_process_executions_success_end_time": ("success", "end_time"),
+    "ix_process_executions_success_start_time": ("success", "start_time"),
+    "ix_process_executions_group_process_start": ("group_name", "process_name", "start_time"),
+}
+
+
+def upgrade(connection):
+    existing = {index["name"] for index in inspect(connection).get_indexes("process_executions")}
+    table = Table("process_executions", MetaData(), autoload_with=connection)
+
+    # 새 인덱스를 먼저 만들어 교체 중에도 조회가 전체 스캔으로 떨어지지 않도록 함
+    for name, columns in CREATED.items():
+        if name not in existing:
+            Index(name, *(table.c[column] for column in columns)).create(connection)
+            logger.info(f"인덱스 생성: {name} {columns}")
+    for index in list(table.indexes):
+        if index.name in DROPPED:
+            index.drop(connection)
+            logger.info(f"인덱스 삭제: {index.name}")
@@ -0,0 +1,87 @@
+"""process_executions.auto_json(이전 자동계측 속성 JSON 문자열)을 process_execution_details로 옮기고 컬럼 삭제
+
+마이그레이션 도입 전에 만든 테이블에만 있는 컬럼이므로 없으면 건너뜁니다. 상세 행이 이미 있는 실행은 옮기지 않으므로
+중간에 실패해도 다시 실행할 수 있습니다. String(4000)에서 잘려 JSON으로 읽을 수 없는 값은 원문을
+{"auto_json": 원문} 한 항목으로 감싸 보존합니다.
+"""
+import json
+from typing import Any, Dict, List
+
+from sqlalchemy import DateTime, Integer, LargeBinary, String, column, inspect, insert, select, table, text
+
+from migrations import logger
+from services.database import AUTO_SPANS_ENCODING, encode_auto_spans
+
+BATCH_SIZE = 1000
+
+executions = table(
+    "process_executions",
+    column("id", Integer),
+    column("start_time", DateTime),
+    column("auto_json", String),
+)
+
+details = table(
+    "process_execution_details",
+    column("execution_id", Integer),
+    column("start_time", DateTime),
+    column("encoding", String),
+    column("span_count", Integer),
+    column("raw_size", Integer),
+    column("auto_spans", LargeBinary),
+)
+
+
+def _auto_spans(auto_json: str) -> List[Dict[str, Any]]:
+    """auto_json 문자열을 자동계측 속성 목록으로 변환 (읽을 수 없으면 원문을 한 항목으로 보존)"""
+    try:
+        value = json.loads(auto_json)
+    except ValueError:
+        return [{"auto_json": auto_json}]
+    if isinstance(value, dict):
+        return [value]
+    if isinstance(value, list) and all(isinstance(item, dict) for item in value):
+        return value
+    return [{"auto_json": auto_json}]
+
+
+def upgrade(connection):
+    columns = {info["name"] for info in inspect(connection).get_columns("process_executions")}
+    if "auto_json" not in columns:
+        return
+
+    moved = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            select(executions.c.id, executions.c.start_time, executions.c.auto_json)
+            .select_from(executions.outerjoin(details, details.c.execution_id == executions.c.id))
+            .where(
+                executions.c.id > last_id,
+                executions.c.auto_json.is_not(None),
+                executions.c.auto_json != "",
+                details.c.execution_id.is_(None),
+            )
+            .order_by(executions.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        values = []
+        for execution_id, start_time, auto_json in rows:
+            auto_spans = _auto_spans(auto_json)
+            compressed, raw_size = encode_auto_spans(auto_spans)
+            values.append({
+                "execution_id": execution_id,
+                "start_time": start_time,
+                "encoding": AUTO_SPANS_ENCODING,
+                "span_count": len(auto_spans),
+                "raw_size": raw_size,
+                "auto_spans": compressed,
+            })
+        connection.execute(insert(details), values)
+        moved += len(values)
+        last_id = rows[-1].id
+
+    connection.execute(text("ALTER TABLE process_executions DROP COLUMN auto_json"))
+    logger.info(f"process_executions.auto_json {moved}건을 process_execution_details로 옮기고 컬럼 삭제")
@@ -1,19 +1,30 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Text, Float, JSON, UniqueConstraint, LargeBinary, Index
 from sqlalchemy.ext.declarative import declarative_base
 
+# 스키마 변경은 migrations 패키지에 새 버전으로 추가 (여기 정의는 ORM 매핑용이며 마이그레이션 결과와 같게 유지)
 Base = declarative_base()
 
 class ProcessExecution(Base):
     __tablename__ = "process_executions"
+    __table_args__ = (
+        # collector 재전송으로 같은 스팬이 다시 들어와도 한 번만 저장
+        # MariaDB 파티션 변환 후에는 기본키가 (id, start_time), 이 키가 (trace_id, span_id, start_time)이 되어 (services.partition)
+        # start_time이 다른 같은 스팬은 DB가 막지 못하므로 저장 전 기존 키 조회(ProcessExecutionService._existing_keys)로만 걸러짐
+        UniqueConstraint("trace_id", "span_id", name="uq_process_executions_trace_span"),
+        # 조회 패턴별 복합 인덱스 (migrations.m0003_process_execution_indexes)
+        Index("ix_process_executions_success_end_time", "success", "end_time"),
+        Index("ix_process_executions_success_start_time", "success", "start_time"),
+        Index("ix_process_executions_group_process_start", "group_name", "process_name", "start_time"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    host_name = Column(String(100), nullable=False, index=True)
-    platform_type = Column(String(20), nullable=False, index=True)  # 'airflow' 또는 'nifi'
-    group_name = Column(String(200), nullable=False, index=True)    # dag_id 또는 process_group
-    process_name = Column(String(200), nullable=False, index=True)  # task_id 또는 processor_name
-    script_name = Column(String(200), nullable=False, index=True)  # script_name
-    success = Column(String(10), nullable=False, index=True)
+    host_name = Column(String(100), nullable=False)
+    platform_type = Column(String(20), nullable=False)  # 'airflow' 또는 'nifi'
+    group_name = Column(String(200), nullable=False)    # dag_id 또는 process_group
+    process_name = Column(String(200), nullable=False)  # task_id 또는 processor_name
+    script_name = Column(String(200), nullable=False)  # script_name
+    success = Column(String(10), nullable=False)
     # attributes = Column(JSON, nullable=True)                        # 추가 속성 정보
     error_message = Column(Text, nullable=True)
     error_type = Column(String(100), nullable=True)
@@ -32,15 +43,75 @@ class ProcessExecution(Base):
     target_object_name = Column(String(200), comment='대상시스템객체명')
     target_count = Column(Integer, comment='대상시스템처리건수')
     
-    # 자동계측 속성
-    auto_json = Column(String(4000), comment='자동계측속성')
-
     start_time = Column(DateTime, nullable=False, index=True)
     end_time = Column(DateTime, nullable=False)
     duration_seconds = Column(Float, nullable=False)
-    # trace_id = Column(String(50), nullable=True, index=True)
-    # span_id = Column(String(50), nullable=True)
+    trace_id = Column(String(32), nullable=True, comment='트레이스ID(hex)')
+    span_id = Column(String(16), nullable=True, comment='스팬ID(hex)')
     created_at = Column(DateTime, default=datetime.now)
     
     def __repr__(self):
         return f"<ProcessExecution(id={self.id}, platform={self.platform_type}, group={self.group_name}, process={self.process_name}, success={self.success})>"
+
+
+class ProcessExecutionDetail(Base):
+    """자동계측 스팬 속성 (조회 시에만 읽도록 process_executions와 분리해 압축 저장)
+
+    MariaDB 파티션 테이블은 외래키를 쓸 수 없으므로 process_executions.id를 외래키 없이 참조하며,
+    같은 start_time 구간으로 파티션해 보존 기간이 지나면 함께 삭제합니다 (services.partition).
+    """
+    __tablename__ = "process_execution_details"
+
+    execution_id = Column(Integer, primary_key=True, comment='process_executions.id')
+    start_time = Column(DateTime, nullable=True, comment='시작시간(파티션 키)')
+    encoding = Column(String(10), nullable=False, comment='압축방식')
+    span_count = Column(Integer, nullable=False, comment='자동계측스팬수')
+    raw_size = Column(Integer, nullable=False, comment='압축전크기')
+    auto_spans = Column(LargeBinary(16 * 1024 * 1024), nullable=False, comment='자동계측속성(JSON 압축)')
+
+    def __repr__(self):
+        return f"<ProcessExecutionDetail(execution_id={self.execution_id}, spans={self.span_count}, size={len(self.auto_spans)}/{self.raw_size})>"
+
+
+class ProcessExecutionHourly(Base):
+    """시간(start_time 기준) × 플랫폼/그룹/프로세스/호스트별 실행 집계 (수신 시 갱신, 원본 보존 기간과 무관하게 유지)"""
+    __tablename__ = "process_execution_hourly"
+    __table_args__ = (
+        # 그룹/프로세스 단위 기간 조회용
+        Index("ix_process_execution_hourly_group_process_bucket", "group_name", "process_name", "bucket_start"),
+    )
+
+    bucket_start = Column(DateTime, primary_key=True, comment='집계시작시각(정시)')
+    platform_type = Column(String(20), primary_key=True)
+    group_name = Column(String(200), primary_key=True)
+    process_name = Column(String(200), primary_key=True)
+    host_name = Column(String(100), primary_key=True)
+    run_count = Column(Integer, nullable=False, default=0, comment='실행수')
+    failure_count = Column(Integer, nullable=False, default=0, comment='실패수')
+    duration_sum = Column(Float, nullable=False, default=0.0, comment='실행시간합계(초)')
+    duration_min = Column(Float, nullable=False, comment='최소실행시간(초)')
+    duration_max = Column(Float, nullable=False, comment='최대실행시간(초)')
+    source_count_sum = Column(BigInteger, nullable=False, default=0, comment='출처시스템처리건수합계')
+    target_count_sum = Column(BigInteger, nullable=False, default=0, comment='대상시스템처리건수합계')
+
+    def __repr__(self):
+        return f"<ProcessExecutionHourly(bucket={self.bucket_start}, group={self.group_name}, process={self.process_name}, runs={self.run_count})>"
+
+
+class ProcessDurationSketch(Base):
+    """시간 × 플랫폼/그룹/프로세스/호스트별 실행 시간 분위수 스케치 (DDSketch 직렬화, 구간/호스트 간 병합해 조회)"""
+    __tablename__ = "process_duration_sketches"
+    __table_args__ = (
+        Index("ix_process_duration_sketches_group_process_bucket", "group_name", "process_name", "bucket_start"),
+    )
+
+    bucket_start = Column(DateTime, primary_key=True, comment='집계시작시각(정시)')
+    platform_type = Column(String(20), primary_key=True)
+    group_name = Column(String(200), primary_key=True)
+    process_name = Column(String(200), primary_key=True)
+    host_name = Column(String(100), primary_key=True)
+    sample_count = Column(Integer, nullable=False, comment='실행수')
+    sketch = Column(LargeBinary(1024 * 1024), nullable=False, comment='실행시간 DDSketch(utils.ddsketch)')
+
+    def __repr__(self):
+        return f"<ProcessDurationSketch(bucket={self.bucket_start}, group={self.group_name}, process={self.process_name}, count={self.sample_count})>"
@@ -0,0 +1,35 @@
+from datetime import datetime
+from typing import Dict, Optional
+
+from fastapi import Request
+
+from services.database import ProcessExecutionService
+from services.ingest import IngestService
+
+
+def get_db_service(request: Request) -> ProcessExecutionService:
+    """lifespan에서 생성한 DB 서비스"""
+    return request.app.state.db_service
+
+
+def get_ingest_service(request: Request) -> IngestService:
+    """lifespan에서 생성한 수신 처리 서비스 (gRPC 수신기와 공유)"""
+    return request.app.state.ingest_service
+
+
+def execution_filters(
+    platform_type: Optional[str] = None,
+    group_name: Optional[str] = None,
+    process_name: Optional[str] = None,
+    host_name: Optional[str] = None,
+) -> Dict[str, str]:
+    """플랫폼/그룹/프로세스/호스트 쿼리 파라미터 중 지정한 것만 컬럼별 조회 조건으로 반환"""
+    values = dict(platform_type=platform_type, group_name=group_name, process_name=process_name, host_name=host_name)
+    return {column: value for column, value in values.items() if value is not None}
+
+
+def local_time(moment: Optional[datetime]) -> Optional[datetime]:
+    """시간대가 있는 값(예: ...Z)은 서버 로컬 시각으로 바꿔 시간대 정보 제거 (DATETIME 컬럼은 로컬 시각)"""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone().replace(tzinfo=None)
@@ -0,0 +1,98 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from routers.dependencies import execution_filters, get_db_service, local_time
+from services.database import ProcessExecutionService
+
+router = APIRouter(prefix="/executions")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(start_time: datetime, execution_id: int) -> str:
+    """페이지 마지막 행의 (start_time, id)를 다음 요청에 넘길 커서 문자열로 변환"""
+    raw = f"{start_time.isoformat()}|{execution_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """encode_cursor로 만든 커서를 (start_time, id)로 복원 (형식이 잘못되면 400)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        start_time, execution_id = raw.split("|")
+        return datetime.fromisoformat(start_time), int(execution_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"invalid cursor: {cursor}")
+
+
+def _page(items: List[Dict[str, Any]], limit: int) -> Dict[str, Any]:
+    """limit + 1건을 조회해 다음 페이지가 있을 때만 커서 반환"""
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1]["start_time"], items[-1]["id"])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def _period(since: Optional[datetime], until: Optional[datetime]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    since, until = local_time(since), local_time(until)
+    if since is not None and until is not None and since >= until:
+        raise HTTPException(status_code=400, detail="since must be earlier than until")
+    return since, until
+
+
+@router.get("")
+async def list_executions(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    filters: Dict[str, str] = Depends(execution_filters),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db_service: ProcessExecutionService = Depends(get_db_service),
+):
+    """실행 정보 목록 (start_time 최신순, since 이상 until 미만)
+
+    다음 페이지는 응답의 next_cursor를 cursor로 넘겨 조회합니다 (마지막 페이지면 null).
+    목록에는 주요 컬럼만 포함되며 전체 컬럼은 /executions/{id}, 자동계측 속성은 /executions/{id}/auto-spans로 조회합니다.
+    """
+    since, until = _period(since, until)
+    after = decode_cursor(cursor) if cursor else None
+    items = await db_service.get_executions(limit + 1, filters, since, until, after)
+    return _page(items, limit)
+
+
+@router.get("/failed")
+async def list_failed_executions(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    filters: Dict[str, str] = Depends(execution_filters),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db_service: ProcessExecutionService = Depends(get_db_service),
+):
+    """실패한 실행 정보 목록 (/executions와 같은 조건/페이지 방식, 오류 메시지는 앞부분만 포함)"""
+    since, until = _period(since, until)
+    after = decode_cursor(cursor) if cursor else None
+    items = await db_service.get_failed_executions(limit + 1, filters, since, until, after)
+    return _page(items, limit)
+
+
+@router.get("/{execution_id}")
+async def get_execution(execution_id: int, db_service: ProcessExecutionService = Depends(get_db_service)):
+    """실행 정보 하나의 전체 컬럼"""
+    execution = await db_service.get_execution(execution_id)
+    if execution is None:
+        raise HTTPException(status_code=404, detail=f"execution not found: {execution_id}")
+    return execution
+
+
+@router.get("/{execution_id}/auto-spans")
+async def get_execution_auto_spans(execution_id: int, db_service: ProcessExecutionService = Depends(get_db_service)):
+    """실행 정보 하나에 연결된 자동계측 스팬 속성 (저장된 것이 없으면 빈 목록)"""
+    auto_spans = await db_service.get_auto_spans(execution_id)
+    return {"execution_id": execution_id, "auto_spans": auto_spans or []}
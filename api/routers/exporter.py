@@ -1,84 +1,63 @@
 import logging
 import json
-import gzip
-from typing import List
-from fastapi import APIRouter, Request, BackgroundTasks, HTTPException, Depends
-from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
-from opentelemetry.proto.trace.v1 import trace_pb2
-from google.protobuf.json_format import MessageToDict
+from fastapi import APIRouter, Request, Response, HTTPException, Depends
 
 from logger import get_logger
 from config import get_settings
-from utils.trace_processor import extract_process_executions
-from services.notification import NotificationService
-from services.database import ProcessExecutionService
-from utils.trace_processor import ProcessExecutionData
+from utils.otlp_response import export_error_response, export_success_response
+from services.ingest import REJECTED_SPANS_MESSAGE, IngestService, classify_error
+from routers.dependencies import get_ingest_service
 router = APIRouter()
 logger = get_logger(__name__)
 
-def get_db_service():
-    return ProcessExecutionService(get_settings())
-
-def get_notification_service():
-    return NotificationService(get_settings())
-
-@router.post("/exporter/v1/traces")
+@router.post("/exporter/v1/traces", response_class=Response)
 async def export_telemetry_data(
     request:Request,
-    background_tasks:BackgroundTasks,
-    db_service:ProcessExecutionService = Depends(get_db_service),
-    notification_service:NotificationService = Depends(get_notification_service),
+    ingest_service:IngestService = Depends(get_ingest_service),
 ):
     """
     OTLP Collector가 POST 방식으로 전송한 텔레메트리 데이터를 수신하는 엔드포인트.
+
+    OTLP/HTTP 스펙에 따라 성공 시 protobuf ExportTraceServiceResponse(거부된 스팬은 partial_success)를,
+    실패 시 google.rpc.Status와 함께 collector가 재시도 여부를 판단할 수 있는 상태 코드를 반환합니다.
     """
+    settings = get_settings()
     try :
-        # 압축된 데이터 수신
-        compressed_content = await request.body()
 
-        # 헤더 정보 출력
-        logger.info(f"Headers: {dict(request.headers)}")
+        # 헤더 정보 출력 (요청마다 남으므로 DEBUG)
+        logger.debug(f"Headers: {dict(request.headers)}")
 
         # 압축 형식 확인
         content_encoding = request.headers.get("content-encoding", "").lower()
-        logger.info(f"Content-Encoding: {content_encoding}")
+        content_type = request.headers.get("content-type", "")
 
-        # 압축 해제
-        if content_encoding == "gzip" or compressed_content.startswith(b"\x1f\x8b\x08") :
-            content = gzip.decompress(compressed_content)
-        else :
-            content = compressed_content
+        # OTLP/HTTP JSON 인코딩은 지원하지 않음 (collector otlphttp exporter 기본값은 protobuf)
+        if "json" in content_type.lower():
+            return export_error_response(415, f"unsupported content type: {content_type}")
 
-        # 데이터 미리보기
-        logger.info(f"Content preview: {content[:50]}")
-        
-        # protobuf 데이터 파싱
-        trace_data = trace_service_pb2.ExportTraceServiceRequest()
-        trace_data.ParseFromString(content)
-        
-        # protobuf 메시지를 dict로 변환
-        json_data = MessageToDict(trace_data)
-        
-        # 디버깅을 위한 로그
-        logger.info(f"Received content type: {request.headers.get('content-type')}")
-        logger.info(f"Raw content length: {len(content)}")
-        # logger.info(f"Converted JSON data: {json.dumps(json_data, ensure_ascii=False, indent=2)}")
+        # 본문을 버퍼링하지 않고 스트림으로 받아 청크 단위 압축 해제 → ResourceSpans 단위 파싱/추출 → 저장
+        # (스풀 사용 시 본문을 디스크에 기록만 하고 응답, 거부된 스팬은 저장 시점에 로그로 남음)
+        result = await ingest_service.accept(request.stream(), content_encoding)
 
-        execution_data_list:List[ProcessExecutionData] = extract_process_executions(json_data)
+        if result is not None and result.decode_result.rejected_spans:
+            return export_success_response(result.decode_result.rejected_spans, REJECTED_SPANS_MESSAGE)
+        return export_success_response()
 
-        logger.info(f"Extracted execution data: {execution_data_list}")
+    except Exception as e :
+        error = classify_error(e)
+        retry_after = settings.EXPORT_RETRY_AFTER_SECONDS if error.retryable else None
+        return export_error_response(error.status_code, error.message, retry_after)
 
-        for execution_data in execution_data_list:
-            execution_id = await db_service.save_execution(execution_data)
-            logger.info(f"Saved execution: {execution_id}")
 
-        # 실패한 작업에 대해 알림 발송
-        for execution_data in execution_data_list:
-            if execution_data.success == "FAILED":
-                background_tasks.add_task(notification_service.notify_failure, execution_data)
-                logger.info('mail send')
-        return {"status": "success", "data": json_data}
+@router.get("/exporter/v1/admission")
+async def admission_stats(ingest_service:IngestService = Depends(get_ingest_service)):
+    """승인 제어 현재 상태(처리 중/대기 중)와 누적 거절 수 (한도 튜닝용)"""
+    return ingest_service.admission.snapshot()
 
-    except Exception as e :
-        logger.error(f"Error parsing trace data: {str(e)}")
-        return {"status": "error", "message": str(e)}
+
+@router.get("/exporter/v1/trace-buffer")
+async def trace_buffer_stats(ingest_service:IngestService = Depends(get_ingest_service)):
+    """배치 간 트레이스 연결 버퍼의 보관 수와 방출/버림 통계 (TTL/한도 튜닝용)"""
+    if ingest_service.trace_buffer is None:
+        return {"enabled": False}
+    return {"enabled": True, **ingest_service.trace_buffer.snapshot()}
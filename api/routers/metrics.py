@@ -0,0 +1,9 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter()
+
+@router.get("/metrics", response_class=Response)
+async def metrics():
+    """Prometheus 수집용 수신 파이프라인 메트릭 (prometheus.yml의 otelmon-api 작업)"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
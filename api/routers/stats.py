@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from routers.dependencies import execution_filters, get_db_service, local_time
+from services.database import ProcessExecutionService
+from services.rollup import HOURLY_DIMENSIONS, hour_bucket, hour_ceiling
+
+router = APIRouter(prefix="/stats")
+
+
+def _period(since: Optional[datetime], until: Optional[datetime], default: timedelta):
+    """조회 구간 (집계가 시간 단위이므로 since는 내림, until은 올림한 정시로 맞춤)"""
+    until = local_time(until) or datetime.now()
+    since = local_time(since) or until - default
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since must be earlier than until")
+    return hour_bucket(since), hour_ceiling(until)
+
+
+def _validate_group_by(group_by: List[str]):
+    invalid = [column for column in group_by if column not in HOURLY_DIMENSIONS]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"group_by must be in {list(HOURLY_DIMENSIONS)}: {invalid}")
+
+
+@router.get("/hourly")
+async def hourly_stats(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    filters: Dict[str, str] = Depends(execution_filters),
+    db_service: ProcessExecutionService = Depends(get_db_service),
+):
+    """시간 구간별 실행/실패 수, 실행 시간, 처리 건수 (기본 최근 24시간, 지정하지 않은 조건은 합산)"""
+    since, until = _period(since, until, timedelta(hours=24))
+    buckets = await db_service.get_rollup_stats(since, until, filters, ["bucket_start"])
+    return {"since": since, "until": until, "buckets": buckets}
+
+
+@router.get("/summary")
+async def summary_stats(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    group_by: List[str] = Query(["group_name", "process_name"]),
+    filters: Dict[str, str] = Depends(execution_filters),
+    db_service: ProcessExecutionService = Depends(get_db_service),
+):
+    """기간 합계를 group_by 컬럼별로 집계 (예: 이번 주 dag별 실패율, 프로세서별 평균 실행 시간, 기본 최근 7일)
+
+    시간 단위로 미리 집계한 행만 읽으므로 정시 단위로 맞춰 조회됩니다 (since는 해당 시각이 속한 정시부터,
+    until은 해당 시각이 속한 구간 끝까지 포함하며 응답의 since/until은 맞춘 값).
+    """
+    _validate_group_by(group_by)
+    since, until = _period(since, until, timedelta(days=7))
+    rows = await db_service.get_rollup_stats(since, until, filters, group_by)
+    return {"since": since, "until": until, "group_by": group_by, "rows": rows}
+
+
+@router.get("/percentiles")
+async def duration_percentiles(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    q: List[float] = Query([0.5, 0.9, 0.99]),
+    group_by: List[str] = Query(["group_name", "process_name"]),
+    filters: Dict[str, str] = Depends(execution_filters),
+    db_service: ProcessExecutionService = Depends(get_db_service),
+):
+    """기간 실행 시간 분위수(기본 p50/p90/p99)를 group_by 컬럼별로 계산 (기본 최근 7일)
+
+    시간별 스케치를 병합하므로 읽는 행 수는 원본 실행 수가 아니라 구간 × 호스트 수에 비례하며,
+    분위수는 DURATION_SKETCH_RELATIVE_ACCURACY 이내의 상대 오차를 가집니다.
+    """
+    _validate_group_by(group_by)
+    if any(not 0 <= quantile <= 1 for quantile in q):
+        raise HTTPException(status_code=400, detail=f"q must be in [0, 1]: {q}")
+    since, until = _period(since, until, timedelta(days=7))
+    rows = await db_service.get_duration_percentiles(since, until, filters, group_by, q)
+    return {"since": since, "until": until, "group_by": group_by, "rows": rows}
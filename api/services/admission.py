@@ -0,0 +1,83 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """동시 처리 한도를 넘어 요청을 받지 않은 경우 (429: 대기열 가득 참, 503: 대기 시간 초과)"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+@dataclass
+class AdmissionStats:
+    """승인 제어 누적 통계 (튜닝용)"""
+    admitted: int = 0
+    rejected_queue_full: int = 0
+    rejected_timeout: int = 0
+    peak_in_flight: int = 0
+    peak_queued: int = 0
+
+
+class AdmissionController:
+    """Export 요청 동시 처리 수와 대기열 길이 제한
+
+    max_in_flight개까지 바로 처리하고, 그 이상은 max_queue개까지 최대 queue_timeout초 대기시킵니다.
+    대기열이 가득 차면 429, 대기 시간을 넘기면 503으로 거절해 collector의 재시도(backoff)에 맡깁니다.
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, queue_timeout: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.queued = 0
+        self.stats = AdmissionStats()
+
+    @asynccontextmanager
+    async def admit(self):
+        """처리 슬롯을 얻을 때까지 대기 (한도를 넘으면 AdmissionRejected)"""
+        if self._semaphore.locked():
+            if self.queued >= self.max_queue:
+                self.stats.rejected_queue_full += 1
+                raise AdmissionRejected(429, f"too many concurrent exports (queue depth {self.queued})")
+            self.queued += 1
+            self.stats.peak_queued = max(self.stats.peak_queued, self.queued)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.stats.rejected_timeout += 1
+                raise AdmissionRejected(503, f"export queued longer than {self.queue_timeout}s")
+            finally:
+                self.queued -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        self.stats.admitted += 1
+        self.stats.peak_in_flight = max(self.stats.peak_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 처리/대기 수와 누적 통계"""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout,
+            **asdict(self.stats),
+        }
@@ -1,11 +1,22 @@
-from sqlalchemy import create_engine
+import asyncio
+import gzip
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, func, insert, or_, select
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError
 from contextlib import contextmanager
-from typing import TypeVar, Type, List, Dict, Any, Generic
+from datetime import datetime
+from typing import TypeVar, Type, List, Dict, Any, Generic, Callable, Optional, Sequence, Set, Tuple
 
 from logger import get_logger
-from models.telemetry import Base, ProcessExecution
+from metrics import DB_WAIT_SECONDS
+from models.telemetry import ProcessDurationSketch, ProcessExecution, ProcessExecutionDetail, ProcessExecutionHourly
+from services.rollup import (
+    aggregate_hourly, check_dialect, hour_bucket, hour_ceiling, merge_duration_sketches, upsert_hourly,
+)
+from utils.ddsketch import DDSketch
 from utils.trace_processor import ProcessExecutionData
 
 logger = get_logger(__name__)
@@ -13,21 +24,98 @@ logger = get_logger(__name__)
 # SQLAlchemy 모델 타입 변수
 T = TypeVar('T')
 
+# 기존 키 조회 시 IN 절 하나에 넣을 (trace_id, span_id) 수
+EXISTING_KEYS_CHUNK = 500
+
+# 목록 조회에서 읽는 컬럼 (오류 메시지 본문, 소스/대상 엔드포인트 등은 단건 조회에서만)
+EXECUTION_LIST_COLUMNS = (
+    "id", "host_name", "platform_type", "group_name", "process_name", "script_name", "success", "error_type",
+    "start_time", "end_time", "duration_seconds", "source_count", "target_count", "trace_id", "span_id",
+)
+# 실패 목록에 포함할 오류 메시지 앞부분 길이
+ERROR_MESSAGE_PREVIEW_CHARS = 500
+
+# 트랜잭션 전체를 다시 실행하면 해소되는 MariaDB 잠금 오류 (1213 교착 상태, 1205 잠금 대기 시간 초과)
+RETRYABLE_LOCK_ERRORS = (1213, 1205)
+
+# 자동계측 속성 압축 방식/수준 (zstd는 별도 패키지가 필요해 표준 라이브러리 gzip 사용)
+AUTO_SPANS_ENCODING = "gzip"
+AUTO_SPANS_COMPRESS_LEVEL = 6
+
+
+def encode_auto_spans(auto_spans: List[Dict[str, Any]]) -> Tuple[bytes, int]:
+    """자동계측 속성 목록을 JSON으로 직렬화해 gzip 압축 (압축 데이터, 압축 전 크기) 반환"""
+    raw = json.dumps(auto_spans, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+    return gzip.compress(raw, compresslevel=AUTO_SPANS_COMPRESS_LEVEL, mtime=0), len(raw)
+
+
+def decode_auto_spans(detail: ProcessExecutionDetail) -> List[Dict[str, Any]]:
+    """process_execution_details 행의 자동계측 속성 목록 복원"""
+    raw = gzip.decompress(detail.auto_spans) if detail.encoding == AUTO_SPANS_ENCODING else detail.auto_spans
+    return json.loads(raw)
+
+
+def is_lock_conflict(error: OperationalError) -> bool:
+    """교착 상태/잠금 대기 시간 초과로 롤백된 트랜잭션인지 확인"""
+    args = getattr(error.orig, "args", ())
+    return bool(args) and args[0] in RETRYABLE_LOCK_ERRORS
+
 class BaseDBService:
     """기본 데이터베이스 서비스"""
     
     def __init__(self, config):
         self.database_url = config.DATABASE_URL
-        self.engine = create_engine(self.database_url)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+        self.engine = create_engine(self.database_url, **self._engine_options(config))
+        # 조회 결과를 executor 스레드 밖(이벤트 루프)에서 읽으므로 커밋 후 만료시키지 않음
+        self.SessionLocal = sessionmaker(bind=self.engine, expire_on_commit=False)
+
+        # 블로킹 DB 호출 전용 스레드 풀 (이벤트 루프를 막지 않도록 여기서만 실행)
+        self.executor = ThreadPoolExecutor(
+            max_workers=config.DB_EXECUTOR_WORKERS,
+            thread_name_prefix="db"
+        )
         
         logger.info(f"데이터베이스 서비스 초기화: {self.database_url}")
 
+    def _engine_options(self, config) -> Dict[str, Any]:
+        """커넥션 풀 옵션 (SQLite는 SQLAlchemy 기본 풀 사용)"""
+        if self.database_url.startswith("sqlite"):
+            return {}
+        return {
+            "pool_size": config.DB_POOL_SIZE,
+            "max_overflow": config.DB_MAX_OVERFLOW,
+            "pool_timeout": config.DB_POOL_TIMEOUT,
+            "pool_recycle": config.DB_POOL_RECYCLE,
+            "pool_pre_ping": config.DB_POOL_PRE_PING,
+        }
+
+    def dispose(self):
+        """DB 스레드 풀과 커넥션 풀 정리 (애플리케이션 종료 시 호출)"""
+        self.executor.shutdown(wait=True)
+        self.engine.dispose()
+        logger.info("데이터베이스 커넥션 풀 정리 완료")
+
+    async def run_sync(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """블로킹 DB 함수를 전용 스레드 풀에서 실행하고 결과를 기다림"""
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+
+        def run():
+            # DB 스레드가 모두 사용 중이면 여기까지 대기 시간이 늘어남
+            DB_WAIT_SECONDS.labels("executor").observe(time.perf_counter() - submitted)
+            return func(*args, **kwargs)
+
+        return await loop.run_in_executor(self.executor, run)
+
     @contextmanager
     def get_session(self):
         """세션 컨텍스트 매니저"""
         session = self.SessionLocal()
         try:
+            # 커넥션 풀 checkout 대기 시간 측정을 위해 커넥션을 먼저 확보 (풀 고갈 시 DB_POOL_TIMEOUT까지 대기)
+            started = time.perf_counter()
+            session.connection()
+            DB_WAIT_SECONDS.labels("connection").observe(time.perf_counter() - started)
             yield session
             session.commit()
         except Exception as e:
@@ -42,45 +130,97 @@ class ProcessExecutionService(BaseDBService):
     
     def __init__(self, config):
         super().__init__(config)
-        # 테이블 생성
-        Base.metadata.create_all(self.engine)
-    
+        check_dialect(self.engine.dialect.name)
+        # 실행 시간 분위수 스케치의 상대 오차
+        self.sketch_relative_accuracy = config.DURATION_SKETCH_RELATIVE_ACCURACY
+
+    @staticmethod
+    def _to_row(execution_data: ProcessExecutionData) -> Dict[str, Any]:
+        """ProcessExecutionData를 process_executions 컬럼 dict로 변환"""
+        return dict(
+            host_name=execution_data.host_name,
+            platform_type=execution_data.platform_type,
+            group_name=execution_data.group_name,
+            process_name=execution_data.process_name,
+            script_name=execution_data.script_name,
+            success=execution_data.success,
+            error_message=execution_data.error_message,
+            error_type=execution_data.error_type,
+            start_time=execution_data.start_time,
+            end_time=execution_data.end_time,
+            duration_seconds=execution_data.duration_seconds,
+            
+            # 소스 시스템 정보
+            source_system_type=execution_data.source_system_type,
+            source_system_name=execution_data.source_system_name,
+            source_endpoint=execution_data.source_endpoint,
+            source_object_name=execution_data.source_object_name,
+            source_count=execution_data.source_count,
+            # 대상 시스템 정보
+            target_system_type=execution_data.target_system_type,
+            target_system_name=execution_data.target_system_name,
+            target_endpoint=execution_data.target_endpoint,
+            target_object_name=execution_data.target_object_name,
+            target_count=execution_data.target_count,
+
+            # 중복 저장 방지 키
+            trace_id=execution_data.trace_id,
+            span_id=execution_data.span_id,
+        )
+
+    @staticmethod
+    def _to_detail_row(execution_id: int, execution_data: ProcessExecutionData) -> Dict[str, Any]:
+        """자동계측 속성을 process_execution_details 컬럼 dict로 변환"""
+        blob, raw_size = encode_auto_spans(execution_data.auto_spans)
+        return dict(
+            execution_id=execution_id,
+            start_time=execution_data.start_time,
+            encoding=AUTO_SPANS_ENCODING,
+            span_count=len(execution_data.auto_spans),
+            raw_size=raw_size,
+            auto_spans=blob,
+        )
+
+    @staticmethod
+    def dedup_key(execution_data: ProcessExecutionData) -> Optional[Tuple[str, str]]:
+        """중복 판단 키 (trace_id/span_id가 없는 실행 정보는 중복 검사 대상 아님)"""
+        if execution_data.trace_id and execution_data.span_id:
+            return execution_data.trace_id, execution_data.span_id
+        return None
+
+    def _existing_keys(self, session, keys: List[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """이미 저장된 (trace_id, span_id) 조회 (배치당 IN 쿼리 몇 번으로 처리)
+
+        (trace_id, span_id) 행 값 IN은 SQLite 등에서 인덱스 탐색 대신 유니크 인덱스 전체를 읽으므로,
+        유니크 키 앞 컬럼인 trace_id로 찾고 span_id는 여기서 거릅니다 (trace_id당 저장되는 스팬은 수동계측 몇 개뿐).
+        파티션 테이블의 유니크 키에는 start_time이 포함되므로, start_time과 무관한 중복 제외는 이 조회가 담당합니다.
+        """
+        existing = set()
+        for start in range(0, len(keys), EXISTING_KEYS_CHUNK):
+            chunk = set(keys[start:start + EXISTING_KEYS_CHUNK])
+            rows = session.execute(
+                select(ProcessExecution.trace_id, ProcessExecution.span_id)
+                .where(ProcessExecution.trace_id.in_({trace_id for trace_id, _ in chunk}))
+            )
+            existing.update(key for key in map(tuple, rows) if key in chunk)
+        return existing
+
     async def save_execution(self, execution_data: ProcessExecutionData) -> int:
         """프로세스 실행 정보를 데이터베이스에 저장"""
+        return await self.run_sync(self._save_execution_sync, execution_data)
+
+    def _save_execution_sync(self, execution_data: ProcessExecutionData) -> int:
+        """save_execution의 블로킹 구현 (DB 스레드 풀에서 실행)"""
         try:
             with self.get_session() as session:
-                execution = ProcessExecution(
-                    host_name=execution_data.host_name,
-                    platform_type=execution_data.platform_type,
-                    group_name=execution_data.group_name,
-                    process_name=execution_data.process_name,
-                    script_name=execution_data.script_name,
-                    success=execution_data.success,
-                    error_message=execution_data.error_message,
-                    error_type=execution_data.error_type,
-                    start_time=execution_data.start_time,
-                    end_time=execution_data.end_time,
-                    duration_seconds=execution_data.duration_seconds,
-                    
-                    # 소스 시스템 정보
-                    source_system_type=execution_data.source_system_type,
-                    source_system_name=execution_data.source_system_name,
-                    source_endpoint=execution_data.source_endpoint,
-                    source_object_name=execution_data.source_object_name,
-                    source_count=execution_data.source_count,
-                    # 대상 시스템 정보
-                    target_system_type=execution_data.target_system_type,
-                    target_system_name=execution_data.target_system_name,
-                    target_endpoint=execution_data.target_endpoint,
-                    target_object_name=execution_data.target_object_name,
-                    target_count=execution_data.target_count,
-
-                    #자동계측 데이터
-                    auto_json=execution_data.auto_json
-                )
+                execution = ProcessExecution(**self._to_row(execution_data))
                 
                 session.add(execution)
                 session.flush()
+                if execution_data.auto_spans:
+                    session.add(ProcessExecutionDetail(**self._to_detail_row(execution.id, execution_data)))
+                upsert_hourly(session, aggregate_hourly([execution_data]))
+                merge_duration_sketches(session, [execution_data], self.sketch_relative_accuracy)
                 
                 logger.info(f"실행 정보 저장 성공: {execution}")
                 return execution.id
@@ -88,37 +228,287 @@ class ProcessExecutionService(BaseDBService):
         except SQLAlchemyError as e:
             logger.error(f"데이터베이스 저장 실패: {str(e)}", exc_info=True)
             raise
+
+    async def save_executions(self, batch: List[ProcessExecutionData]) -> List[Optional[int]]:
+        """실행 정보 배치를 단일 트랜잭션으로 저장 (반환 id는 batch 순서, 이미 저장된 스팬은 None)"""
+        return await self.run_sync(self._save_executions_sync, batch)
+
+    def _save_executions_sync(self, batch: List[ProcessExecutionData]) -> List[Optional[int]]:
+        """한 번의 익스포트에서 추출된 실행 정보들을 단일 트랜잭션, 다중 행 INSERT로 저장
+
+        (trace_id, span_id)가 이미 저장된 실행 정보는 건너뛰며, 반환되는 id 목록은 batch 순서와 같습니다.
+        같은 스팬을 담은 요청이 동시에 저장되어 유니크 제약에 걸리면 기존 키를 다시 조회해 한 번 재시도하고,
+        집계 행 잠금이 교착 상태/대기 시간 초과로 롤백되면 트랜잭션 전체를 한 번 다시 실행합니다.
+        """
+        if not batch:
+            return []
+
+        keys = [self.dedup_key(execution_data) for execution_data in batch]
+        for attempt in range(2):
+            try:
+                return self._insert_new(batch, keys)
+            except IntegrityError as e:
+                if attempt:
+                    logger.error(f"데이터베이스 일괄 저장 실패({len(batch)}건): {str(e)}", exc_info=True)
+                    raise
+                logger.warning(f"중복 키 충돌로 일괄 저장 재시도({len(batch)}건)")
+            except OperationalError as e:
+                if attempt or not is_lock_conflict(e):
+                    logger.error(f"데이터베이스 일괄 저장 실패({len(batch)}건): {str(e)}", exc_info=True)
+                    raise
+                logger.warning(f"잠금 충돌({e.orig.args[0]})로 일괄 저장 재시도({len(batch)}건)")
+            except SQLAlchemyError as e:
+                logger.error(f"데이터베이스 일괄 저장 실패({len(batch)}건): {str(e)}", exc_info=True)
+                raise
+
+    def _insert_new(self, batch: List[ProcessExecutionData], keys: List[Optional[Tuple[str, str]]]) -> List[Optional[int]]:
+        """저장되지 않은 실행 정보만 INSERT하고 batch 순서의 id 목록 반환"""
+        execution_ids: List[Optional[int]] = [None] * len(batch)
+        with self.get_session() as session:
+            # 배치 안의 중복과 이미 저장된 키 제외
+            seen = self._existing_keys(session, [key for key in keys if key is not None])
+            pending = []
+            for index, (execution_data, key) in enumerate(zip(batch, keys)):
+                if key is not None:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                pending.append(index)
+            if not pending:
+                return execution_ids
+
+            rows = [self._to_row(batch[index]) for index in pending]
+            if self.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+                # INSERT ... VALUES (...), (...) ... RETURNING id (insertmanyvalues)
+                result = session.execute(
+                    insert(ProcessExecution).returning(ProcessExecution.id, sort_by_parameter_order=True),
+                    rows
+                )
+                inserted_ids = list(result.scalars())
+            else:
+                # RETURNING 미지원 DB(MariaDB 10.5 미만 등)는 ORM flush로 id 확보
+                executions = [ProcessExecution(**row) for row in rows]
+                session.add_all(executions)
+                session.flush()
+                inserted_ids = [execution.id for execution in executions]
+
+            # 자동계측 속성은 같은 트랜잭션에서 별도 테이블로 저장 (본 테이블 행은 작게 유지)
+            details = [
+                self._to_detail_row(execution_id, batch[index])
+                for index, execution_id in zip(pending, inserted_ids)
+                if batch[index].auto_spans
+            ]
+            if details:
+                session.execute(insert(ProcessExecutionDetail), details)
+            # 새로 저장한 행만 시간별 집계에 반영 (재전송으로 중복 집계되지 않음)
+            new_executions = [batch[index] for index in pending]
+            upsert_hourly(session, aggregate_hourly(new_executions))
+            merge_duration_sketches(session, new_executions, self.sketch_relative_accuracy)
+
+        for index, execution_id in zip(pending, inserted_ids):
+            execution_ids[index] = execution_id
+        logger.debug(f"실행 정보 일괄 저장 성공: {len(inserted_ids)}건 (중복 {len(batch) - len(inserted_ids)}건 제외)")
+        return execution_ids
     
-    async def get_executions(self, limit: int = 100) -> List[ProcessExecution]:
-        """최근 실행 정보 조회"""
+    async def get_executions(
+            self,
+            limit: int = 100,
+            filters: Optional[Dict[str, str]] = None,
+            since: Optional[datetime] = None,
+            until: Optional[datetime] = None,
+            after: Optional[Tuple[datetime, int]] = None,
+        ) -> List[Dict[str, Any]]:
+        """최근 실행 정보 목록 (start_time, id 역순, after 이후 페이지)"""
+        return await self.run_sync(self._get_executions_sync, limit, filters, since, until, after)
+
+    def _get_executions_sync(
+            self,
+            limit: int = 100,
+            filters: Optional[Dict[str, str]] = None,
+            since: Optional[datetime] = None,
+            until: Optional[datetime] = None,
+            after: Optional[Tuple[datetime, int]] = None,
+            failed_only: bool = False,
+        ) -> List[Dict[str, Any]]:
+        """get_executions/get_failed_executions의 블로킹 구현 (DB 스레드 풀에서 실행)
+
+        OFFSET 없이 마지막 행의 (start_time, id) 다음부터 읽으므로 뒤쪽 페이지도 인덱스에서 limit건만 읽습니다.
+        행 값 비교((a, b) < (x, y))는 MariaDB가 범위 탐색에 쓰지 못하므로 start_time 범위 + id 조건으로 풀어 씁니다.
+        """
+        columns = [getattr(ProcessExecution, column) for column in EXECUTION_LIST_COLUMNS]
+        if failed_only:
+            columns.append(func.substr(ProcessExecution.error_message, 1, ERROR_MESSAGE_PREVIEW_CHARS).label("error_message"))
+        query = select(*columns)
+        if failed_only:
+            query = query.where(ProcessExecution.success == "FAILED")
+        query = query.where(*(getattr(ProcessExecution, column) == value for column, value in (filters or {}).items()))
+        if since is not None:
+            query = query.where(ProcessExecution.start_time >= since)
+        if until is not None:
+            query = query.where(ProcessExecution.start_time < until)
+        if after is not None:
+            after_start_time, after_id = after
+            query = query.where(
+                ProcessExecution.start_time <= after_start_time,
+                or_(ProcessExecution.start_time < after_start_time, ProcessExecution.id < after_id),
+            )
+        query = query.order_by(ProcessExecution.start_time.desc(), ProcessExecution.id.desc()).limit(limit)
         try:
             with self.get_session() as session:
-                executions = session.query(ProcessExecution)\
-                    .order_by(ProcessExecution.start_time.desc())\
-                    .limit(limit)\
-                    .all()
-                return executions
+                return [dict(row) for row in session.execute(query).mappings()]
         except SQLAlchemyError as e:
             logger.error(f"실행 정보 조회 실패: {str(e)}", exc_info=True)
             raise
-    
-    async def get_failed_executions(self, days: int = 1) -> List[ProcessExecution]:
-        """최근 N일 내 실패한 실행 정보 조회"""
-        from datetime import datetime, timedelta
-        
+
+    async def get_failed_executions(
+            self,
+            limit: int = 100,
+            filters: Optional[Dict[str, str]] = None,
+            since: Optional[datetime] = None,
+            until: Optional[datetime] = None,
+            after: Optional[Tuple[datetime, int]] = None,
+        ) -> List[Dict[str, Any]]:
+        """실패한 실행 정보 목록 (get_executions와 같은 페이지 방식, 오류 메시지 앞부분 포함)"""
+        return await self.run_sync(self._get_executions_sync, limit, filters, since, until, after, True)
+
+    async def get_execution(self, execution_id: int) -> Optional[Dict[str, Any]]:
+        """실행 정보 하나의 전체 컬럼 (자동계측 속성은 get_auto_spans로 따로 조회)"""
+        return await self.run_sync(self._get_execution_sync, execution_id)
+
+    def _get_execution_sync(self, execution_id: int) -> Optional[Dict[str, Any]]:
+        """get_execution의 블로킹 구현 (DB 스레드 풀에서 실행)"""
         try:
             with self.get_session() as session:
-                since = datetime.now() - timedelta(days=days)
-                
-                executions = session.query(ProcessExecution)\
-                    .filter(ProcessExecution.success == False)\
-                    .filter(ProcessExecution.start_time >= since)\
-                    .order_by(ProcessExecution.start_time.desc())\
-                    .all()
-                return executions
+                row = session.execute(
+                    select(ProcessExecution.__table__).where(ProcessExecution.id == execution_id)
+                ).mappings().first()
+                return dict(row) if row is not None else None
+        except SQLAlchemyError as e:
+            logger.error(f"실행 정보 조회 실패: {str(e)}", exc_info=True)
+            raise
+
+    async def get_auto_spans(self, execution_id: int) -> Optional[List[Dict[str, Any]]]:
+        """실행 정보 하나의 자동계측 속성 조회 (목록 조회에서는 읽지 않고 필요할 때만 로드)"""
+        return await self.run_sync(self._get_auto_spans_sync, execution_id)
+
+    def _get_auto_spans_sync(self, execution_id: int) -> Optional[List[Dict[str, Any]]]:
+        """get_auto_spans의 블로킹 구현 (DB 스레드 풀에서 실행)"""
+        try:
+            with self.get_session() as session:
+                detail = session.get(ProcessExecutionDetail, execution_id)
+                return decode_auto_spans(detail) if detail is not None else None
+        except SQLAlchemyError as e:
+            logger.error(f"자동계측 속성 조회 실패: {str(e)}", exc_info=True)
+            raise
+
+    async def get_rollup_stats(
+            self,
+            since: datetime,
+            until: datetime,
+            filters: Dict[str, str],
+            group_by: Sequence[str],
+        ) -> List[Dict[str, Any]]:
+        """시간별 집계에서 [since, until) 구간을 group_by 컬럼별로 합산 (원본 테이블은 읽지 않음)
+
+        정시 단위 구간만 있으므로 since는 내림, until은 올림한 정시로 맞춰 [hour_bucket(since), hour_ceiling(until))에
+        시작하는 구간을 모두 포함합니다.
+        """
+        return await self.run_sync(self._get_rollup_stats_sync, since, until, filters, group_by)
+
+    def _get_rollup_stats_sync(
+            self,
+            since: datetime,
+            until: datetime,
+            filters: Dict[str, str],
+            group_by: Sequence[str],
+        ) -> List[Dict[str, Any]]:
+        """get_rollup_stats의 블로킹 구현 (DB 스레드 풀에서 실행)"""
+        hourly = ProcessExecutionHourly
+        keys = [getattr(hourly, column) for column in group_by]
+        query = (
+            select(
+                *keys,
+                func.sum(hourly.run_count).label("run_count"),
+                func.sum(hourly.failure_count).label("failure_count"),
+                func.sum(hourly.duration_sum).label("duration_sum"),
+                func.min(hourly.duration_min).label("duration_min"),
+                func.max(hourly.duration_max).label("duration_max"),
+                func.sum(hourly.source_count_sum).label("source_count_sum"),
+                func.sum(hourly.target_count_sum).label("target_count_sum"),
+            )
+            .where(hourly.bucket_start >= hour_bucket(since), hourly.bucket_start < hour_ceiling(until))
+            .where(*(getattr(hourly, column) == value for column, value in filters.items()))
+            .group_by(*keys)
+            .order_by(*keys)
+        )
+        try:
+            with self.get_session() as session:
+                rows = session.execute(query).mappings().all()
+        except SQLAlchemyError as e:
+            logger.error(f"집계 조회 실패: {str(e)}", exc_info=True)
+            raise
+        stats = []
+        for row in rows:
+            row = dict(row)
+            row["failure_rate"] = row["failure_count"] / row["run_count"]
+            row["duration_avg"] = row["duration_sum"] / row["run_count"]
+            stats.append(row)
+        return stats
+
+    async def get_duration_percentiles(
+            self,
+            since: datetime,
+            until: datetime,
+            filters: Dict[str, str],
+            group_by: Sequence[str],
+            quantiles: Sequence[float],
+        ) -> List[Dict[str, Any]]:
+        """[since, until) 구간의 시간별 스케치를 group_by 컬럼별로 병합해 실행 시간 분위수 계산 (원본 테이블은 읽지 않음)
+
+        get_rollup_stats와 같이 [hour_bucket(since), hour_ceiling(until)) 정시 구간으로 맞춰 조회합니다.
+        """
+        return await self.run_sync(self._get_duration_percentiles_sync, since, until, filters, group_by, quantiles)
+
+    def _get_duration_percentiles_sync(
+            self,
+            since: datetime,
+            until: datetime,
+            filters: Dict[str, str],
+            group_by: Sequence[str],
+            quantiles: Sequence[float],
+        ) -> List[Dict[str, Any]]:
+        """get_duration_percentiles의 블로킹 구현 (DB 스레드 풀에서 실행)"""
+        sketches = ProcessDurationSketch
+        keys = [getattr(sketches, column) for column in group_by]
+        query = (
+            select(*keys, sketches.sketch)
+            .where(sketches.bucket_start >= hour_bucket(since), sketches.bucket_start < hour_ceiling(until))
+            .where(*(getattr(sketches, column) == value for column, value in filters.items()))
+        )
+        merged: Dict[Tuple, DDSketch] = {}
+        try:
+            with self.get_session() as session:
+                for row in session.execute(query):
+                    sketch = DDSketch.from_bytes(row[-1])
+                    group = tuple(row[:-1])
+                    if group in merged:
+                        merged[group].merge(sketch)
+                    else:
+                        merged[group] = sketch
         except SQLAlchemyError as e:
-            logger.error(f"실패 정보 조회 실패: {str(e)}", exc_info=True)
+            logger.error(f"분위수 조회 실패: {str(e)}", exc_info=True)
             raise
+        return [
+            {
+                **dict(zip(group_by, group)),
+                "count": sketch.count,
+                "min": sketch.min,
+                "max": sketch.max,
+                "mean": sketch.sum / sketch.count,
+                "quantiles": {f"p{quantile * 100:g}": sketch.quantile(quantile) for quantile in quantiles},
+            }
+            for group, sketch in sorted(merged.items())
+        ]
 
 
 # 새로운 모델에 대한 서비스 클래스 예시
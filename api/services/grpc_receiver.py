@@ -0,0 +1,68 @@
+import grpc
+from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
+
+from logger import get_logger
+from services.ingest import REJECTED_SPANS_MESSAGE, IngestService, classify_error
+from utils.otlp_response import build_export_response, encode_rpc_status, grpc_status_code
+
+logger = get_logger(__name__)
+
+TRACE_SERVICE_NAME = "opentelemetry.proto.collector.trace.v1.TraceService"
+
+# google.rpc.Code 숫자 → grpc.StatusCode
+_STATUS_CODES = {status.value[0]: status for status in grpc.StatusCode}
+
+
+class TraceServiceReceiver:
+    """OTLP/gRPC TraceService/Export 수신기 (HTTP 엔드포인트와 같은 IngestService 사용)
+
+    요청은 역직렬화하지 않은 바이트로 받아 HTTP와 같은 ResourceSpans 단위 디코딩 경로를 탑니다.
+    gzip 압축은 gRPC 계층에서 해제됩니다.
+    """
+
+    def __init__(self, config, ingest_service: IngestService):
+        self.config = config
+        self.ingest_service = ingest_service
+
+    async def export(self, request: bytes, context: grpc.aio.ServicerContext) -> trace_service_pb2.ExportTraceServiceResponse:
+        try:
+            result = await self.ingest_service.accept_bytes(request)
+        except Exception as e:
+            error = classify_error(e)
+            code = grpc_status_code(error.status_code)
+            # UNAVAILABLE은 collector가 재시도하며, RetryInfo가 있으면 그 간격을 따름
+            retry_after = self.config.EXPORT_RETRY_AFTER_SECONDS if error.retryable else None
+            await context.abort(
+                _STATUS_CODES.get(code, grpc.StatusCode.UNKNOWN),
+                error.message,
+                trailing_metadata=(("grpc-status-details-bin", encode_rpc_status(code, error.message, retry_after)),),
+            )
+
+        if result is not None and result.decode_result.rejected_spans:
+            return build_export_response(result.decode_result.rejected_spans, REJECTED_SPANS_MESSAGE)
+        return build_export_response()
+
+    def handler(self) -> grpc.GenericRpcHandler:
+        return grpc.method_handlers_generic_handler(TRACE_SERVICE_NAME, {
+            "Export": grpc.unary_unary_rpc_method_handler(
+                self.export,
+                # 요청은 bytes 그대로 전달 (전체 메시지를 한 번에 파싱하지 않음)
+                request_deserializer=None,
+                response_serializer=trace_service_pb2.ExportTraceServiceResponse.SerializeToString,
+            ),
+        })
+
+
+async def start_grpc_server(config, ingest_service: IngestService) -> grpc.aio.Server:
+    """애플리케이션 이벤트 루프에서 OTLP/gRPC 서버 시작"""
+    server = grpc.aio.server(options=[
+        ("grpc.max_receive_message_length", config.MAX_DECOMPRESSED_BYTES),
+        ("grpc.max_concurrent_streams", config.GRPC_MAX_CONCURRENT_STREAMS),
+        ("grpc.keepalive_time_ms", config.GRPC_KEEPALIVE_TIME_MS),
+    ])
+    server.add_generic_rpc_handlers((TraceServiceReceiver(config, ingest_service).handler(),))
+    address = f"{config.GRPC_HOST}:{config.GRPC_PORT}"
+    server.add_insecure_port(address)
+    await server.start()
+    logger.info(f"OTLP/gRPC receiver listening on {address}")
+    return server
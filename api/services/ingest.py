@@ -0,0 +1,392 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+from google.protobuf.message import DecodeError
+from sqlalchemy.exc import DBAPIError, OperationalError, TimeoutError as PoolTimeoutError
+
+from logger import LOG_SAMPLE_RATE, get_logger
+from metrics import REQUEST_BYTES, ROWS_DEDUPLICATED, ROWS_WRITTEN, SPANS_DROPPED, SPANS_PER_BATCH, STAGE_SECONDS
+from services.admission import AdmissionController, AdmissionRejected
+from services.database import ProcessExecutionService
+from services.notification import NotificationService
+from services.self_trace import SelfTracer
+from services.spool import Spool, SpoolFullError, SpoolPosition, SpoolRecord
+from utils.dedup import DedupCache
+from utils.otlp_decoder import DecodeResult, PayloadTooLargeError, StreamingDecompressor, decode_stream
+from utils.stage_timer import StageTimer
+from utils.trace_buffer import TraceBuffer
+from utils.trace_processor import ProcessExecutionData
+
+logger = get_logger(__name__)
+
+REJECTED_SPANS_MESSAGE = (
+    "spans with etl.* attributes but missing name/timestamps/etl.process_name "
+    "or invalid etl.start_time/etl.end_time"
+)
+
+
+class IngestError(Exception):
+    """수신 처리 실패 (전송 방식과 무관하게 HTTP 상태 코드 기준으로 분류)"""
+
+    def __init__(self, status_code: int, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.retryable = retryable
+
+
+def classify_error(exc: Exception) -> IngestError:
+    """수신 처리 중 발생한 예외를 응답 상태로 변환"""
+    if isinstance(exc, IngestError):
+        return exc
+    if isinstance(exc, PayloadTooLargeError):
+        logger.error(f"Rejected trace data: {str(exc)}")
+        return IngestError(413, str(exc))
+    if isinstance(exc, DecodeError):
+        # 잘못된 protobuf는 재시도해도 동일하므로 재시도 불가로 응답
+        logger.error(f"Error parsing trace data: {str(exc)}")
+        return IngestError(400, f"invalid ExportTraceServiceRequest: {exc}")
+    if isinstance(exc, AdmissionRejected):
+        # 과부하는 collector가 Retry-After 이후 재시도하도록 응답 (경고 로그만)
+        logger.warning(f"Export rejected by admission control: {exc.message}")
+        return IngestError(exc.status_code, exc.message, retryable=True)
+    if isinstance(exc, SpoolFullError):
+        logger.error(f"Spool full: {str(exc)}")
+        return IngestError(503, "ingest spool full", retryable=True)
+    if isinstance(exc, (OperationalError, PoolTimeoutError)):
+        # DB 연결 불가/커넥션 풀 고갈은 일시적인 장애로 보고 collector 재시도에 맡김
+        logger.error(f"Database unavailable: {str(exc)}")
+        return IngestError(503, "database unavailable", retryable=True)
+    if isinstance(exc, DBAPIError):
+        if exc.connection_invalidated:
+            logger.error(f"Database connection lost: {str(exc)}")
+            return IngestError(503, "database connection lost", retryable=True)
+        logger.error(f"Error saving trace data: {str(exc)}")
+        return IngestError(500, "failed to save trace data")
+    logger.error(f"Error processing trace data: {str(exc)}", exc_info=exc)
+    return IngestError(500, "failed to process trace data")
+
+
+@dataclass
+class IngestResult:
+    """한 번의 Export 요청 처리 결과"""
+    decode_result: DecodeResult
+    execution_ids: List[int]
+    # 이미 저장된 스팬이라 건너뛴 수 (재전송 배치)
+    duplicates: int = 0
+
+
+class IngestService:
+    """OTLP Export 요청 공통 처리 (압축 해제/파싱/추출 → 일괄 저장 → 실패 알림)
+
+    HTTP 엔드포인트와 gRPC 수신기가 같은 인스턴스를 공유하며, 두 경로 모두 admission으로 동시 처리 수를 제한합니다.
+    spool이 있으면 요청 본문을 스풀에 기록만 하고 응답하며, drain_spool 작업이 이후에 DB로 저장합니다.
+    trace_buffer가 보류한 실행 정보는 sweep_trace_buffer 작업이 만료 시 저장하며, 스풀 checkpoint는 보류 중인 실행 정보가
+    나온 레코드 앞에서 멈춰 비정상 종료 시 해당 레코드부터 다시 처리합니다. 스풀이 없으면 응답 전에 모두 저장하도록
+    실행 정보를 보류하지 않습니다.
+    self_tracer가 있으면 요청마다 단계별 소요 시간 트리를 만들어 샘플링 전송합니다.
+    """
+
+    def __init__(
+            self,
+            config,
+            db_service: ProcessExecutionService,
+            notification_service: NotificationService,
+            decode_pool: Optional[Executor] = None,
+            spool: Optional[Spool] = None,
+            self_tracer: Optional[SelfTracer] = None,
+        ):
+        self.config = config
+        self.db_service = db_service
+        self.notification_service = notification_service
+        self.decode_pool = decode_pool
+        self.spool = spool
+        self.self_tracer = self_tracer
+        self.admission = AdmissionController(
+            config.ADMISSION_MAX_IN_FLIGHT,
+            config.ADMISSION_MAX_QUEUE,
+            config.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        )
+        # 최근 저장한 (trace_id, span_id) (재전송 배치를 DB 조회 없이 제외)
+        self.dedup_cache = DedupCache(config.DEDUP_CACHE_SIZE)
+        # 배치 간 트레이스 연결 버퍼 (TTL이 0이면 요청 안에서만 연결)
+        self.trace_buffer = TraceBuffer(
+            config.TRACE_BUFFER_TTL_SECONDS,
+            config.TRACE_BUFFER_MAX_TRACES,
+            config.TRACE_BUFFER_MAX_SPANS,
+            config.MAX_AUTO_SPANS_PER_TRACE,
+            config.TRACE_BUFFER_MAX_ORPHAN_SPANS,
+        ) if config.TRACE_BUFFER_TTL_SECONDS > 0 else None
+        # sweep_trace_buffer가 저장 중인 실행 정보의 가장 앞선 origin (저장이 끝날 때까지 checkpoint를 잡아 둠)
+        self._sweep_origin: Optional[SpoolPosition] = None
+        # 응답 이후에도 실행 중인 알림 작업 (GC로 취소되지 않도록 참조 유지)
+        self._notify_tasks: Set[asyncio.Task] = set()
+
+    async def ingest(
+            self,
+            chunks: AsyncIterator[bytes],
+            content_encoding: str = "",
+            trace_origin: Optional[SpoolPosition] = None,
+        ) -> IngestResult:
+        """요청 본문 스트림을 디코딩해 저장하고 실패한 작업의 알림을 예약 (trace_origin은 스풀 레코드 시작 위치)"""
+        stage_timer = self.self_tracer.start("ingest") if self.self_tracer is not None else None
+        try:
+            decode_result = await decode_stream(
+                chunks,
+                content_encoding,
+                self.config.MAX_DECOMPRESSED_BYTES,
+                self.decode_pool,
+                self.config.DECODE_OFFLOAD_THRESHOLD_BYTES,
+                self.config.MAX_AUTO_SPANS_PER_TRACE,
+                self.trace_buffer,
+                stage_timer,
+                trace_origin,
+            )
+            self._observe_decode(decode_result)
+            # 전체 목록 repr은 비용이 크므로 DEBUG일 때만 생성
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Extracted execution data: {decode_result.executions}")
+
+            execution_ids, duplicates = await self.store(decode_result.executions, stage_timer)
+        except Exception as e:
+            if stage_timer is not None:
+                self.self_tracer.submit(stage_timer.finish(error=type(e).__name__))
+            raise
+        if stage_timer is not None:
+            self.self_tracer.submit(stage_timer.finish(
+                received_bytes=decode_result.received_size,
+                decompressed_bytes=decode_result.decompressed_size,
+                decompress_seconds=decode_result.timings["decompress"],
+                spans=decode_result.spans,
+                executions=len(decode_result.executions),
+                saved=len(execution_ids),
+                duplicates=duplicates,
+                rejected_spans=decode_result.rejected_spans,
+                dropped_auto_spans=decode_result.dropped_auto_spans,
+                offloaded_segments=decode_result.offloaded_segments,
+            ))
+        logger.info(
+            f"Saved {len(execution_ids)} executions (duplicates: {duplicates}) from {decode_result.decompressed_size} bytes "
+            f"(offloaded segments: {decode_result.offloaded_segments}, "
+            f"dropped auto spans: {decode_result.dropped_auto_spans}): "
+            + ", ".join(f"{stage}={elapsed * 1000:.1f}ms" for stage, elapsed in decode_result.timings.items()),
+            extra={"sample_rate": LOG_SAMPLE_RATE}
+        )
+
+        if decode_result.rejected_spans:
+            logger.warning(f"Rejected spans: {decode_result.rejected_spans}")
+        return IngestResult(
+            decode_result=decode_result,
+            execution_ids=execution_ids,
+            duplicates=duplicates,
+        )
+
+    @staticmethod
+    def _observe_decode(decode_result: DecodeResult):
+        """요청 크기, 단계별 소요 시간, 스팬 수 메트릭 기록"""
+        REQUEST_BYTES.labels("wire").observe(decode_result.received_size)
+        REQUEST_BYTES.labels("decoded").observe(decode_result.decompressed_size)
+        for stage, elapsed in decode_result.timings.items():
+            STAGE_SECONDS.labels(stage).observe(elapsed)
+        SPANS_PER_BATCH.observe(decode_result.spans)
+        SPANS_DROPPED.labels("rejected").inc(decode_result.rejected_spans)
+        SPANS_DROPPED.labels("unlinked_auto").inc(decode_result.dropped_auto_spans)
+
+    async def store(
+            self,
+            executions: List[ProcessExecutionData],
+            stage_timer: Optional[StageTimer] = None,
+        ) -> Tuple[List[int], int]:
+        """실행 정보를 중복 제외 후 저장하고 실패 알림 예약 (저장된 id 목록, 중복 수) 반환"""
+        if not executions:
+            return [], 0
+
+        # 최근에 저장한 스팬은 캐시에서 바로 제외하고, 나머지는 DB에서 기존 키를 확인해 새 스팬만 저장
+        key_func = ProcessExecutionService.dedup_key
+        candidates, duplicates = self.dedup_cache.filter(executions, key_func)
+        started = time.perf_counter()
+        candidate_ids = await self.db_service.save_executions(candidates)
+        persisted = time.perf_counter()
+        STAGE_SECONDS.labels("persist").observe(persisted - started)
+        self.dedup_cache.add(key_func(execution_data) for execution_data in candidates)
+
+        saved = [
+            (execution_data, execution_id)
+            for execution_data, execution_id in zip(candidates, candidate_ids)
+            if execution_id is not None
+        ]
+        ROWS_WRITTEN.inc(len(saved))
+        ROWS_DEDUPLICATED.labels("cache").inc(duplicates)
+        ROWS_DEDUPLICATED.labels("db").inc(len(candidates) - len(saved))
+        duplicates += len(candidates) - len(saved)
+        if stage_timer is not None:
+            stage_timer.record("persist", started, persisted, rows=len(candidates), saved=len(saved))
+
+        # 새로 저장된 실행 정보에 대해서만 알림 (재전송으로 같은 알림이 다시 가지 않도록)
+        started = time.perf_counter()
+        notified = self.notify_failures([execution_data for execution_data, _ in saved])
+        if stage_timer is not None:
+            stage_timer.record("notify_enqueue", started, time.perf_counter(), failures=notified)
+        return [execution_id for _, execution_id in saved], duplicates
+
+    async def ingest_bytes(
+            self,
+            payload: bytes,
+            content_encoding: str = "",
+            trace_origin: Optional[SpoolPosition] = None,
+        ) -> IngestResult:
+        """메모리에 있는 요청 본문 처리 (gRPC처럼 메시지 단위로 받는 경우)"""
+        async def single_chunk():
+            yield payload
+        return await self.ingest(single_chunk(), content_encoding, trace_origin)
+
+    async def accept(self, chunks: AsyncIterator[bytes], content_encoding: str = "") -> Optional[IngestResult]:
+        """수신한 요청 처리 (스풀 사용 시 디스크 기록 후 None 반환, 아니면 바로 저장)
+
+        본문을 읽기 전에 처리 슬롯을 얻으며, 한도를 넘으면 AdmissionRejected가 발생합니다.
+        스풀에 기록할 본문은 압축 상태로 MAX_COMPRESSED_BYTES까지만 모으고, 응답 전에 청크마다 압축을 풀어
+        MAX_DECOMPRESSED_BYTES를 넘거나 gzip 스트림이 잘못된 요청은 기록하지 않고 거부합니다 (해제 결과는 버림).
+        """
+        async with self.admission.admit():
+            if self.spool is None:
+                return await self.ingest(chunks, content_encoding)
+            decompressor = StreamingDecompressor(content_encoding, self.config.MAX_DECOMPRESSED_BYTES)
+            payload = bytearray()
+            async for chunk in chunks:
+                payload += chunk
+                if len(payload) > self.config.MAX_COMPRESSED_BYTES:
+                    raise PayloadTooLargeError(f"payload exceeds {self.config.MAX_COMPRESSED_BYTES} bytes")
+                decompressor.feed(chunk)
+            decompressor.flush()
+            await self.spool.append(bytes(payload), content_encoding)
+            return None
+
+    async def accept_bytes(self, payload: bytes, content_encoding: str = "") -> Optional[IngestResult]:
+        """메모리에 있는 요청 본문 수신 처리 (gRPC)"""
+        async with self.admission.admit():
+            if self.spool is None:
+                return await self.ingest_bytes(payload, content_encoding)
+            await self.spool.append(payload, content_encoding)
+            return None
+
+    async def drain_spool(self):
+        """스풀에 기록된 요청을 checkpoint부터 순서대로 저장 (애플리케이션 수명 동안 실행)"""
+        position = self.spool.checkpoint
+        while True:
+            try:
+                records, next_position = await self.spool.read(position, self.config.SPOOL_DRAIN_BATCH)
+                start = position
+                for record in records:
+                    await self._drain_record(record, start)
+                    start = record.position
+                position = next_position
+                # 저장이 끝난 위치까지 기록 (이후 크래시 시 이 위치부터 다시 처리)
+                checkpoint = self._durable_position(position)
+                if checkpoint > self.spool.checkpoint:
+                    await self.spool.commit(checkpoint)
+                if not records:
+                    await self.spool.wait_for_data(position, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 스풀 파일 읽기/checkpoint 기록 실패 → 같은 위치부터 다시 시도
+                logger.error(f"Spool drain failed: {str(e)}", exc_info=True)
+                await asyncio.sleep(1.0)
+
+    def _durable_position(self, position: SpoolPosition) -> SpoolPosition:
+        """position까지 읽은 레코드 중 DB 저장까지 끝난 위치 (trace_buffer에 보류/저장 중인 레코드 앞까지)"""
+        pending = [position]
+        if self.trace_buffer is not None and self.trace_buffer.oldest_origin() is not None:
+            pending.append(self.trace_buffer.oldest_origin())
+        if self._sweep_origin is not None:
+            pending.append(self._sweep_origin)
+        return min(pending)
+
+    async def _drain_record(self, record: SpoolRecord, start: SpoolPosition):
+        """레코드 하나 저장 (일시적인 DB 장애는 성공할 때까지 재시도, 그 외 오류는 dead-letter로 보관)
+
+        start는 레코드 시작 위치이며, trace_buffer에 보류한 실행 정보의 origin으로 남아 checkpoint를 그 앞에 묶어 둡니다.
+        """
+        delay = 1.0
+        while True:
+            try:
+                await self.ingest_bytes(record.payload, record.content_encoding, start)
+                return
+            except Exception as e:
+                error = classify_error(e)
+                if not error.retryable:
+                    self.spool.dead_letter(record, error.message)
+                    return
+                logger.warning(f"Retrying spool record in {delay:.0f}s: {error.message}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.config.SPOOL_RETRY_MAX_SECONDS)
+
+    async def sweep_trace_buffer(self):
+        """trace_buffer에서 만료된 실행 정보를 주기적으로 저장 (애플리케이션 수명 동안 실행)"""
+        while True:
+            await asyncio.sleep(self.config.TRACE_BUFFER_SWEEP_INTERVAL_SECONDS)
+            # 만료로 꺼낸 실행 정보는 저장이 끝날 때까지 버퍼 밖에 있으므로 그동안 checkpoint를 붙잡아 둠
+            origin = self.trace_buffer.oldest_origin()
+            executions = self.trace_buffer.expire()
+            if not executions:
+                continue
+            self._sweep_origin = origin
+            try:
+                await self._store_released(executions)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Failed to save buffered executions: {str(e)}", exc_info=True)
+            finally:
+                self._sweep_origin = None
+
+    async def flush_trace_buffer(self):
+        """종료 시 trace_buffer에 보류 중인 실행 정보를 모두 저장"""
+        if self.trace_buffer is None:
+            return
+        executions = self.trace_buffer.drain()
+        if not executions:
+            return
+        # 종료를 막지 않도록 재시도 없이 한 번만 저장
+        try:
+            execution_ids, _ = await self.store(executions)
+            logger.info(f"Saved {len(execution_ids)} buffered executions on shutdown")
+        except Exception as e:
+            logger.error(f"Lost {len(executions)} buffered executions on shutdown: {str(e)}")
+
+    async def _store_released(self, executions: List[ProcessExecutionData]):
+        """trace_buffer에서 방출된 실행 정보 저장 (일시적인 DB 장애는 재시도)"""
+        delay = 1.0
+        while True:
+            try:
+                execution_ids, duplicates = await self.store(executions)
+                logger.info(f"Saved {len(execution_ids)} buffered executions (duplicates: {duplicates})")
+                return
+            except Exception as e:
+                error = classify_error(e)
+                if not error.retryable:
+                    raise
+                logger.warning(f"Retrying buffered executions in {delay:.0f}s: {error.message}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.config.SPOOL_RETRY_MAX_SECONDS)
+
+    def notify_failures(self, executions: List[ProcessExecutionData]) -> int:
+        """실패한 작업에 대해 응답을 기다리지 않고 알림 발송 (예약한 알림 수 반환)"""
+        scheduled = 0
+        for execution_data in executions:
+            if execution_data.success == "FAILED":
+                task = asyncio.create_task(self.notification_service.notify_failure(execution_data))
+                self._notify_tasks.add(task)
+                task.add_done_callback(self._notify_tasks.discard)
+                scheduled += 1
+                logger.debug('mail send')
+        return scheduled
+
+    async def close(self):
+        """종료 시 남은 알림 작업 완료 대기"""
+        if self._notify_tasks:
+            await asyncio.gather(*self._notify_tasks, return_exceptions=True)
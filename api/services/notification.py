@@ -1,9 +1,11 @@
 import smtplib
+import time
 from email.message import EmailMessage
 import requests
 from typing import Dict, Any
 
 from logger import get_logger
+from metrics import NOTIFICATIONS, STAGE_SECONDS
 
 from utils.trace_processor import ProcessExecutionData
 
@@ -47,7 +49,7 @@ class NotificationService:
         오류 유형: {execution_data.error_type}
         오류 메시지: {execution_data.error_message}
         """
-        logger.info(f"이메일 내용: {body}")
+        logger.debug(f"이메일 내용: {body}")
 
         html_body = f"""
     <html>
@@ -158,7 +160,9 @@ class NotificationService:
                 server.login(self.smtp_user, self.smtp_password)
                 logger.debug(f"이메일 전송 중: 수신자={self.admin_emails}")
                 server.send_message(msg)
+            NOTIFICATIONS.labels("email", "sent").inc()
         except Exception as e:
+            NOTIFICATIONS.labels("email", "failed").inc()
             logger.error(f"이메일 전송 실패: {str(e)}", exc_info=True)
             logger.debug(f"이메일 내용: {body}")
     
@@ -178,13 +182,17 @@ class NotificationService:
                     "message": message
                 }
                 requests.post(self.sms_api_url, json=payload)
+                NOTIFICATIONS.labels("sms", "sent").inc()
             except Exception as e:
+                NOTIFICATIONS.labels("sms", "failed").inc()
                 logger.error(f"Failed to send SMS: {str(e)}")
     
     async def notify_failure(self, execution_data: ProcessExecutionData):
         """실패 알림 처리"""
         if execution_data.success == "FAILED":
+            started = time.perf_counter()
             await self.send_email_alert(execution_data)
+            STAGE_SECONDS.labels("notify").observe(time.perf_counter() - started)
             # await self.send_sms_alert(execution_data)
     
     
\ No newline at end of file
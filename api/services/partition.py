@@ -0,0 +1,276 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, inspect, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from logger import get_logger
+from models.telemetry import ProcessExecution, ProcessExecutionDetail
+from services.database import ProcessExecutionService
+
+logger = get_logger(__name__)
+
+# 파티션 대상 테이블 (보존 기간이 지난 파티션은 상세 테이블부터 삭제)
+PARTITIONED_TABLES = (ProcessExecutionDetail.__tablename__, ProcessExecution.__tablename__)
+# 미래 시각(잘못된 시계 등) 행을 받는 마지막 파티션 (새 파티션은 여기서 분할)
+FUTURE_PARTITION = "p_future"
+# 변환 시점의 첫 파티션 이전 행을 받는 파티션
+OLD_PARTITION = "p_old"
+
+PARTITION_NAME_FORMATS = {"day": "p%Y%m%d", "month": "p%Y%m"}
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    """moment가 속한 파티션 구간의 시작 시각"""
+    if interval == "month":
+        return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_period(start: datetime, interval: str) -> datetime:
+    """다음 파티션 구간의 시작 시각 (= start 구간의 상한)"""
+    if interval == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _parse_bound(description: Optional[str]) -> Optional[datetime]:
+    """information_schema.PARTITIONS.PARTITION_DESCRIPTION ('2026-10-17 00:00:00' / MAXVALUE) → 상한 시각"""
+    if description is None or description.upper() == "MAXVALUE":
+        return None
+    return datetime.fromisoformat(description.strip("'"))
+
+
+class PartitionManager:
+    """process_executions / process_execution_details의 start_time 기준 RANGE 파티션과 보존 기간 관리
+
+    MariaDB에서는 구간(day/month)마다 파티션을 두고, 앞으로 쓸 파티션을 미리 만들며
+    보존 기간이 지난 파티션은 DROP PARTITION으로 통째로 삭제합니다 (행 단위 DELETE 없이 짧은 메타데이터 잠금만 사용).
+    start_time 조건이 있는 조회는 해당 구간의 파티션만 읽습니다.
+    파티션을 지원하지 않는 DB(SQLite 등)나 아직 변환하지 않은 테이블은 retention_batch 행씩 나눠 DELETE합니다.
+
+    MariaDB 파티션 테이블은 모든 유니크 키에 파티션 키가 있어야 하고 외래키를 쓸 수 없으므로,
+    변환 시 기본키는 (id, start_time), 중복 방지 키는 (trace_id, span_id, start_time)으로 바뀌고
+    상세 테이블의 외래키 대신 보존 작업이 두 테이블을 같은 구간으로 삭제합니다.
+    변환 후 DB는 start_time이 다른 같은 (trace_id, span_id)를 막지 못하므로, 중복 저장 방지는
+    ProcessExecutionService가 저장 전에 (trace_id, span_id)로 기존 행을 조회하는 확인에만 의존합니다.
+
+    변환은 테이블을 복사하는 ALTER라 배포 단계(python -m migrations upgrade)에서 ensure로 실행하고,
+    애플리케이션 기동 시에는 check로 상태만 기록합니다.
+    """
+
+    def __init__(self, config, db_service: ProcessExecutionService):
+        self.db_service = db_service
+        self.engine = db_service.engine
+        self.interval = config.PARTITION_INTERVAL
+        if self.interval not in PARTITION_NAME_FORMATS:
+            raise ValueError(f"PARTITION_INTERVAL must be one of {sorted(PARTITION_NAME_FORMATS)}: {self.interval}")
+        self.premake = config.PARTITION_PREMAKE
+        self.convert_max_rows = config.PARTITION_CONVERT_MAX_ROWS
+        self.lock_wait_timeout = config.PARTITION_LOCK_WAIT_TIMEOUT_SECONDS
+        self.retention_days = config.RETENTION_DAYS
+        self.retention_batch = config.RETENTION_DELETE_BATCH
+        self.maintenance_interval = config.PARTITION_MAINTENANCE_INTERVAL_SECONDS
+        self.supports_partitions = self.engine.dialect.name in ("mysql", "mariadb")
+
+    def _partition_name(self, start: datetime) -> str:
+        return start.strftime(PARTITION_NAME_FORMATS[self.interval])
+
+    def _partitions(self, connection, table: str) -> List[Tuple[str, Optional[datetime]]]:
+        """테이블의 (파티션 이름, 상한 시각) 목록 (파티션이 없으면 빈 목록)"""
+        rows = connection.execute(text(
+            "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        ), {"table": table})
+        return [(name, _parse_bound(description)) for name, description in rows]
+
+    def _partition_definitions(self, start: datetime, end: datetime) -> List[str]:
+        """[start, end) 구간의 파티션 정의 목록"""
+        definitions = []
+        while start < end:
+            bound = next_period(start, self.interval)
+            definitions.append(f"PARTITION {self._partition_name(start)} VALUES LESS THAN ('{bound:%Y-%m-%d %H:%M:%S}')")
+            start = bound
+        return definitions
+
+    def _premake_until(self, now: datetime) -> datetime:
+        end = period_start(now, self.interval)
+        for _ in range(self.premake + 1):
+            end = next_period(end, self.interval)
+        return end
+
+    def _retention_cutoff(self, now: datetime) -> Optional[datetime]:
+        """이 시각 이전 행은 삭제 대상 (보존 기간 0이면 None)"""
+        if self.retention_days <= 0:
+            return None
+        return now - timedelta(days=self.retention_days)
+
+    def _set_lock_wait_timeout(self, connection):
+        # 긴 조회가 잡고 있는 메타데이터 잠금을 오래 기다리면 뒤따르는 INSERT까지 막히므로 짧게 대기 후 다음 주기에 재시도
+        connection.execute(text(f"SET SESSION lock_wait_timeout = {int(self.lock_wait_timeout)}"))
+
+    def _pending_tables(self) -> List[str]:
+        """아직 파티션으로 변환하지 않은 테이블 목록"""
+        with self.engine.connect() as connection:
+            return [table for table in PARTITIONED_TABLES if not self._partitions(connection, table)]
+
+    def check(self):
+        """기동 시 파티션 변환 여부만 확인해 기록 (변환은 python -m migrations upgrade에서 수행)"""
+        if not self.supports_partitions:
+            return
+        pending = self._pending_tables()
+        if pending:
+            logger.warning(
+                f"{', '.join(pending)} not partitioned; retention falls back to chunked DELETE "
+                f"(run `python -m migrations upgrade` to convert)"
+            )
+
+    def ensure(self, now: Optional[datetime] = None):
+        """MariaDB 테이블에 파티션이 없으면 변환 (블로킹, 테이블/컬럼은 migrations로 먼저 준비)"""
+        if not self.supports_partitions:
+            return
+        now = now or datetime.now()
+        pending = self._pending_tables()
+        if not pending:
+            return
+        with self.engine.connect() as connection:
+            rows = connection.execute(select(func.count()).select_from(ProcessExecution)).scalar_one()
+        if rows > self.convert_max_rows:
+            # 테이블 전체를 복사하는 ALTER이므로 큰 테이블은 점검 시간에 한도를 올려 다시 실행하도록 안내
+            logger.error(
+                f"{', '.join(pending)} not partitioned: {rows} rows exceeds PARTITION_CONVERT_MAX_ROWS "
+                f"({self.convert_max_rows}); retention falls back to chunked DELETE"
+            )
+            return
+        self.convert(now, pending)
+
+    def convert(self, now: datetime, pending: Sequence[str] = PARTITIONED_TABLES):
+        """pending 테이블을 start_time RANGE 파티션으로 변환 (MariaDB, 테이블 복사가 일어나므로 배포 단계에서 한 번만)
+
+        DDL은 즉시 커밋되어 중간에 실패하면 일부만 바뀐 채 남으므로, 키 변경은 현재 키를 확인하고 필요한 것만 실행합니다.
+        """
+        with self.engine.connect() as connection:
+            oldest = connection.execute(select(func.min(ProcessExecution.start_time))).scalar_one() or now
+        # 보존 기간 이전 행은 p_old에 모여 다음 보존 작업에서 삭제됨
+        cutoff = self._retention_cutoff(now)
+        first = period_start(max(oldest, cutoff) if cutoff else oldest, self.interval)
+        partitions = ", ".join([
+            f"PARTITION {OLD_PARTITION} VALUES LESS THAN ('{first:%Y-%m-%d %H:%M:%S}')",
+            *self._partition_definitions(first, self._premake_until(now)),
+            f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)",
+        ])
+        partition_clause = f"PARTITION BY RANGE COLUMNS(start_time) ({partitions})"
+
+        inspector = inspect(self.engine)
+        foreign_keys = inspector.get_foreign_keys(ProcessExecutionDetail.__tablename__)
+        primary_keys = {table: inspector.get_pk_constraint(table)["constrained_columns"] for table in pending}
+        unique_keys = {
+            index["name"]: index["column_names"]
+            for index in inspector.get_indexes(ProcessExecution.__tablename__) if index["unique"]
+        }
+        with self.engine.begin() as connection:
+            # 외래키가 남아 있으면 참조되는 process_executions도 파티션할 수 없으므로 먼저 제거
+            for foreign_key in foreign_keys:
+                connection.execute(text(f"ALTER TABLE process_execution_details DROP FOREIGN KEY {foreign_key['name']}"))
+            if ProcessExecutionDetail.__tablename__ in pending:
+                if "start_time" not in primary_keys[ProcessExecutionDetail.__tablename__]:
+                    # 부모 행이 없는 상세 행은 파티션 키를 채울 수 없으므로 삭제
+                    connection.execute(text("DELETE FROM process_execution_details WHERE start_time IS NULL"))
+                    connection.execute(text(
+                        "ALTER TABLE process_execution_details MODIFY start_time DATETIME NOT NULL, "
+                        "DROP PRIMARY KEY, ADD PRIMARY KEY (execution_id, start_time)"
+                    ))
+                connection.execute(text(f"ALTER TABLE process_execution_details {partition_clause}"))
+            if ProcessExecution.__tablename__ in pending:
+                changes = []
+                if "start_time" not in primary_keys[ProcessExecution.__tablename__]:
+                    changes.append("DROP PRIMARY KEY, ADD PRIMARY KEY (id, start_time)")
+                if "start_time" not in unique_keys.get("uq_process_executions_trace_span", []):
+                    changes.append(
+                        "DROP INDEX uq_process_executions_trace_span, "
+                        "ADD UNIQUE INDEX uq_process_executions_trace_span (trace_id, span_id, start_time)"
+                    )
+                if changes:
+                    connection.execute(text(f"ALTER TABLE process_executions {', '.join(changes)}"))
+                connection.execute(text(f"ALTER TABLE process_executions {partition_clause}"))
+        logger.info(f"{'/'.join(pending)}를 {self.interval} 단위 파티션으로 변환 ({first:%Y-%m-%d}부터)")
+
+    def maintain(self, now: Optional[datetime] = None) -> int:
+        """이후 파티션 생성 및 보존 기간이 지난 데이터 삭제 (블로킹, 삭제한 파티션 수 또는 행 수 반환)"""
+        now = now or datetime.now()
+        if self.supports_partitions:
+            with self.engine.connect() as connection:
+                partitioned = all(self._partitions(connection, table) for table in PARTITIONED_TABLES)
+            if partitioned:
+                return self._maintain_partitions(now)
+        return self._purge_rows(now)
+
+    def _maintain_partitions(self, now: datetime) -> int:
+        cutoff = self._retention_cutoff(now)
+        premake_until = self._premake_until(now)
+        with self.engine.connect() as connection:
+            self._set_lock_wait_timeout(connection)
+            try:
+                dropped = self._rotate_partitions(connection, premake_until, cutoff)
+            finally:
+                # 풀로 돌아가는 커넥션이므로 세션 설정 복구
+                connection.execute(text("SET SESSION lock_wait_timeout = DEFAULT"))
+        return dropped
+
+    def _rotate_partitions(self, connection, premake_until: datetime, cutoff: Optional[datetime]) -> int:
+        dropped = 0
+        for table in PARTITIONED_TABLES:
+            partitions = self._partitions(connection, table)
+            last_bound = max(bound for _, bound in partitions if bound is not None)
+            definitions = self._partition_definitions(last_bound, premake_until)
+            if definitions:
+                # 비어 있는 p_future만 나누므로 데이터 복사 없이 끝남
+                connection.execute(text(
+                    f"ALTER TABLE {table} REORGANIZE PARTITION {FUTURE_PARTITION} INTO "
+                    f"({', '.join(definitions)}, PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE))"
+                ))
+                logger.info(f"{table} 파티션 {len(definitions)}개 추가")
+            if cutoff is None:
+                continue
+            expired = [name for name, bound in partitions if bound is not None and bound <= cutoff]
+            if expired:
+                connection.execute(text(f"ALTER TABLE {table} DROP PARTITION {', '.join(expired)}"))
+                logger.info(f"{table} 보존 기간 지난 파티션 삭제: {', '.join(expired)}")
+                dropped += len(expired)
+        return dropped
+
+    def _purge_rows(self, now: datetime) -> int:
+        """보존 기간이 지난 행을 retention_batch개씩 짧은 트랜잭션으로 나눠 삭제 (파티션 미사용 시)"""
+        cutoff = self._retention_cutoff(now)
+        if cutoff is None:
+            return 0
+        purged = 0
+        while True:
+            with self.db_service.get_session() as session:
+                ids = session.scalars(
+                    select(ProcessExecution.id)
+                    .where(ProcessExecution.start_time < cutoff)
+                    .limit(self.retention_batch)
+                ).all()
+                if not ids:
+                    break
+                session.execute(delete(ProcessExecutionDetail).where(ProcessExecutionDetail.execution_id.in_(ids)))
+                session.execute(delete(ProcessExecution).where(ProcessExecution.id.in_(ids)))
+            purged += len(ids)
+        if purged:
+            logger.info(f"보존 기간 지난 실행 정보 {purged}건 삭제 ({cutoff:%Y-%m-%d %H:%M:%S} 이전)")
+        return purged
+
+    async def run(self):
+        """파티션 관리/보존 작업을 주기적으로 실행 (애플리케이션 수명 동안 실행, DB 스레드 풀 사용)"""
+        while True:
+            try:
+                await self.db_service.run_sync(self.maintain)
+            except asyncio.CancelledError:
+                raise
+            except SQLAlchemyError as e:
+                # 잠금 대기 시간 초과 등은 다음 주기에 다시 시도
+                logger.error(f"Partition maintenance failed: {str(e)}")
+            await asyncio.sleep(self.maintenance_interval)
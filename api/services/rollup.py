@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models.telemetry import ProcessDurationSketch, ProcessExecutionHourly
+from utils.ddsketch import DDSketch
+from utils.trace_processor import ProcessExecutionData
+
+# 집계 키 (bucket_start + 차원 컬럼)
+HOURLY_DIMENSIONS = ("platform_type", "group_name", "process_name", "host_name")
+HOURLY_KEY = ("bucket_start",) + HOURLY_DIMENSIONS
+# 합산하는 컬럼 (최소/최대는 따로 병합)
+HOURLY_SUMS = ("run_count", "failure_count", "duration_sum", "source_count_sum", "target_count_sum")
+# 집계 upsert(ON DUPLICATE KEY UPDATE / ON CONFLICT)를 쓰는 DB별 INSERT 구문
+UPSERT_INSERTS = {
+    "mysql": mysql_insert,
+    "mariadb": mysql_insert,
+    "sqlite": sqlite_insert,
+    "postgresql": postgresql_insert,
+}
+
+
+def check_dialect(dialect: str):
+    """시간별 집계를 저장할 수 있는 DB인지 확인 (첫 저장이 아니라 기동 시 실패하도록 DB 서비스 생성 시 호출)"""
+    if dialect not in UPSERT_INSERTS:
+        raise ValueError(f"database dialect {dialect} is not supported for hourly rollups: {sorted(UPSERT_INSERTS)}")
+
+
+def hour_bucket(moment: datetime) -> datetime:
+    """집계 구간 시작 시각 (정시, DATETIME 컬럼처럼 시간대 정보는 버림)"""
+    return moment.replace(minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def hour_ceiling(moment: datetime) -> datetime:
+    """moment 이후 첫 정시 (이미 정시이면 그대로)"""
+    bucket = hour_bucket(moment)
+    return bucket if bucket == moment.replace(tzinfo=None) else bucket + timedelta(hours=1)
+
+
+def hourly_key(execution_data: ProcessExecutionData) -> Tuple:
+    """HOURLY_KEY 순서의 집계 키"""
+    return (
+        hour_bucket(execution_data.start_time),
+        execution_data.platform_type,
+        execution_data.group_name,
+        execution_data.process_name,
+        execution_data.host_name,
+    )
+
+
+def aggregate_hourly(executions: Iterable[ProcessExecutionData]) -> List[Dict[str, Any]]:
+    """새로 저장한 실행 정보를 (시간, 플랫폼, 그룹, 프로세스, 호스트)별로 미리 합쳐 upsert 행 목록 반환
+
+    행은 키 순서로 정렬하므로 동시에 들어온 배치들이 같은 순서로 잠금을 잡습니다 (MariaDB 교착 방지).
+    """
+    buckets: Dict[Tuple, Dict[str, Any]] = {}
+    for execution_data in executions:
+        key = hourly_key(execution_data)
+        duration = execution_data.duration_seconds
+        row = buckets.get(key)
+        if row is None:
+            row = buckets[key] = dict(
+                zip(HOURLY_KEY, key),
+                run_count=0, failure_count=0, duration_sum=0.0,
+                duration_min=duration, duration_max=duration,
+                source_count_sum=0, target_count_sum=0,
+            )
+        row["run_count"] += 1
+        row["failure_count"] += execution_data.success == "FAILED"
+        row["duration_sum"] += duration
+        row["duration_min"] = min(row["duration_min"], duration)
+        row["duration_max"] = max(row["duration_max"], duration)
+        row["source_count_sum"] += execution_data.source_count or 0
+        row["target_count_sum"] += execution_data.target_count or 0
+    return [buckets[key] for key in sorted(buckets)]
+
+
+def upsert_hourly(session, rows: List[Dict[str, Any]]):
+    """시간별 집계 행을 기존 값에 더함 (호출한 세션의 트랜잭션 안에서 실행, 원본 행 INSERT와 함께 커밋)"""
+    if not rows:
+        return
+    table = ProcessExecutionHourly.__table__
+    dialect = session.get_bind().dialect.name
+    statement = UPSERT_INSERTS[dialect](table).values(rows)
+    if dialect in ("mysql", "mariadb"):
+        incoming = statement.inserted
+        smaller, larger = func.least, func.greatest
+    else:
+        incoming = statement.excluded
+        # SQLite는 인자가 여러 개인 min/max가 스칼라 함수
+        smaller, larger = (func.min, func.max) if dialect == "sqlite" else (func.least, func.greatest)
+
+    updates = {column: table.c[column] + incoming[column] for column in HOURLY_SUMS}
+    updates["duration_min"] = smaller(table.c.duration_min, incoming.duration_min)
+    updates["duration_max"] = larger(table.c.duration_max, incoming.duration_max)
+    if dialect in ("mysql", "mariadb"):
+        statement = statement.on_duplicate_key_update(**updates)
+    else:
+        statement = statement.on_conflict_do_update(index_elements=list(HOURLY_KEY), set_=updates)
+    session.execute(statement)
+
+
+def _insert_ignore(session, table, rows: List[Dict[str, Any]]):
+    """키가 이미 있는 행은 건너뛰고 INSERT (MariaDB INSERT IGNORE / ON CONFLICT DO NOTHING)"""
+    dialect = session.get_bind().dialect.name
+    statement = UPSERT_INSERTS[dialect](table).values(rows)
+    if dialect in ("mysql", "mariadb"):
+        statement = statement.prefix_with("IGNORE")
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=list(HOURLY_KEY))
+    session.execute(statement)
+
+
+def merge_duration_sketches(session, executions: Iterable[ProcessExecutionData], relative_accuracy: float):
+    """새로 저장한 실행 시간을 시간별 스케치에 병합 (호출한 세션의 트랜잭션 안에서 실행)
+
+    스케치는 SQL로 더할 수 없으므로 기존 행을 잠금 조회(SELECT ... FOR UPDATE)해 합친 뒤 다시 씁니다.
+    없는 키는 먼저 빈 스케치로 INSERT해 두고 잠그므로, 같은 새 시간대를 동시에 저장하는 배치도
+    존재하지 않는 키의 갭 잠금끼리 교착되지 않고 행 잠금을 키 순서대로 기다립니다.
+    """
+    sketches: Dict[Tuple, DDSketch] = {}
+    for execution_data in executions:
+        key = hourly_key(execution_data)
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = DDSketch(relative_accuracy)
+        sketch.add(execution_data.duration_seconds)
+    if not sketches:
+        return
+
+    keys = sorted(sketches)
+    empty = DDSketch(relative_accuracy).to_bytes()
+    _insert_ignore(
+        session,
+        ProcessDurationSketch.__table__,
+        [dict(zip(HOURLY_KEY, key), sample_count=0, sketch=empty) for key in keys],
+    )
+
+    key_columns = [getattr(ProcessDurationSketch, column) for column in HOURLY_KEY]
+    stored = {
+        tuple(getattr(row, column) for column in HOURLY_KEY): row
+        for row in session.execute(
+            select(ProcessDurationSketch)
+            .where(tuple_(*key_columns).in_(keys))
+            .order_by(*key_columns)
+            .with_for_update()
+        ).scalars()
+    }
+    for key in keys:
+        row = stored.get(key)
+        if row is None:
+            # DB collation이 다른 값으로 같은 키를 찾은 경우 (대소문자/끝 공백 무시 등) DB 비교로 해당 행 조회
+            row = session.execute(
+                select(ProcessDurationSketch)
+                .where(*(column == value for column, value in zip(key_columns, key)))
+                .with_for_update()
+            ).scalar_one()
+        merged = DDSketch.from_bytes(row.sketch)
+        merged.merge(sketches[key])
+        row.sketch = merged.to_bytes()
+        row.sample_count = merged.count
+    session.flush()
@@ -0,0 +1,175 @@
+import os
+import queue
+import random
+import threading
+from typing import Any, List, Optional
+from urllib.parse import urlparse
+
+import requests
+from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
+from opentelemetry.proto.common.v1 import common_pb2
+from opentelemetry.proto.trace.v1 import trace_pb2
+
+from logger import get_logger
+from metrics import SELF_TRACES
+from utils.stage_timer import StageTimer
+
+logger = get_logger(__name__)
+
+# 이 API가 OTLP를 수신하는 경로 (자체 추적 스팬을 여기로 보내면 수신 → 추적 → 수신이 반복됨)
+INGEST_PATH_PREFIX = "/exporter"
+# 한 번에 전송할 최대 트리 수
+EXPORT_BATCH_SIZE = 64
+# 큐에 남은 트리를 모아 보내는 최대 대기 시간(초)
+EXPORT_INTERVAL_SECONDS = 5.0
+EXPORT_TIMEOUT_SECONDS = 5.0
+
+_STOP = object()
+
+
+def _any_value(value: Any) -> common_pb2.AnyValue:
+    if isinstance(value, bool):
+        return common_pb2.AnyValue(bool_value=value)
+    if isinstance(value, int):
+        return common_pb2.AnyValue(int_value=value)
+    if isinstance(value, float):
+        return common_pb2.AnyValue(double_value=value)
+    return common_pb2.AnyValue(string_value=str(value))
+
+
+def _key_values(attributes: dict) -> List[common_pb2.KeyValue]:
+    return [common_pb2.KeyValue(key=key, value=_any_value(value)) for key, value in attributes.items()]
+
+
+def to_otlp_spans(timer: StageTimer) -> List[trace_pb2.Span]:
+    """단계 트리를 하나의 트레이스(루트 스팬 + 단계별 하위 스팬)로 변환"""
+    trace_id = os.urandom(16)
+    span_ids = [os.urandom(8) for _ in range(len(timer.stages) + 1)]
+    root_id = span_ids[-1]
+    spans = [trace_pb2.Span(
+        trace_id=trace_id,
+        span_id=root_id,
+        name=timer.name,
+        kind=trace_pb2.Span.SPAN_KIND_INTERNAL,
+        start_time_unix_nano=timer.wall_time_ns(timer.started),
+        end_time_unix_nano=timer.wall_time_ns(timer.ended),
+        attributes=_key_values(timer.attributes),
+    )]
+    for index, stage in enumerate(timer.stages):
+        spans.append(trace_pb2.Span(
+            trace_id=trace_id,
+            span_id=span_ids[index],
+            parent_span_id=root_id if stage.parent is None else span_ids[stage.parent],
+            name=stage.name,
+            kind=trace_pb2.Span.SPAN_KIND_INTERNAL,
+            start_time_unix_nano=timer.wall_time_ns(stage.started),
+            end_time_unix_nano=timer.wall_time_ns(stage.ended),
+            attributes=_key_values(stage.attributes),
+        ))
+    return spans
+
+
+class SelfTracer:
+    """수신 파이프라인의 단계 트리(StageTimer)를 샘플링해 별도 OTLP/HTTP 엔드포인트로 내보냄
+
+    - sample_rate 비율의 요청과, 전체 소요 시간이 slow_seconds 이상인 요청은 항상 내보냅니다.
+    - endpoint가 비어 있으면 선택된 트리를 로그 한 줄 요약으로만 남깁니다.
+    - 이 API의 수신 경로(/exporter/...)를 endpoint로 지정하면 자기 스팬을 다시 수신하게 되므로 비활성화합니다.
+      collector를 거칠 때는 otelmon-api로 내보내지 않는 별도 파이프라인(otelcol.yaml의 traces/self)을 사용해야 합니다.
+    - 전송은 전용 스레드에서 하며, 큐가 가득 차거나 전송에 실패한 트리는 버립니다 (수신 처리를 막지 않음).
+    """
+
+    def __init__(self, config):
+        self.sample_rate = config.SELF_TRACE_SAMPLE_RATE
+        self.slow_seconds = config.SELF_TRACE_SLOW_SECONDS
+        self.endpoint = config.SELF_TRACE_OTLP_ENDPOINT
+        if self.endpoint and urlparse(self.endpoint).path.startswith(INGEST_PATH_PREFIX):
+            logger.error(
+                f"SELF_TRACE_OTLP_ENDPOINT points at the ingest path ({self.endpoint}); "
+                f"self-tracing export disabled to avoid a feedback loop"
+            )
+            self.endpoint = ""
+        self.resource = common_pb2.KeyValue(
+            key="service.name", value=common_pb2.AnyValue(string_value=config.SELF_TRACE_SERVICE_NAME)
+        )
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=config.SELF_TRACE_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        if self.endpoint:
+            self._thread = threading.Thread(target=self._run, name="self-trace", daemon=True)
+            self._thread.start()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.slow_seconds > 0
+
+    def start(self, name: str, **attributes) -> Optional[StageTimer]:
+        """요청 하나의 단계 트리 생성 (자체 추적이 꺼져 있으면 None)"""
+        return StageTimer(name, **attributes) if self.enabled else None
+
+    def submit(self, timer: Optional[StageTimer]):
+        """끝난 단계 트리를 샘플링 기준에 따라 내보냄"""
+        if timer is None:
+            return
+        slow = self.slow_seconds > 0 and timer.duration >= self.slow_seconds
+        if not slow and random.random() >= self.sample_rate:
+            return
+        if slow:
+            timer.attributes["slow"] = True
+        if not self.endpoint:
+            logger.info(f"Self trace {timer.name} {timer.duration * 1000:.1f}ms {timer.attributes}: {timer.summary()}")
+            return
+        try:
+            self._queue.put_nowait(timer)
+        except queue.Full:
+            SELF_TRACES.labels("dropped").inc()
+
+    def _run(self):
+        """큐에서 트리를 모아 OTLP/HTTP protobuf로 전송 (전용 스레드)"""
+        session = requests.Session()
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get(timeout=EXPORT_INTERVAL_SECONDS)
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= EXPORT_BATCH_SIZE:
+                        break
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if batch:
+                self._export(session, batch)
+        session.close()
+
+    def _export(self, session: requests.Session, batch: List[StageTimer]):
+        spans = [span for timer in batch for span in to_otlp_spans(timer)]
+        request = trace_service_pb2.ExportTraceServiceRequest(resource_spans=[trace_pb2.ResourceSpans(
+            resource={"attributes": [self.resource]},
+            scope_spans=[trace_pb2.ScopeSpans(scope={"name": __name__}, spans=spans)],
+        )])
+        try:
+            response = session.post(
+                self.endpoint,
+                data=request.SerializeToString(),
+                headers={"Content-Type": "application/x-protobuf"},
+                timeout=EXPORT_TIMEOUT_SECONDS,
+            )
+            response.raise_for_status()
+            SELF_TRACES.labels("exported").inc(len(batch))
+        except Exception as e:
+            SELF_TRACES.labels("failed").inc(len(batch))
+            logger.warning(f"Failed to export {len(batch)} self traces: {str(e)}")
+
+    def close(self):
+        """남은 트리 전송 후 스레드 종료 (종료를 오래 막지 않도록 제한 시간까지만 대기)"""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_STOP, timeout=1.0)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=EXPORT_TIMEOUT_SECONDS + 1.0)
@@ -0,0 +1,310 @@
+import asyncio
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from logger import get_logger
+
+logger = get_logger(__name__)
+
+# 레코드 헤더: 본문 길이, crc32(flags + 본문), flags
+RECORD_HEADER = struct.Struct(">IIB")
+FLAG_GZIP = 0x01
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+CHECKPOINT_FILE = "checkpoint.json"
+DEAD_LETTER_DIR = "dead-letter"
+
+
+class SpoolFullError(Exception):
+    """스풀에 쌓인 미처리 데이터가 허용 크기를 넘은 경우 (DB 장애가 길어질 때)"""
+
+
+@dataclass(frozen=True, order=True)
+class SpoolPosition:
+    """세그먼트 번호와 세그먼트 내 바이트 위치"""
+    segment: int
+    offset: int
+
+
+class SpoolRecord(NamedTuple):
+    """스풀에 기록된 요청 본문 하나 (position은 이 레코드 바로 다음 위치)"""
+    position: SpoolPosition
+    payload: bytes
+    content_encoding: str
+
+
+def _record_crc(flags: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(bytes((flags,))))
+
+
+def _fsync_directory(directory: Path):
+    """파일 생성/이름 변경이 크래시 후에도 남도록 디렉토리 엔트리 동기화"""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Spool:
+    """수신한 Export 요청 본문을 DB 저장 전에 기록하는 append-only 로컬 스풀
+
+    - 레코드는 세그먼트 파일에 [헤더 + 본문]으로 이어 쓰고, 세그먼트가 segment_bytes를 넘으면 새 파일로 넘어갑니다.
+    - 동시에 들어온 append는 한 번의 write + fsync로 묶어 기록하며(group commit), fsync가 끝난 뒤에 반환합니다.
+    - 처리가 끝난 위치는 checkpoint 파일에 원자적으로(임시 파일 + rename) 기록하고,
+      checkpoint 이전 세그먼트는 삭제합니다. 재시작 시 checkpoint부터 다시 읽습니다(at-least-once).
+    - 기록 중 크래시로 마지막 세그먼트 끝에 남은 잘린 레코드는 열 때 잘라냅니다.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int, max_bytes: int):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.checkpoint = SpoolPosition(0, 0)
+        self.durable = SpoolPosition(0, 0)
+        # 세그먼트 번호 → fsync된 크기 (이벤트 루프에서만 갱신)
+        self._segment_sizes: Dict[int, int] = {}
+        self._file = None
+        self._file_segment = 0
+        self._pending: List[Tuple[bytes, asyncio.Future]] = []
+        self._writer_task: Optional[asyncio.Task] = None
+        self._durable_changed: Optional[asyncio.Condition] = None
+        # 쓰기는 전용 스레드 하나에서만 수행 (파일 핸들 공유 없음)
+        self._write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="spool")
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{segment:020d}{SEGMENT_SUFFIX}"
+
+    def _list_segments(self) -> List[int]:
+        return sorted(
+            int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            for path in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+        )
+
+    @property
+    def backlog_bytes(self) -> int:
+        """checkpoint 이후 아직 DB에 저장되지 않은 바이트 수"""
+        return sum(
+            size for segment, size in self._segment_sizes.items() if segment >= self.checkpoint.segment
+        ) - self.checkpoint.offset
+
+    # ---------------------------------------------------------------- 열기/닫기
+
+    def open(self):
+        """checkpoint 로드, 마지막 세그먼트의 잘린 레코드 정리, 새 세그먼트 생성"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        checkpoint_path = self.directory / CHECKPOINT_FILE
+        if checkpoint_path.exists():
+            with open(checkpoint_path) as f:
+                saved = json.load(f)
+            self.checkpoint = SpoolPosition(saved["segment"], saved["offset"])
+
+        segments = self._list_segments()
+        for segment in segments:
+            if segment < self.checkpoint.segment:
+                self._segment_path(segment).unlink()
+            else:
+                self._segment_sizes[segment] = self._segment_path(segment).stat().st_size
+        if segments:
+            self._truncate_torn_tail(segments[-1])
+
+        # 이전 실행의 세그먼트는 그대로 두고 항상 새 세그먼트에 이어 씀
+        next_segment = max([self.checkpoint.segment, *segments]) + 1
+        self._roll(next_segment)
+        self._segment_sizes[next_segment] = 0
+        self.durable = SpoolPosition(next_segment, 0)
+        if self.checkpoint.segment == 0:
+            self.checkpoint = SpoolPosition(min(self._segment_sizes), 0)
+        self._durable_changed = asyncio.Condition()
+        logger.info(
+            f"Spool opened: {self.directory} checkpoint={self.checkpoint} backlog={self.backlog_bytes} bytes"
+        )
+
+    def _truncate_torn_tail(self, segment: int):
+        """기록 도중 중단된 마지막 레코드 제거"""
+        path = self._segment_path(segment)
+        valid = 0
+        with open(path, "rb") as f:
+            while True:
+                record = self._read_record(f)
+                if record is None:
+                    break
+                valid = f.tell()
+        if valid < self._segment_sizes[segment]:
+            logger.warning(f"Truncating torn spool record: {path.name} {self._segment_sizes[segment]} -> {valid}")
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+                os.fsync(f.fileno())
+            self._segment_sizes[segment] = valid
+
+    def _roll(self, segment: int):
+        """새 세그먼트 파일로 전환 (쓰기 스레드 또는 open에서만 호출)"""
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._segment_path(segment), "ab")
+        self._file_segment = segment
+        _fsync_directory(self.directory)
+
+    async def close(self):
+        """대기 중인 append를 기록한 뒤 파일 정리"""
+        if self._writer_task is not None:
+            await self._writer_task
+        self._write_executor.shutdown(wait=True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ---------------------------------------------------------------- 쓰기
+
+    async def append(self, payload: bytes, content_encoding: str = "") -> SpoolPosition:
+        """요청 본문을 기록하고 fsync가 끝난 뒤 반환 (함께 기록된 묶음의 끝 위치)"""
+        if self.backlog_bytes + len(payload) > self.max_bytes:
+            raise SpoolFullError(f"spool backlog exceeds {self.max_bytes} bytes")
+        flags = FLAG_GZIP if content_encoding == "gzip" else 0
+        record = RECORD_HEADER.pack(len(payload), _record_crc(flags, payload), flags) + payload
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((record, future))
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._write_pending())
+        return await future
+
+    async def _write_pending(self):
+        """쌓인 append를 한 번의 fsync로 기록 (기록 중 들어온 append는 다음 묶음으로)"""
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                positions = await loop.run_in_executor(
+                    self._write_executor, self._write_batch, [record for record, _ in batch]
+                )
+            except Exception as e:
+                logger.error(f"Spool write failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for segment, size in positions:
+                self._segment_sizes[segment] = size
+            async with self._durable_changed:
+                self.durable = SpoolPosition(*positions[-1])
+                self._durable_changed.notify_all()
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(self.durable)
+
+    def _write_batch(self, records: List[bytes]) -> List[Tuple[int, int]]:
+        """레코드를 이어 쓰고 fsync (세그먼트가 바뀌면 이전 세그먼트도 fsync 후 닫음)
+
+        기록된 세그먼트별 (번호, 크기) 목록을 반환합니다.
+        """
+        positions = []
+        segment = self._file_segment
+        start = self._file.tell()
+        try:
+            for record in records:
+                if self._file.tell() > 0 and self._file.tell() + len(record) > self.segment_bytes:
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                    positions.append((segment, self._file.tell()))
+                    segment += 1
+                    self._roll(segment)
+                    start = 0
+                self._file.write(record)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError:
+            # 일부만 기록된 레코드 뒤에 이어 쓰지 않도록 이번 묶음의 시작 위치로 되돌림
+            self._file.seek(start)
+            self._file.truncate(start)
+            raise
+        positions.append((segment, self._file.tell()))
+        return positions
+
+    # ---------------------------------------------------------------- 읽기/checkpoint
+
+    @staticmethod
+    def _read_record(f) -> Optional[Tuple[bytes, int]]:
+        """현재 위치의 레코드 하나를 읽어 (본문, flags) 반환 (끝이거나 손상된 경우 None)"""
+        header = f.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return None
+        length, crc, flags = RECORD_HEADER.unpack(header)
+        payload = f.read(length)
+        if len(payload) < length or _record_crc(flags, payload) != crc:
+            return None
+        return payload, flags
+
+    def _read(self, position: SpoolPosition, durable: SpoolPosition, max_records: int) -> Tuple[List[SpoolRecord], SpoolPosition]:
+        records = []
+        while len(records) < max_records and position < durable:
+            path = self._segment_path(position.segment)
+            if path.exists():
+                with open(path, "rb") as f:
+                    f.seek(position.offset)
+                    while len(records) < max_records and position < durable:
+                        record = self._read_record(f)
+                        if record is None:
+                            break
+                        payload, flags = record
+                        position = SpoolPosition(position.segment, f.tell())
+                        records.append(SpoolRecord(position, payload, "gzip" if flags & FLAG_GZIP else ""))
+                if len(records) >= max_records or position >= durable:
+                    break
+                if position.offset < path.stat().st_size:
+                    # 닫힌 세그먼트 중간의 손상은 복구할 수 없으므로 남은 부분을 건너뜀
+                    logger.error(f"Skipping corrupt spool data: {path.name} from offset {position.offset}")
+            # 세그먼트 끝 → 다음 세그먼트
+            position = SpoolPosition(position.segment + 1, 0)
+        return records, position
+
+    async def read(self, position: SpoolPosition, max_records: int) -> Tuple[List[SpoolRecord], SpoolPosition]:
+        """position부터 fsync된 레코드를 최대 max_records개 읽어 (레코드 목록, 다음 읽을 위치) 반환"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read, position, self.durable, max_records)
+
+    async def wait_for_data(self, position: SpoolPosition, timeout: Optional[float] = None) -> bool:
+        """position 이후에 새 레코드가 기록될 때까지 대기"""
+        async with self._durable_changed:
+            try:
+                await asyncio.wait_for(
+                    self._durable_changed.wait_for(lambda: self.durable > position), timeout
+                )
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def _commit(self, position: SpoolPosition):
+        path = self.directory / CHECKPOINT_FILE
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump({"segment": position.segment, "offset": position.offset}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        _fsync_directory(self.directory)
+
+    async def commit(self, position: SpoolPosition):
+        """position까지 처리 완료 기록 후 다 읽은 세그먼트 삭제"""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._commit, position)
+        self.checkpoint = position
+        for segment in [segment for segment in self._segment_sizes if segment < position.segment]:
+            del self._segment_sizes[segment]
+            self._segment_path(segment).unlink(missing_ok=True)
+
+    def dead_letter(self, record: SpoolRecord, reason: str):
+        """재시도해도 처리할 수 없는 레코드를 별도 디렉토리에 보관"""
+        directory = self.directory / DEAD_LETTER_DIR
+        directory.mkdir(exist_ok=True)
+        name = f"{record.position.segment:020d}-{record.position.offset:012d}"
+        suffix = ".pb.gz" if record.content_encoding == "gzip" else ".pb"
+        (directory / f"{name}{suffix}").write_bytes(record.payload)
+        logger.error(f"Spool record moved to dead-letter: {name}{suffix} ({reason})")
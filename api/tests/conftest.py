@@ -0,0 +1,16 @@
+"""
+pytest 공통 설정 (requirements.txt 외에 pytest 필요: pip install pytest)
+
+    cd api
+    python -m pytest -q tests
+
+모듈들이 api 디렉토리 기준 평탄한 import(PYTHONPATH=api)를 쓰므로 경로를 추가하고,
+logger가 import 시점에 만드는 로그 파일은 임시 디렉토리에 쓰도록 LOG_DIR을 먼저 지정합니다.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("LOG_DIR", tempfile.mkdtemp(prefix="otelmon-test-logs-"))
@@ -0,0 +1,82 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from config import Settings
+from routers import exporter
+from services.admission import AdmissionController, AdmissionRejected
+from services.ingest import IngestService
+
+
+def test_queue_full_is_rejected_with_429_and_timeout_with_503():
+    async def run():
+        admission = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=0.05)
+
+        async def wait_for_slot():
+            async with admission.admit():
+                pass
+
+        async with admission.admit():
+            queued = asyncio.create_task(wait_for_slot())
+            await asyncio.sleep(0)
+            assert (admission.in_flight, admission.queued) == (1, 1)
+
+            with pytest.raises(AdmissionRejected) as excinfo:
+                async with admission.admit():
+                    pass
+            assert excinfo.value.status_code == 429
+
+            with pytest.raises(AdmissionRejected) as excinfo:
+                await queued
+            assert excinfo.value.status_code == 503
+
+        return admission.snapshot()
+
+    snapshot = asyncio.run(run())
+    assert (snapshot["in_flight"], snapshot["queued"]) == (0, 0)
+    assert (snapshot["admitted"], snapshot["rejected_queue_full"], snapshot["rejected_timeout"]) == (1, 1, 1)
+    assert (snapshot["peak_in_flight"], snapshot["peak_queued"]) == (1, 1)
+
+
+def test_queued_request_is_admitted_when_slot_is_released():
+    async def run():
+        admission = AdmissionController(max_in_flight=1, max_queue=1, queue_timeout=1.0)
+        order = []
+
+        async def export(name: str):
+            async with admission.admit():
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(export("first"), export("second"))
+        return admission, order
+
+    admission, order = asyncio.run(run())
+    assert order == ["first", "second"]
+    assert admission.stats.admitted == 2
+    assert admission.stats.rejected_queue_full == admission.stats.rejected_timeout == 0
+
+
+def test_exporter_responds_429_with_retry_after_when_overloaded():
+    config = Settings(ADMISSION_MAX_IN_FLIGHT=1, ADMISSION_MAX_QUEUE=0)
+    app = FastAPI()
+    app.include_router(exporter.router)
+    app.state.ingest_service = IngestService(config, None, None)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            # 처리 슬롯을 모두 점유한 상태에서 들어온 요청은 본문을 읽지 않고 거절
+            async with app.state.ingest_service.admission.admit():
+                response = await client.post(
+                    "/exporter/v1/traces", content=b"", headers={"content-type": "application/x-protobuf"}
+                )
+            stats = await client.get("/exporter/v1/admission")
+        return response, stats
+
+    response, stats = asyncio.run(run())
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == str(Settings().EXPORT_RETRY_AFTER_SECONDS)
+    assert response.headers["content-type"] == "application/x-protobuf"
+    assert stats.json()["rejected_queue_full"] == 1
@@ -0,0 +1,77 @@
+import math
+import random
+
+import pytest
+
+from utils.ddsketch import DDSketch
+
+
+def _values(seed: int, count: int):
+    rnd = random.Random(seed)
+    return [rnd.lognormvariate(3, 1.5) for _ in range(count)] + [0.0] * (count // 100)
+
+
+def _sketch(values, relative_accuracy: float = 0.01) -> DDSketch:
+    sketch = DDSketch(relative_accuracy)
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+def _state(sketch: DDSketch):
+    return (sketch.relative_accuracy, sketch.bins, sketch.zero_count, sketch.count, sketch.sum, sketch.min, sketch.max)
+
+
+def test_round_trip_preserves_state():
+    sketch = _sketch(_values(1, 5000))
+    restored = DDSketch.from_bytes(sketch.to_bytes())
+
+    assert _state(restored) == _state(sketch)
+    assert restored.to_bytes() == sketch.to_bytes()
+
+
+def test_empty_sketch_round_trip_and_merge():
+    empty = DDSketch.from_bytes(DDSketch(0.01).to_bytes())
+    assert empty.count == 0 and empty.quantile(0.5) is None
+
+    # 롤업은 빈 스케치 행을 먼저 만들고 새 값을 병합함
+    values = _values(2, 100)
+    empty.merge(_sketch(values))
+    assert _state(empty) == _state(_sketch(values))
+
+
+def test_merge_matches_sketch_of_all_values():
+    first, second = _values(3, 3000), _values(4, 2000)
+    merged = DDSketch.from_bytes(_sketch(first).to_bytes())
+    merged.merge(DDSketch.from_bytes(_sketch(second).to_bytes()))
+    combined = _sketch(first + second)
+
+    assert merged.bins == combined.bins
+    assert (merged.count, merged.zero_count, merged.min, merged.max) == (
+        combined.count, combined.zero_count, combined.min, combined.max
+    )
+    assert merged.sum == pytest.approx(combined.sum)
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+def test_quantile_within_relative_accuracy(q):
+    values = sorted(value for value in _values(5, 10000) if value > 0)
+    sketch = DDSketch.from_bytes(_sketch(values).to_bytes())
+    exact = values[int(q * (len(values) - 1))]
+
+    assert math.isclose(sketch.quantile(q), exact, rel_tol=0.01)
+
+
+def test_merge_with_different_accuracy_keeps_count():
+    merged = _sketch(_values(6, 1000), 0.01)
+    merged.merge(_sketch(_values(7, 1000), 0.02))
+
+    assert merged.count == 2 * 1010
+    assert merged.relative_accuracy == 0.01
+
+
+def test_from_bytes_rejects_unknown_version():
+    data = bytearray(DDSketch(0.01).to_bytes())
+    data[0] ^= 0xFF
+    with pytest.raises(ValueError):
+        DDSketch.from_bytes(bytes(data))
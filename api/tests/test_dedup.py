@@ -0,0 +1,93 @@
+import asyncio
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+import migrations
+from config import Settings
+from services.database import ProcessExecutionService
+from services.ingest import IngestService
+from utils.dedup import DedupCache
+from utils.trace_processor import ProcessExecutionData
+
+
+def _execution(index: int, trace_id: str = None, span_id: str = None) -> ProcessExecutionData:
+    start_time = datetime(2026, 10, 16, 9, 0) + timedelta(minutes=index)
+    return ProcessExecutionData(
+        host_name="host",
+        platform_type="NiFi",
+        group_name="group",
+        process_name=f"process-{index}",
+        script_name="process.py",
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=1),
+        duration_seconds=1.0,
+        success="SUCCESS",
+        trace_id=trace_id if trace_id is not None else f"{index:032x}",
+        span_id=span_id if span_id is not None else f"{index:016x}",
+    )
+
+
+@pytest.fixture
+def db_service(tmp_path):
+    service = ProcessExecutionService(Settings(DATABASE_URL=f"sqlite:///{tmp_path / 'dedup.db'}"))
+    migrations.upgrade(service.engine)
+    yield service
+    service.dispose()
+
+
+def test_cache_filters_known_and_in_batch_duplicates():
+    cache = DedupCache(max_size=10)
+    cache.add(["a", None])
+
+    remaining, skipped = cache.filter(["a", "b", "b", None, None, "c"], lambda key: key)
+    assert remaining == ["b", None, None, "c"]
+    assert skipped == 2
+    assert cache.hits == 2
+    # filter는 저장 확인 전이므로 새 키를 캐시에 넣지 않음
+    assert "b" not in cache and len(cache) == 1
+
+
+def test_cache_evicts_least_recently_used_key():
+    cache = DedupCache(max_size=2)
+    cache.add(["a", "b"])
+    cache.filter(["a"], lambda key: key)
+    cache.add(["c"])
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+    disabled = DedupCache(max_size=0)
+    disabled.add(["a"])
+    assert len(disabled) == 0
+
+
+def test_save_executions_skips_stored_and_in_batch_duplicates(db_service):
+    first = [_execution(1), _execution(2)]
+    assert None not in asyncio.run(db_service.save_executions(first))
+
+    # 재전송 배치: 저장된 스팬과 배치 안의 중복은 None, trace_id/span_id가 없는 실행 정보는 항상 저장
+    no_key = replace(_execution(4), trace_id=None, span_id=None)
+    batch = [_execution(1), _execution(3), _execution(3), no_key, no_key]
+    ids = asyncio.run(db_service.save_executions(batch))
+    assert [execution_id is None for execution_id in ids] == [True, False, True, False, False]
+    assert len(set(ids) - {None}) == 3
+
+
+def test_store_counts_cache_and_database_duplicates(db_service):
+    ingest_service = IngestService(Settings(DEDUP_CACHE_SIZE=100), db_service, None)
+    executions = [_execution(1), _execution(2)]
+
+    async def run():
+        first = await ingest_service.store(executions)
+        # 캐시에 있는 재전송 배치는 DB 조회 없이 제외
+        cached = await ingest_service.store(executions)
+        # 재시작 등으로 캐시가 비어도 DB의 기존 키로 제외
+        ingest_service.dedup_cache = DedupCache(100)
+        stored = await ingest_service.store(executions + [_execution(3)])
+        return first, cached, stored
+
+    first, cached, stored = asyncio.run(run())
+    assert len(first[0]) == 2 and first[1] == 0
+    assert cached == ([], 2)
+    assert len(stored[0]) == 1 and stored[1] == 2
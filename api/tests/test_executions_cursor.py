@@ -0,0 +1,63 @@
+import base64
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from routers.executions import _page, _period, decode_cursor, encode_cursor
+
+
+def _b64(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("start_time", [
+    datetime(2026, 10, 16, 9, 30),
+    datetime(2026, 10, 16, 9, 30, 15, 123456),
+])
+@pytest.mark.parametrize("execution_id", [1, 987654321])
+def test_cursor_round_trip(start_time, execution_id):
+    cursor = encode_cursor(start_time, execution_id)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (start_time, execution_id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "!!!",
+    "a",
+    _b64(b"not-a-cursor"),
+    _b64(b"2026-10-16T09:30:00"),
+    _b64(b"2026-10-16T09:30:00|"),
+    _b64(b"2026-10-16T09:30:00|abc"),
+    _b64(b"2026-13-40T09:30:00|1"),
+    _b64(b"2026-10-16T09:30:00|1|2"),
+    _b64("2026-10-16T09:30:00|１".encode("utf-8")),
+    _b64(b"\xff\xfe|1"),
+])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
+
+
+def test_page_returns_cursor_of_last_item_only_when_more_rows():
+    items = [{"id": 10 - index, "start_time": datetime(2026, 10, 16, 9, 30 - index)} for index in range(3)]
+
+    page = _page(list(items), 2)
+    assert page["items"] == items[:2]
+    assert decode_cursor(page["next_cursor"]) == (items[1]["start_time"], items[1]["id"])
+
+    assert _page(list(items), 3) == {"items": items, "next_cursor": None}
+
+
+def test_period_converts_timezone_aware_bounds_to_local_time():
+    since = datetime(2026, 10, 16, 0, 0, tzinfo=timezone.utc)
+    local_since, until = _period(since, None)
+
+    assert local_since == since.astimezone().replace(tzinfo=None)
+    assert until is None
+    with pytest.raises(HTTPException) as excinfo:
+        _period(since, since)
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,121 @@
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+
+import migrations
+from migrations import SchemaOutdatedError, schema_migrations
+from migrations.m0003_process_execution_indexes import CREATED, DROPPED
+from models.telemetry import ProcessExecutionDetail
+from services.database import decode_auto_spans
+
+# 마이그레이션 도입 전 create_all로 만든 process_executions (auto_json 포함, trace_id/span_id 없음)
+LEGACY_PROCESS_EXECUTIONS = """
+CREATE TABLE process_executions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    host_name VARCHAR(100) NOT NULL,
+    platform_type VARCHAR(20) NOT NULL,
+    group_name VARCHAR(200) NOT NULL,
+    process_name VARCHAR(200) NOT NULL,
+    script_name VARCHAR(200) NOT NULL,
+    success VARCHAR(10) NOT NULL,
+    error_message TEXT,
+    error_type VARCHAR(100),
+    source_system_type VARCHAR(50),
+    source_system_name VARCHAR(100),
+    source_endpoint VARCHAR(500),
+    source_object_name VARCHAR(200),
+    source_count INTEGER,
+    target_system_type VARCHAR(50),
+    target_system_name VARCHAR(100),
+    target_endpoint VARCHAR(500),
+    target_object_name VARCHAR(200),
+    target_count INTEGER,
+    auto_json VARCHAR(4000),
+    start_time DATETIME NOT NULL,
+    end_time DATETIME NOT NULL,
+    duration_seconds FLOAT NOT NULL,
+    created_at DATETIME
+)
+"""
+
+AUTO_JSON = [{"http.method": "GET", "http.status_code": 200}, {"db.system": "mysql"}]
+
+
+def _legacy_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(LEGACY_PROCESS_EXECUTIONS))
+        for index, auto_json in enumerate([json.dumps(AUTO_JSON), json.dumps(AUTO_JSON)[:20], None]):
+            connection.execute(text(
+                "INSERT INTO process_executions (host_name, platform_type, group_name, process_name, script_name, "
+                "success, auto_json, start_time, end_time, duration_seconds) "
+                "VALUES ('h', 'NiFi', 'g', :process_name, 's.py', 'SUCCESS', :auto_json, :start_time, :end_time, 1.0)"
+            ), {
+                "process_name": f"p{index}",
+                "auto_json": auto_json,
+                "start_time": datetime(2026, 10, 16, 9, index),
+                "end_time": datetime(2026, 10, 16, 9, index, 1),
+            })
+    return engine
+
+
+def test_legacy_auto_json_is_moved_to_details_and_dropped(tmp_path):
+    engine = _legacy_engine(tmp_path)
+
+    applied = migrations.upgrade(engine)
+    assert [migration.version for migration in applied] == [migration.version for migration in migrations.discover()]
+    assert "auto_json" not in {column["name"] for column in inspect(engine).get_columns("process_executions")}
+
+    with engine.connect() as connection:
+        details = connection.execute(
+            select(ProcessExecutionDetail).order_by(ProcessExecutionDetail.execution_id)
+        ).all()
+    assert [detail.execution_id for detail in details] == [1, 2]
+    assert decode_auto_spans(details[0]) == AUTO_JSON
+    assert details[0].span_count == 2
+    assert details[0].start_time == datetime(2026, 10, 16, 9, 0)
+    # 4000자에서 잘린 값은 원문 그대로 보존
+    assert decode_auto_spans(details[1]) == [{"auto_json": json.dumps(AUTO_JSON)[:20]}]
+
+    assert migrations.upgrade(engine) == []
+    migrations.ensure_schema(engine)
+
+
+def test_fresh_database_is_upgraded_step_by_step(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    versions = [migration.version for migration in migrations.discover()]
+    assert versions == sorted(versions) and migrations.head() == versions[-1]
+
+    # 기동 시에는 스키마를 바꾸지 않고 미적용 마이그레이션이 있으면 실패
+    with pytest.raises(SchemaOutdatedError):
+        migrations.ensure_schema(engine)
+
+    assert [migration.version for migration in migrations.upgrade(engine, target=versions[0])] == versions[:1]
+    assert [migration.version for migration in migrations.pending(engine)] == versions[1:]
+    with pytest.raises(SchemaOutdatedError) as excinfo:
+        migrations.ensure_schema(engine)
+    assert migrations.discover()[-1].name in str(excinfo.value)
+
+    migrations.ensure_schema(engine, apply=True)
+    assert migrations.applied_versions(engine) == set(versions)
+    with engine.connect() as connection:
+        names = connection.execute(select(schema_migrations.c.name).order_by(schema_migrations.c.version)).scalars().all()
+    assert names == [migration.name for migration in migrations.discover()]
+
+    indexes = {index["name"]: tuple(index["column_names"]) for index in inspect(engine).get_indexes("process_executions")}
+    assert {name: indexes.get(name) for name in CREATED} == CREATED
+    assert not set(DROPPED) & set(indexes)
+    assert migrations.upgrade(engine) == []
+
+
+def test_legacy_table_gets_dedup_key_and_composite_indexes(tmp_path):
+    engine = _legacy_engine(tmp_path)
+    migrations.upgrade(engine)
+
+    inspector = inspect(engine)
+    assert {"trace_id", "span_id"} <= {column["name"] for column in inspector.get_columns("process_executions")}
+    indexes = {index["name"]: index for index in inspector.get_indexes("process_executions")}
+    assert indexes["uq_process_executions_trace_span"]["unique"]
+    assert set(CREATED) <= set(indexes)
@@ -0,0 +1,114 @@
+import gzip
+import random
+import sys
+
+import pytest
+from google.protobuf.message import DecodeError
+from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
+from opentelemetry.proto.common.v1 import common_pb2
+from opentelemetry.proto.trace.v1 import trace_pb2
+
+from utils.otlp_decoder import PayloadTooLargeError, ResourceSpansReader, StreamingDecompressor
+
+
+def _valid_payload() -> bytes:
+    """호스트 2개, 트레이스마다 수동계측 루트 + 자동계측 자식 스팬을 담은 요청"""
+    request = trace_service_pb2.ExportTraceServiceRequest()
+    for host in range(2):
+        resource_spans = request.resource_spans.add()
+        resource_spans.resource.attributes.add(key="host.name").value.string_value = f"host-{host}"
+        scope_spans = resource_spans.scope_spans.add()
+        scope_spans.scope.name = "trace_log"
+        for index in range(3):
+            trace_id = bytes([host, index]) * 8
+            root = scope_spans.spans.add(
+                trace_id=trace_id, span_id=bytes([index + 1]) * 8, name=f"process_{index}",
+                start_time_unix_nano=1_700_000_000_000_000_000 + index, end_time_unix_nano=1_700_000_001_000_000_000,
+            )
+            root.attributes.extend([
+                common_pb2.KeyValue(key="etl.process_name", value=common_pb2.AnyValue(string_value=f"process_{index}")),
+                common_pb2.KeyValue(key="etl.process_count", value=common_pb2.AnyValue(int_value=index * 1000)),
+                common_pb2.KeyValue(key="etl.duration", value=common_pb2.AnyValue(double_value=1.5)),
+            ])
+            root.status.code = trace_pb2.Status.STATUS_CODE_OK
+            child = scope_spans.spans.add(
+                trace_id=trace_id, span_id=bytes([index + 100]) * 8, parent_span_id=root.span_id, name="GET",
+                start_time_unix_nano=1_700_000_000_100_000_000, end_time_unix_nano=1_700_000_000_200_000_000,
+            )
+            child.attributes.add(key="http.status_code").value.int_value = 200
+    return request.SerializeToString()
+
+
+def _stream(payload: bytes, chunk_size: int, content_encoding: str = "", max_output: int = sys.maxsize):
+    """StreamingDecompressor + ResourceSpansReader로 chunk_size씩 읽어 ResourceSpans 목록 반환"""
+    decompressor = StreamingDecompressor(content_encoding, max_output)
+    reader = ResourceSpansReader()
+    segments = []
+    for start in range(0, len(payload), chunk_size):
+        segments += reader.feed(decompressor.feed(payload[start:start + chunk_size]))
+    segments += reader.feed(decompressor.flush())
+    reader.close()
+    return [trace_pb2.ResourceSpans.FromString(segment) for segment in segments]
+
+
+def _parse(payload: bytes):
+    return list(trace_service_pb2.ExportTraceServiceRequest.FromString(payload).resource_spans)
+
+
+def _outcome(func, payload: bytes):
+    try:
+        return func(payload)
+    except DecodeError:
+        return DecodeError
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096, 1 << 20])
+@pytest.mark.parametrize("gzipped", [False, True])
+def test_reader_matches_parse_from_string(chunk_size, gzipped):
+    payload = _valid_payload()
+    body = gzip.compress(payload) if gzipped else payload
+
+    assert _stream(body, chunk_size) == _parse(payload)
+
+
+def test_reader_matches_parse_from_string_on_truncated_input():
+    payload = _valid_payload()
+    for end in range(len(payload)):
+        truncated = payload[:end]
+        assert _outcome(lambda data: _stream(data, 64), truncated) == _outcome(_parse, truncated), end
+
+
+def test_reader_matches_parse_from_string_on_garbage():
+    rnd = random.Random(0)
+    payload = _valid_payload()
+    cases = [rnd.randbytes(rnd.randint(1, 40)) for _ in range(5000)]
+    for _ in range(1000):
+        corrupted = bytearray(payload)
+        corrupted[rnd.randrange(len(corrupted))] = rnd.randrange(256)
+        cases.append(bytes(corrupted))
+    # 필드 번호 0 / 상한(2^29-1) / 상한 초과, 알 수 없는 그룹, 짝이 맞지 않는 END_GROUP, 최상위 END_GROUP
+    cases += [
+        b"\x01" + bytes(8), b"\xf8\xff\xff\xff\x0f\x00", b"\x80\x80\x80\x80\x10\x00",
+        b"\x6b\x08\x01\x6c", b"\x6b\x08\x01\x74", b"\x0c",
+    ]
+
+    for case in cases:
+        assert _outcome(lambda data: _stream(data, 5), case) == _outcome(_parse, case), case.hex()
+
+
+def test_truncated_gzip_stream_is_rejected():
+    body = gzip.compress(_valid_payload())
+    with pytest.raises(DecodeError):
+        _stream(body[:-4], 64)
+
+
+def test_corrupt_gzip_stream_is_rejected():
+    with pytest.raises(DecodeError):
+        _stream(b"\x1f\x8b\x08" + b"garbage" * 10, 64)
+
+
+def test_decompressed_size_is_capped():
+    payload = _valid_payload()
+    with pytest.raises(PayloadTooLargeError):
+        _stream(gzip.compress(payload), 64, max_output=len(payload) - 1)
+    assert _stream(gzip.compress(payload), 64, max_output=len(payload)) == _parse(payload)
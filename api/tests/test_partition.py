@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+import migrations
+from config import Settings
+from models.telemetry import ProcessExecution, ProcessExecutionDetail
+from services.database import ProcessExecutionService
+from services.partition import PartitionManager, next_period, period_start
+from utils.trace_processor import ProcessExecutionData
+
+NOW = datetime(2026, 10, 16, 9, 30)
+
+
+def _execution(index: int, start_time: datetime) -> ProcessExecutionData:
+    return ProcessExecutionData(
+        host_name="host",
+        platform_type="NiFi",
+        group_name="group",
+        process_name="process",
+        script_name="process.py",
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=1),
+        duration_seconds=1.0,
+        success="SUCCESS",
+        auto_spans=[{"http.status_code": 200}],
+        trace_id=f"{index:032x}",
+        span_id=f"{index:016x}",
+    )
+
+
+def _manager(tmp_path, **settings) -> PartitionManager:
+    config = Settings(DATABASE_URL=f"sqlite:///{tmp_path / 'retention.db'}", **settings)
+    db_service = ProcessExecutionService(config)
+    migrations.upgrade(db_service.engine)
+    return PartitionManager(config, db_service)
+
+
+def _counts(manager: PartitionManager):
+    with manager.engine.connect() as connection:
+        return tuple(
+            connection.execute(select(func.count()).select_from(model)).scalar_one()
+            for model in (ProcessExecution, ProcessExecutionDetail)
+        )
+
+
+@pytest.mark.parametrize("interval, moment, start, following", [
+    ("day", datetime(2026, 10, 16, 9, 30), datetime(2026, 10, 16), datetime(2026, 10, 17)),
+    ("day", datetime(2026, 12, 31, 23, 59), datetime(2026, 12, 31), datetime(2027, 1, 1)),
+    ("month", datetime(2026, 1, 31, 12), datetime(2026, 1, 1), datetime(2026, 2, 1)),
+    ("month", datetime(2026, 12, 15), datetime(2026, 12, 1), datetime(2027, 1, 1)),
+])
+def test_period_bounds(interval, moment, start, following):
+    assert period_start(moment, interval) == start
+    assert next_period(start, interval) == following
+
+
+def test_partition_definitions_cover_premake_window(tmp_path):
+    manager = _manager(tmp_path, PARTITION_INTERVAL="month", PARTITION_PREMAKE=1)
+    try:
+        definitions = manager._partition_definitions(datetime(2026, 10, 1), manager._premake_until(NOW))
+        assert definitions == [
+            "PARTITION p202610 VALUES LESS THAN ('2026-11-01 00:00:00')",
+            "PARTITION p202611 VALUES LESS THAN ('2026-12-01 00:00:00')",
+        ]
+        # SQLite는 파티션을 지원하지 않아 변환하지 않음
+        assert not manager.supports_partitions
+        manager.ensure(NOW)
+    finally:
+        manager.db_service.dispose()
+
+
+def test_invalid_interval_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        _manager(tmp_path, PARTITION_INTERVAL="week")
+
+
+def test_expired_rows_are_purged_in_batches_with_details(tmp_path):
+    manager = _manager(tmp_path, RETENTION_DAYS=30, RETENTION_DELETE_BATCH=2)
+    try:
+        expired = [_execution(index, NOW - timedelta(days=31, minutes=index)) for index in range(5)]
+        kept = [_execution(index + 5, NOW - timedelta(days=29)) for index in range(2)]
+        asyncio.run(manager.db_service.save_executions(expired + kept))
+        assert _counts(manager) == (7, 7)
+
+        assert manager.maintain(NOW) == 5
+        assert _counts(manager) == (2, 2)
+        assert manager.maintain(NOW) == 0
+    finally:
+        manager.db_service.dispose()
+
+
+def test_zero_retention_keeps_rows(tmp_path):
+    manager = _manager(tmp_path, RETENTION_DAYS=0)
+    try:
+        asyncio.run(manager.db_service.save_executions([_execution(1, NOW - timedelta(days=3650))]))
+        assert manager.maintain(NOW) == 0
+        assert _counts(manager) == (1, 1)
+    finally:
+        manager.db_service.dispose()
@@ -0,0 +1,124 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+from google.protobuf.message import DecodeError
+
+from config import Settings
+from services.ingest import IngestService
+from services.spool import CHECKPOINT_FILE, RECORD_HEADER, Spool, SpoolPosition
+from utils.otlp_decoder import PayloadTooLargeError
+
+SEGMENT_BYTES = 1 << 20
+MAX_BYTES = 1 << 24
+
+
+async def _read_all(spool: Spool, position: SpoolPosition):
+    records, _ = await spool.read(position, 100)
+    return records
+
+
+def test_reopen_truncates_torn_last_record_and_resumes_from_checkpoint(tmp_path):
+    payloads = [b"first", b"second", b"third" * 100]
+
+    async def write():
+        spool = Spool(str(tmp_path), SEGMENT_BYTES, MAX_BYTES)
+        spool.open()
+        positions = [await spool.append(payload) for payload in payloads]
+        await spool.commit(positions[0])
+        await spool.close()
+        return positions
+
+    positions = asyncio.run(write())
+    segment = positions[-1].segment
+    path = tmp_path / f"segment-{segment:020d}.log"
+    # 세 번째 레코드 기록 도중 크래시 (헤더와 본문 일부만 남음)
+    with open(path, "r+b") as f:
+        f.truncate(positions[1].offset + RECORD_HEADER.size + 10)
+
+    async def reopen():
+        spool = Spool(str(tmp_path), SEGMENT_BYTES, MAX_BYTES)
+        spool.open()
+        try:
+            assert spool.checkpoint == positions[0]
+            assert path.stat().st_size == positions[1].offset
+            assert [record.payload for record in await _read_all(spool, spool.checkpoint)] == [b"second"]
+
+            # 재시작 후 기록은 새 세그먼트에 이어지고 남은 레코드 다음에 읽힘
+            appended = await spool.append(b"fourth", "gzip")
+            assert appended.segment == segment + 1
+            records = await _read_all(spool, spool.checkpoint)
+            assert [record.payload for record in records] == [b"second", b"fourth"]
+            assert [record.content_encoding for record in records] == ["", "gzip"]
+
+            await spool.commit(appended)
+        finally:
+            await spool.close()
+        return appended
+
+    appended = asyncio.run(reopen())
+    saved = json.loads((tmp_path / CHECKPOINT_FILE).read_text())
+    assert SpoolPosition(saved["segment"], saved["offset"]) == appended
+    # checkpoint 이전 세그먼트는 삭제
+    assert not path.exists()
+
+
+def test_reopen_truncates_partial_header(tmp_path):
+    async def write():
+        spool = Spool(str(tmp_path), SEGMENT_BYTES, MAX_BYTES)
+        spool.open()
+        position = await spool.append(b"only")
+        await spool.close()
+        return position
+
+    position = asyncio.run(write())
+    path = tmp_path / f"segment-{position.segment:020d}.log"
+    with open(path, "ab") as f:
+        f.write(b"\x00\x00")
+
+    async def reopen():
+        spool = Spool(str(tmp_path), SEGMENT_BYTES, MAX_BYTES)
+        spool.open()
+        try:
+            assert spool.checkpoint == SpoolPosition(position.segment, 0)
+            assert [record.payload for record in await _read_all(spool, spool.checkpoint)] == [b"only"]
+        finally:
+            await spool.close()
+
+    asyncio.run(reopen())
+    assert path.stat().st_size == position.offset
+
+
+async def _chunks(body: bytes, chunk_size: int = 1024):
+    for start in range(0, len(body), chunk_size):
+        yield body[start:start + chunk_size]
+
+
+@pytest.mark.parametrize("body, content_encoding, error", [
+    # 압축 상태로는 작지만 풀면 한도를 넘는 gzip bomb
+    (gzip.compress(bytes(1 << 20)), "gzip", PayloadTooLargeError),
+    # 압축 상태 크기 한도 초과
+    (bytes(4096 + 1), "", PayloadTooLargeError),
+    (gzip.compress(b"payload")[:-4], "gzip", DecodeError),
+])
+def test_accept_rejects_body_before_spooling(tmp_path, body, content_encoding, error):
+    config = Settings(MAX_COMPRESSED_BYTES=4096, MAX_DECOMPRESSED_BYTES=64 * 1024)
+
+    async def accept():
+        spool = Spool(str(tmp_path), SEGMENT_BYTES, MAX_BYTES)
+        spool.open()
+        ingest_service = IngestService(config, None, None, spool=spool)
+        try:
+            with pytest.raises(error):
+                await ingest_service.accept(_chunks(body), content_encoding)
+            assert await _read_all(spool, spool.checkpoint) == []
+
+            # 한도 안의 본문은 압축 상태 그대로 기록
+            accepted = gzip.compress(bytes(1024))
+            assert await ingest_service.accept(_chunks(accepted, 7), "gzip") is None
+            assert [record.payload for record in await _read_all(spool, spool.checkpoint)] == [accepted]
+        finally:
+            await spool.close()
+
+    asyncio.run(accept())
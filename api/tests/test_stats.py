@@ -0,0 +1,131 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import migrations
+from config import Settings
+from routers import stats
+from services.database import ProcessExecutionService
+from services.rollup import check_dialect
+from utils.trace_processor import ProcessExecutionData
+
+
+def _execution(index: int, start_time: datetime, duration: float, success: str = "SUCCESS") -> ProcessExecutionData:
+    return ProcessExecutionData(
+        host_name=f"host-{index % 2}",
+        platform_type="AirFlow",
+        group_name="dag",
+        process_name="task",
+        script_name="task.py",
+        start_time=start_time,
+        end_time=start_time + timedelta(seconds=duration),
+        duration_seconds=duration,
+        success=success,
+        source_count=10,
+        target_count=index,
+        trace_id=f"{index:032x}",
+        span_id=f"{index:016x}",
+    )
+
+
+@pytest.fixture
+def db_service(tmp_path):
+    service = ProcessExecutionService(Settings(DATABASE_URL=f"sqlite:///{tmp_path / 'stats.db'}"))
+    migrations.upgrade(service.engine)
+    yield service
+    service.dispose()
+
+
+def _get(db_service: ProcessExecutionService, path: str, **params):
+    app = FastAPI()
+    app.include_router(stats.router)
+    app.state.db_service = db_service
+
+    async def get():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(path, params=params)
+
+    return asyncio.run(get())
+
+
+def test_period_accepts_timezone_aware_bounds_and_aligns_to_hours():
+    until = datetime(2026, 10, 16, 9, 30, tzinfo=timezone.utc)
+    since, aligned_until = stats._period(None, until, timedelta(hours=2))
+
+    local_until = until.astimezone().replace(tzinfo=None)
+    assert aligned_until == local_until.replace(minute=0) + timedelta(hours=1)
+    assert since == (local_until - timedelta(hours=2)).replace(minute=0)
+    assert since.tzinfo is None and aligned_until.tzinfo is None
+
+    # 이미 정시인 until은 그대로
+    assert stats._period(datetime(2026, 10, 16, 7), datetime(2026, 10, 16, 9), timedelta())[1] == datetime(2026, 10, 16, 9)
+
+
+def test_period_rejects_empty_range():
+    with pytest.raises(stats.HTTPException) as excinfo:
+        stats._period(datetime(2026, 10, 16, 9), datetime(2026, 10, 16, 9), timedelta())
+    assert excinfo.value.status_code == 400
+
+
+def test_rollup_stats_are_counted_once_per_execution(db_service):
+    base = datetime(2026, 10, 16, 9, 0)
+    executions = [
+        _execution(1, base + timedelta(minutes=10), 2.0),
+        _execution(2, base + timedelta(minutes=50), 4.0, "FAILED"),
+        _execution(3, base + timedelta(hours=1, minutes=5), 6.0),
+    ]
+    assert len(asyncio.run(db_service.save_executions(executions))) == 3
+    # 재전송된 배치는 저장되지 않고 집계도 늘지 않음
+    assert asyncio.run(db_service.save_executions(executions[:2])) == [None, None]
+
+    response = _get(db_service, "/stats/hourly", since="2026-10-16T09:30:00", until="2026-10-16T10:10:00")
+    assert response.status_code == 200
+    body = response.json()
+    # 09:30은 09시 구간부터, 10:10은 10시 구간 끝까지 포함
+    assert (body["since"], body["until"]) == ("2026-10-16T09:00:00", "2026-10-16T11:00:00")
+    assert [(bucket["bucket_start"], bucket["run_count"], bucket["failure_count"]) for bucket in body["buckets"]] == [
+        ("2026-10-16T09:00:00", 2, 1),
+        ("2026-10-16T10:00:00", 1, 0),
+    ]
+
+    response = _get(db_service, "/stats/summary", since="2026-10-16T09:00:00", until="2026-10-16T11:00:00",
+                    group_by=["host_name"])
+    rows = {row["host_name"]: row for row in response.json()["rows"]}
+    assert rows["host-1"]["run_count"] == 2
+    assert rows["host-1"]["duration_avg"] == pytest.approx(4.0)
+    assert (rows["host-1"]["duration_min"], rows["host-1"]["duration_max"]) == (2.0, 6.0)
+    assert rows["host-0"]["failure_rate"] == 1.0
+    assert rows["host-0"]["target_count_sum"] == 2
+
+
+def test_stats_accept_timezone_aware_query(db_service):
+    response = _get(db_service, "/stats/summary", since="2026-10-16T00:00:00Z")
+    assert response.status_code == 200
+    assert response.json()["rows"] == []
+
+
+def test_duration_percentiles_merge_hourly_sketches(db_service):
+    base = datetime(2026, 10, 16, 9, 0)
+    durations = [float(value) for value in range(1, 101)]
+    # 두 배치에 나눠 저장해도 같은 시간 구간 스케치에 병합
+    executions = [_execution(index, base + timedelta(minutes=index % 120), duration) for index, duration in enumerate(durations)]
+    asyncio.run(db_service.save_executions(executions[:50]))
+    asyncio.run(db_service.save_executions(executions[50:]))
+
+    response = _get(db_service, "/stats/percentiles", since="2026-10-16T09:00:00", until="2026-10-16T11:00:00",
+                    group_by=["platform_type"], q=[0.5, 0.99])
+    assert response.status_code == 200
+    [row] = response.json()["rows"]
+    assert (row["count"], row["min"], row["max"]) == (100, 1.0, 100.0)
+    assert row["quantiles"]["p50"] == pytest.approx(50.0, rel=0.02)
+    assert row["quantiles"]["p99"] == pytest.approx(99.0, rel=0.02)
+
+
+def test_unsupported_dialect_is_rejected_at_startup():
+    for dialect in ("mysql", "mariadb", "sqlite", "postgresql"):
+        check_dialect(dialect)
+    with pytest.raises(ValueError):
+        check_dialect("mssql")
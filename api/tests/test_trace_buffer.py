@@ -0,0 +1,109 @@
+from typing import Optional
+
+from opentelemetry.proto.trace.v1 import trace_pb2
+
+from utils.trace_buffer import TraceBuffer
+from utils.trace_processor import ExecutionExtractor
+
+TRACE_ID = b"\x0a" * 16
+ROOT_SPAN_ID = b"\x01" * 8
+MANUAL_SPAN_ID = b"\x02" * 8
+
+
+def _batch(*spans: trace_pb2.Span) -> ExecutionExtractor:
+    resource_span = trace_pb2.ResourceSpans()
+    resource_span.scope_spans.add().spans.extend(spans)
+    extractor = ExecutionExtractor()
+    extractor.add_resource_spans(resource_span)
+    return extractor
+
+
+def _manual(span_id: bytes = ROOT_SPAN_ID, parent_span_id: bytes = b"", trace_id: bytes = TRACE_ID) -> trace_pb2.Span:
+    span = trace_pb2.Span(
+        trace_id=trace_id, span_id=span_id, parent_span_id=parent_span_id, name="process",
+        start_time_unix_nano=1_700_000_000_000_000_000, end_time_unix_nano=1_700_000_001_000_000_000,
+    )
+    span.attributes.add(key="etl.process_name").value.string_value = "process"
+    return span
+
+
+def _auto(status_code: int, parent_span_id: Optional[bytes] = ROOT_SPAN_ID, trace_id: bytes = TRACE_ID) -> trace_pb2.Span:
+    span = trace_pb2.Span(trace_id=trace_id, span_id=bytes([status_code % 256]) * 8, parent_span_id=parent_span_id, name="GET")
+    span.attributes.add(key="http.status_code").value.int_value = status_code
+    return span
+
+
+def _buffer() -> TraceBuffer:
+    return TraceBuffer(ttl=5.0, max_traces=100, max_spans=1000)
+
+
+def test_orphan_auto_spans_are_stitched_to_a_later_manual_root():
+    buffer = _buffer()
+
+    assert buffer.stitch(_batch(_auto(200)), now=0.0) == []
+    assert buffer.snapshot()["orphan_spans"] == 1
+
+    executions = buffer.stitch(_batch(_manual()), now=1.0)
+    assert [execution.auto_spans for execution in executions] == [[{"http.status_code": 200}]]
+    assert len(buffer) == 0
+    assert buffer.stats.stitched_auto_spans == 1
+
+
+def test_auto_spans_of_a_finished_trace_without_manual_span_are_not_buffered():
+    buffer = _buffer()
+    extractor = _batch(_auto(200, parent_span_id=b""), _auto(201))
+
+    assert buffer.stitch(extractor, now=0.0) == []
+    assert len(buffer) == 0
+    assert extractor.dropped_auto_spans == 2
+
+
+def test_non_root_manual_span_is_held_until_root_only_with_origin():
+    buffer = _buffer()
+
+    # 스풀 레코드 위치(origin)가 있으면 루트가 올 때까지 보류하고 checkpoint를 그 앞에 묶어 둠
+    assert buffer.stitch(_batch(_manual(MANUAL_SPAN_ID, ROOT_SPAN_ID)), now=0.0, origin=3) == []
+    assert buffer.oldest_origin() == 3
+
+    root = _auto(200, parent_span_id=b"")
+    root.span_id = ROOT_SPAN_ID
+    executions = buffer.stitch(_batch(_auto(201), root), now=1.0, origin=7)
+    assert [execution.auto_spans for execution in executions] == [[{"http.status_code": 201}, {"http.status_code": 200}]]
+    assert buffer.oldest_origin() is None
+    assert buffer.stats.root_flushes == 1
+
+
+def test_manual_span_is_not_held_without_origin():
+    buffer = _buffer()
+
+    # 스풀 없이 이미 응답한 요청은 다시 처리할 수 없으므로 바로 저장
+    executions = buffer.stitch(_batch(_manual(MANUAL_SPAN_ID, ROOT_SPAN_ID)), now=0.0)
+    assert len(executions) == 1
+    assert buffer.stats.held_executions == 0
+    assert buffer.oldest_origin() is None
+
+
+def test_expire_releases_held_executions_and_drops_orphans():
+    buffer = _buffer()
+    buffer.stitch(_batch(_manual(MANUAL_SPAN_ID, ROOT_SPAN_ID)), now=0.0, origin=1)
+    buffer.stitch(_batch(_auto(200, trace_id=b"\x0b" * 16)), now=2.0)
+
+    assert buffer.expire(now=4.9) == []
+    assert len(buffer.expire(now=5.0)) == 1
+    assert buffer.oldest_origin() is None
+    assert buffer.expire(now=7.0) == []
+    assert len(buffer) == 0
+    assert buffer.stats.expired_flushes == 1
+    assert buffer.stats.expired_orphan_spans == 1
+
+
+def test_orphan_spans_over_cap_evict_oldest_trace():
+    buffer = TraceBuffer(ttl=5.0, max_traces=100, max_spans=1000, max_orphan_spans=2)
+    for index in range(3):
+        buffer.stitch(_batch(_auto(200 + index, trace_id=bytes([index]) * 16)), now=float(index))
+
+    assert buffer.snapshot()["orphan_spans"] == 2
+    assert buffer.stats.evicted_orphan_spans == 1
+    # 가장 오래된 trace가 버려져 이후 수동계측 스팬에 연결되지 않음
+    executions = buffer.stitch(_batch(_manual(trace_id=b"\x00" * 16)), now=3.0)
+    assert executions[0].auto_spans is None
@@ -0,0 +1,110 @@
+from google.protobuf.json_format import MessageToDict
+from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
+from opentelemetry.proto.trace.v1 import trace_pb2
+
+from utils.trace_processor import ExecutionExtractor, extract_process_executions
+
+TRACE_ID = bytes(range(16))
+ROOT_SPAN_ID = b"\x01" * 8
+
+
+def _request(manual_first: bool) -> trace_service_pb2.ExportTraceServiceRequest:
+    """수동계측 루트 스팬과 그 자식 GET 스팬이 서로 다른 ResourceSpans에 담긴 요청"""
+    request = trace_service_pb2.ExportTraceServiceRequest()
+    manual = trace_pb2.ResourceSpans()
+    manual.resource.attributes.add(key="host.name").value.string_value = "etl-host"
+    root = manual.scope_spans.add().spans.add(
+        trace_id=TRACE_ID, span_id=ROOT_SPAN_ID, name="process",
+        start_time_unix_nano=1_700_000_000_000_000_000, end_time_unix_nano=1_700_000_001_000_000_000,
+    )
+    root.attributes.add(key="etl.process_name").value.string_value = "process"
+
+    auto = trace_pb2.ResourceSpans()
+    auto.resource.attributes.add(key="host.name").value.string_value = "proxy-host"
+    scope = auto.scope_spans.add()
+    child = scope.spans.add(
+        trace_id=TRACE_ID, span_id=b"\x02" * 8, parent_span_id=ROOT_SPAN_ID, name="GET",
+        start_time_unix_nano=1_700_000_000_100_000_000, end_time_unix_nano=1_700_000_000_200_000_000,
+    )
+    child.attributes.add(key="http.status_code").value.int_value = 200
+    # 수동계측 스팬이 없는 트레이스의 자동계측 스팬은 버림
+    orphan = scope.spans.add(trace_id=b"\xff" * 16, span_id=b"\x03" * 8, name="GET")
+    orphan.attributes.add(key="http.status_code").value.int_value = 404
+
+    request.resource_spans.extend([manual, auto] if manual_first else [auto, manual])
+    return request
+
+
+def _extract(request: trace_service_pb2.ExportTraceServiceRequest, split: bool = False) -> ExecutionExtractor:
+    extractor = ExecutionExtractor()
+    for resource_span in request.resource_spans:
+        if split:
+            # 프로세스 풀 워커처럼 ResourceSpans마다 따로 추출한 결과를 합침
+            partial = ExecutionExtractor()
+            partial.add_resource_spans(resource_span)
+            extractor.merge(partial)
+        else:
+            extractor.add_resource_spans(resource_span)
+    return extractor
+
+
+def test_auto_span_in_other_resource_is_linked():
+    for manual_first in (True, False):
+        for split in (False, True):
+            extractor = _extract(_request(manual_first), split)
+            executions = extractor.finish()
+
+            assert len(executions) == 1, (manual_first, split)
+            assert executions[0].host_name == "etl-host"
+            assert executions[0].auto_spans == [{"http.status_code": 200}], (manual_first, split)
+            assert extractor.dropped_auto_spans == 1, (manual_first, split)
+
+
+def test_dict_path_links_auto_span_in_other_resource():
+    for manual_first in (True, False):
+        trace_data = MessageToDict(_request(manual_first))
+        executions = extract_process_executions(trace_data)
+
+        assert len(executions) == 1
+        assert executions[0].auto_spans == [{"http.status_code": 200}]
+
+
+def test_pending_auto_spans_respect_per_trace_limit():
+    request = _request(manual_first=False)
+    scope = request.resource_spans[0].scope_spans[0]
+    for index in range(5):
+        extra = scope.spans.add(trace_id=TRACE_ID, span_id=bytes([index + 10]) * 8, name="GET")
+        extra.attributes.add(key="http.status_code").value.int_value = index
+    extractor = ExecutionExtractor(max_auto_spans_per_trace=3)
+    for resource_span in request.resource_spans:
+        extractor.add_resource_spans(resource_span)
+
+    executions = extractor.finish()
+    assert executions[0].auto_spans == [{"http.status_code": 200}, {"http.status_code": 0}, {"http.status_code": 1}]
+    # 한도 초과 3개 + 연결할 수동계측 스팬이 없는 1개
+    assert extractor.dropped_auto_spans == 4
+
+
+
+def test_malformed_etl_times_reject_only_that_span():
+    request = _request(manual_first=True)
+    scope = request.resource_spans[0].scope_spans[0]
+    # 형식이 잘못된 문자열(ValueError)과 문자열이 아닌 값(TypeError)
+    for index, start_time in enumerate(["not-a-time", 1_700_000_000]):
+        span = scope.spans.add(
+            trace_id=bytes([index + 20]) * 16, span_id=bytes([index + 20]) * 8, name="process",
+            start_time_unix_nano=1_700_000_000_000_000_000, end_time_unix_nano=1_700_000_001_000_000_000,
+        )
+        span.attributes.add(key="etl.process_name").value.string_value = "broken"
+        value = span.attributes.add(key="etl.start_time").value
+        if isinstance(start_time, str):
+            value.string_value = start_time
+        else:
+            value.int_value = start_time
+        span.attributes.add(key="etl.end_time").value.string_value = "2026-10-16T09:00:01"
+
+    extractor = _extract(request)
+    assert [execution.process_name for execution in extractor.finish()] == ["process"]
+    assert extractor.rejected_spans == 2
+    # MessageToDict 경로도 같은 스팬만 건너뜀
+    assert [execution.process_name for execution in extract_process_executions(MessageToDict(request))] == ["process"]
@@ -0,0 +1,144 @@
+import math
+import struct
+from typing import Dict, Optional, Tuple
+
+# 직렬화 형식 버전 (헤더 첫 바이트)
+FORMAT_VERSION = 1
+# 버전, 상대 오차, 전체 수, 0 구간 수, 합계, 최솟값, 최댓값
+_HEADER = struct.Struct("<BdQQddd")
+# 이 값 이하는 0 구간에 모음 (로그 구간 인덱스가 너무 작아지지 않도록)
+MIN_INDEXABLE_VALUE = 1e-9
+# 구간 수 상한 (넘으면 가장 작은 구간끼리 합침, 상위 분위수 정확도는 유지)
+DEFAULT_MAX_BINS = 2048
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class DDSketch:
+    """상대 오차가 보장되는 분위수 스케치 (DDSketch, 양수 값 전용)
+
+    값 v는 ceil(log_gamma(v)) 구간에 세며, 분위수는 해당 구간 대표값으로 relative_accuracy 이내의 오차를 가집니다.
+    같은 relative_accuracy끼리는 구간 수를 더하는 것만으로 합칠 수 있어 시간 구간/호스트별 스케치를 자유롭게 병합합니다.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = DEFAULT_MAX_BINS):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be in (0, 1): {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._multiplier = 1 / math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) * self._multiplier)
+
+    def _value(self, key: int) -> float:
+        # 구간 (gamma^(key-1), gamma^key]의 대표값 (구간 안 어떤 값과도 상대 오차 relative_accuracy 이내)
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, count: int = 1):
+        """값 추가 (MIN_INDEXABLE_VALUE 이하 값은 0으로 취급)"""
+        if value > MIN_INDEXABLE_VALUE:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+        else:
+            self.zero_count += count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self):
+        """구간 수가 상한을 넘으면 가장 작은 두 구간을 합침"""
+        lowest, second = sorted(self.bins)[:2]
+        self.bins[second] += self.bins.pop(lowest)
+
+    def merge(self, other: "DDSketch"):
+        """다른 스케치를 합침 (상대 오차가 다르면 대표값으로 다시 구간을 나눔)"""
+        if other.count == 0:
+            return
+        same_mapping = other.gamma == self.gamma
+        for key, count in other.bins.items():
+            if not same_mapping:
+                key = self._key(other._value(key))
+            self.bins[key] = self.bins.get(key, 0) + count
+        while len(self.bins) > self.max_bins:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """q 분위수 (0 ≤ q ≤ 1, 값이 없으면 None)"""
+        if self.count == 0:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError(f"quantile must be in [0, 1]: {q}")
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return min(max(self._value(key), self.min), self.max)
+        return self.max
+
+    def to_bytes(self) -> bytes:
+        """헤더 + (구간 인덱스 차이, 수) varint 목록으로 직렬화"""
+        out = bytearray(_HEADER.pack(
+            FORMAT_VERSION, self.relative_accuracy, self.count, self.zero_count,
+            self.sum, self.min, self.max,
+        ))
+        _write_varint(out, len(self.bins))
+        previous = 0
+        for key in sorted(self.bins):
+            delta = key - previous
+            # zigzag 인코딩 (첫 인덱스는 음수일 수 있음)
+            _write_varint(out, (delta << 1) ^ (delta >> 63))
+            _write_varint(out, self.bins[key])
+            previous = key
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_bins: int = DEFAULT_MAX_BINS) -> "DDSketch":
+        version, relative_accuracy, count, zero_count, total, minimum, maximum = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported sketch format version: {version}")
+        sketch = cls(relative_accuracy, max_bins)
+        sketch.count, sketch.zero_count, sketch.sum = count, zero_count, total
+        sketch.min, sketch.max = minimum, maximum
+        bin_count, pos = _read_varint(data, _HEADER.size)
+        key = 0
+        for _ in range(bin_count):
+            encoded, pos = _read_varint(data, pos)
+            key += (encoded >> 1) ^ -(encoded & 1)
+            sketch.bins[key], pos = _read_varint(data, pos)
+        return sketch
+
@@ -0,0 +1,58 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class DedupCache:
+    """최근 저장한 키의 LRU 캐시 (collector 재전송 배치를 DB 조회 없이 걸러내기 위한 앞단 필터)
+
+    캐시에 없는 키는 DB의 유니크 제약/기존 키 조회로 최종 판단하므로, 캐시가 가득 차 밀려난 키는
+    DB 조회 비용만 늘어날 뿐 중복 저장되지는 않습니다. 이벤트 루프에서만 사용합니다.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._keys: "OrderedDict[Hashable, None]" = OrderedDict()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keys
+
+    def filter(self, items: Iterable[T], key_func: Callable[[T], Optional[Hashable]]) -> Tuple[List[T], int]:
+        """캐시에 있거나 같은 배치에 이미 나온 항목을 제외하고 (남은 항목, 제외한 수) 반환
+
+        키가 None인 항목은 항상 남깁니다.
+        """
+        remaining = []
+        seen = set()
+        skipped = 0
+        for item in items:
+            key = key_func(item)
+            if key is not None:
+                if key in self._keys:
+                    self._keys.move_to_end(key)
+                    skipped += 1
+                    continue
+                if key in seen:
+                    skipped += 1
+                    continue
+                seen.add(key)
+            remaining.append(item)
+        self.hits += skipped
+        return remaining, skipped
+
+    def add(self, keys: Iterable[Optional[Hashable]]):
+        """저장이 확인된 키 추가 (가장 오래 쓰이지 않은 키부터 제거)"""
+        if self.max_size <= 0:
+            return
+        for key in keys:
+            if key is None:
+                continue
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+        while len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
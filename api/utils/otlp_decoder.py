@@ -0,0 +1,363 @@
+import asyncio
+import sys
+import time
+import zlib
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from google.protobuf.message import DecodeError
+from opentelemetry.proto.trace.v1 import trace_pb2
+
+from utils.stage_timer import StageTimer
+from utils.trace_buffer import TraceBuffer
+from utils.trace_processor import DEFAULT_MAX_AUTO_SPANS_PER_TRACE, ExecutionExtractor, ProcessExecutionData
+
+GZIP_MAGIC = b"\x1f\x8b\x08"
+
+# ExportTraceServiceRequest.resource_spans 필드 번호
+RESOURCE_SPANS_FIELD = 1
+# protobuf 필드 번호 상한 (2^29 - 1)
+MAX_FIELD_NUMBER = (1 << 29) - 1
+
+
+class PayloadTooLargeError(Exception):
+    """압축 해제된 요청 본문이 허용 크기를 넘은 경우 (gzip bomb 방지)"""
+
+
+@dataclass
+class DecodeResult:
+    """압축 해제 → protobuf 파싱 → 실행 정보 추출 결과와 단계별 소요 시간(초)"""
+    executions: List[ProcessExecutionData]
+    decompressed_size: int
+    timings: Dict[str, float] = field(default_factory=dict)
+    offloaded_segments: int = 0
+    rejected_spans: int = 0
+    # 수동계측 스팬과 연결되지 않았거나 trace_id당 최대 수를 넘어 버린 자동계측 스팬 수
+    dropped_auto_spans: int = 0
+    # 받은 본문 크기(압축 상태)와 전체 스팬 수
+    received_size: int = 0
+    spans: int = 0
+
+
+def is_gzip(content_encoding: str, payload: bytes) -> bool:
+    """Content-Encoding 헤더 또는 gzip 매직 바이트로 압축 여부 판단"""
+    return content_encoding == "gzip" or payload.startswith(GZIP_MAGIC)
+
+
+class StreamingDecompressor:
+    """청크 단위 gzip 해제기 (압축되지 않은 본문은 그대로 통과)
+
+    해제 결과가 max_output을 넘는 순간 PayloadTooLargeError를 발생시키며,
+    한 번에 해제하는 양도 남은 허용량으로 제한하므로 메모리 사용량이 상한을 넘지 않습니다.
+    """
+
+    def __init__(self, content_encoding: str, max_output: int):
+        self.content_encoding = content_encoding
+        self.max_output = max_output
+        self.total = 0
+        self._decompressor = None
+        self._started = False
+        # gzip 매직 바이트 판별 전까지 모아두는 앞부분 (청크가 매우 작게 들어오는 경우)
+        self._head = b""
+
+    def _check_size(self, output: bytes) -> bytes:
+        self.total += len(output)
+        if self.total > self.max_output:
+            raise PayloadTooLargeError(f"decompressed payload exceeds {self.max_output} bytes")
+        return output
+
+    def _remaining(self, pending: int = 0) -> int:
+        """이번 호출에서 해제할 수 있는 최대 바이트 (허용량 + 1, 넘으면 _check_size에서 거부)"""
+        return min(self.max_output - self.total - pending + 1, sys.maxsize)
+
+    def _decompress(self, data: bytes) -> bytes:
+        try:
+            return self._decompress_members(data)
+        except zlib.error as e:
+            # 손상된 gzip 본문은 잘린 스트림과 같이 잘못된 요청으로 처리
+            raise DecodeError(f"invalid gzip stream: {e}") from e
+
+    def _decompress_members(self, data: bytes) -> bytes:
+        # 남은 허용량까지만 해제하므로 gzip bomb도 한도 이상 메모리에 풀리지 않음
+        output = self._decompressor.decompress(data, self._remaining())
+        # 여러 gzip 멤버가 이어진 경우 다음 멤버로 계속 진행
+        while self._decompressor.eof and self._decompressor.unused_data:
+            unused_data = self._decompressor.unused_data
+            remaining = self._remaining(len(output))
+            if remaining <= 0:
+                # max_length=0은 무제한을 뜻하므로 이미 한도를 넘었으면 여기서 중단
+                raise PayloadTooLargeError(f"decompressed payload exceeds {self.max_output} bytes")
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            output += self._decompressor.decompress(unused_data, remaining)
+        return output
+
+    def feed(self, chunk: bytes) -> bytes:
+        """압축된 청크를 받아 해제된 바이트 반환"""
+        if not chunk:
+            return b""
+        if not self._started:
+            chunk = self._head + chunk
+            if self.content_encoding != "gzip" and len(chunk) < len(GZIP_MAGIC):
+                self._head = chunk
+                return b""
+            self._start(chunk)
+        if self._decompressor is None:
+            return self._check_size(chunk)
+        return self._check_size(self._decompress(chunk))
+
+    def _start(self, head: bytes):
+        """본문 앞부분으로 압축 여부 결정"""
+        self._started = True
+        self._head = b""
+        if is_gzip(self.content_encoding, head):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def flush(self) -> bytes:
+        """스트림 종료 시 남은 데이터 반환 (gzip 스트림이 끝나지 않았으면 오류)"""
+        if not self._started:
+            # 매직 바이트 길이보다 짧은 본문은 압축되지 않은 것으로 처리
+            head = self._head
+            self._start(head)
+            return self._check_size(head)
+        if self._decompressor is None:
+            return b""
+        output = self._check_size(self._decompressor.flush())
+        if not self._decompressor.eof:
+            raise DecodeError("truncated gzip stream")
+        return output
+
+
+def _read_varint(buffer: bytearray, pos: int) -> Optional[Tuple[int, int]]:
+    """pos에서 varint를 읽어 (값, 다음 위치) 반환 (데이터가 아직 부족하면 None)"""
+    result = 0
+    shift = 0
+    while pos < len(buffer):
+        byte = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise DecodeError("malformed varint")
+    return None
+
+
+class ResourceSpansReader:
+    """ExportTraceServiceRequest 바이트 스트림에서 resource_spans 메시지를 하나씩 잘라내는 파서
+
+    전체 요청을 ParseFromString 하지 않고 최상위 필드의 wire format만 읽으므로,
+    버퍼에는 아직 완성되지 않은 ResourceSpans 하나 분량만 남습니다.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def _read_tag(self, pos: int) -> Optional[Tuple[int, int, int]]:
+        """pos에서 태그를 읽어 (필드 번호, wire type, 다음 위치) 반환 (ParseFromString처럼 잘못된 필드 번호는 오류)"""
+        parsed = _read_varint(self._buffer, pos)
+        if parsed is None:
+            return None
+        tag, pos = parsed
+        field_number = tag >> 3
+        if not 0 < field_number <= MAX_FIELD_NUMBER:
+            raise DecodeError(f"invalid field number {field_number}")
+        return field_number, tag & 0x07, pos
+
+    def _skip_value(self, field_number: int, wire_type: int, pos: int) -> Optional[int]:
+        """pos부터 값 하나를 건너뛴 위치 반환 (데이터가 아직 부족하면 None)"""
+        if wire_type == 0:
+            parsed = _read_varint(self._buffer, pos)
+            return None if parsed is None else parsed[1]
+        if wire_type == 1:
+            end = pos + 8
+        elif wire_type == 5:
+            end = pos + 4
+        elif wire_type == 2:
+            parsed = _read_varint(self._buffer, pos)
+            if parsed is None:
+                return None
+            length, pos = parsed
+            end = pos + length
+        elif wire_type == 3:
+            # 알 수 없는 그룹(proto2)은 같은 필드 번호의 END_GROUP까지 건너뜀
+            while True:
+                parsed = self._read_tag(pos)
+                if parsed is None:
+                    return None
+                inner_field, inner_type, pos = parsed
+                if inner_type == 4:
+                    if inner_field != field_number:
+                        raise DecodeError(f"mismatched end group for field {field_number}")
+                    return pos
+                pos = self._skip_value(inner_field, inner_type, pos)
+                if pos is None:
+                    return None
+        else:
+            raise DecodeError(f"unsupported wire type {wire_type}")
+        return end if end <= len(self._buffer) else None
+
+    def _next_field(self, pos: int) -> Optional[Tuple[int, Optional[memoryview], int]]:
+        """pos에서 필드 하나를 읽어 (필드 번호, length-delimited 값, 다음 위치) 반환"""
+        parsed = self._read_tag(pos)
+        if parsed is None:
+            return None
+        field_number, wire_type, pos = parsed
+        if wire_type != 2:
+            end = self._skip_value(field_number, wire_type, pos)
+            return None if end is None else (field_number, None, end)
+        parsed = _read_varint(self._buffer, pos)
+        if parsed is None:
+            return None
+        length, pos = parsed
+        end = pos + length
+        if end > len(self._buffer):
+            return None
+        return field_number, memoryview(self._buffer)[pos:end], end
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """해제된 바이트를 추가하고 완성된 ResourceSpans 직렬화 바이트 목록 반환"""
+        self._buffer += data
+        segments = []
+        pos = 0
+        while True:
+            parsed = self._next_field(pos)
+            if parsed is None:
+                break
+            field_number, value, pos = parsed
+            if field_number == RESOURCE_SPANS_FIELD and value is not None:
+                segments.append(value.tobytes())
+            if value is not None:
+                value.release()
+        del self._buffer[:pos]
+        return segments
+
+    def close(self):
+        """스트림 종료 시 잘린 메시지가 남아 있으면 오류"""
+        if self._buffer:
+            raise DecodeError(f"truncated ExportTraceServiceRequest ({len(self._buffer)} trailing bytes)")
+
+
+def _add_segment(
+        extractor: ExecutionExtractor,
+        segment: bytes,
+        timings: Dict[str, float],
+        stage_timer: Optional[StageTimer] = None,
+    ):
+    """ResourceSpans 직렬화 바이트를 파싱해 추출기에 반영"""
+    started = time.perf_counter()
+    resource_span = trace_pb2.ResourceSpans.FromString(segment)
+    parsed = time.perf_counter()
+    timings["parse"] = timings.get("parse", 0.0) + parsed - started
+
+    span_count = extractor.span_count
+    extractor.add_resource_spans(resource_span)
+    extracted = time.perf_counter()
+    timings["extract"] = timings.get("extract", 0.0) + extracted - parsed
+    if stage_timer is not None:
+        stage_timer.record("parse", started, parsed, bytes=len(segment))
+        stage_timer.record("extract", parsed, extracted, spans=extractor.span_count - span_count)
+
+
+def extract_resource_spans(
+        segment: bytes,
+        max_auto_spans_per_trace: int = DEFAULT_MAX_AUTO_SPANS_PER_TRACE,
+    ) -> Tuple[ExecutionExtractor, Dict[str, float]]:
+    """ResourceSpans 하나를 파싱/추출한 부분 결과 반환
+
+    CPU 작업만 수행하는 모듈 수준 함수이므로 프로세스 풀 워커에서도 그대로 실행할 수 있습니다.
+    """
+    extractor = ExecutionExtractor(max_auto_spans_per_trace)
+    timings = {}
+    _add_segment(extractor, segment, timings)
+    return extractor, timings
+
+
+async def decode_stream(
+        chunks: AsyncIterator[bytes],
+        content_encoding: str,
+        max_decompressed_bytes: int,
+        decode_pool: Optional[Executor] = None,
+        offload_threshold: int = 0,
+        max_auto_spans_per_trace: int = DEFAULT_MAX_AUTO_SPANS_PER_TRACE,
+        trace_buffer: Optional[TraceBuffer] = None,
+        stage_timer: Optional[StageTimer] = None,
+        trace_origin: Optional[Any] = None,
+    ) -> DecodeResult:
+    """요청 본문 스트림을 청크 단위로 해제하면서 ResourceSpans 단위로 파싱/추출
+
+    한 번에 메모리에 올라가는 것은 압축 청크 하나와 ResourceSpans 하나 분량이며,
+    offload_threshold 이상인 ResourceSpans는 decode_pool(프로세스 풀)에서 처리합니다.
+    trace_buffer가 있으면 이전 배치와 연결한 뒤 지금 저장할 실행 정보만 반환합니다
+    (trace_origin이 있으면 루트 스팬을 기다리는 실행 정보는 trace_origin과 함께 버퍼에 보류).
+    stage_timer가 있으면 ResourceSpans별 parse/extract(또는 offload)와 마지막 변환 구간을 단계로 기록합니다
+    (청크별 압축 해제는 구간이 너무 잘게 나뉘므로 합계만 DecodeResult.timings에 남김).
+    """
+    timings = {"decompress": 0.0, "parse": 0.0, "extract": 0.0, "ipc": 0.0}
+    decompressor = StreamingDecompressor(content_encoding, max_decompressed_bytes)
+    reader = ResourceSpansReader()
+    extractor = ExecutionExtractor(max_auto_spans_per_trace)
+    loop = asyncio.get_running_loop()
+    offloaded_segments = 0
+
+    async def apply_segments(segments: List[bytes]):
+        nonlocal offloaded_segments
+        for segment in segments:
+            if decode_pool is not None and len(segment) >= offload_threshold:
+                started = time.perf_counter()
+                partial, segment_timings = await loop.run_in_executor(
+                    decode_pool, extract_resource_spans, segment, max_auto_spans_per_trace
+                )
+                finished = time.perf_counter()
+                span_count = extractor.span_count
+                extractor.merge(partial)
+                for stage, value in segment_timings.items():
+                    timings[stage] += value
+                # 직렬화/프로세스 간 전달 비용 (인라인 대비 손익분기점 확인용)
+                ipc = max(finished - started - sum(segment_timings.values()), 0.0)
+                timings["ipc"] += ipc
+                offloaded_segments += 1
+                if stage_timer is not None:
+                    stage_timer.record(
+                        "offload", started, finished, bytes=len(segment), spans=extractor.span_count - span_count,
+                        parse_seconds=segment_timings["parse"], extract_seconds=segment_timings["extract"],
+                        ipc_seconds=ipc,
+                    )
+            else:
+                _add_segment(extractor, segment, timings, stage_timer)
+
+    received_size = 0
+    async for chunk in chunks:
+        received_size += len(chunk)
+        started = time.perf_counter()
+        content = decompressor.feed(chunk)
+        timings["decompress"] += time.perf_counter() - started
+        await apply_segments(reader.feed(content))
+
+    started = time.perf_counter()
+    content = decompressor.flush()
+    timings["decompress"] += time.perf_counter() - started
+    await apply_segments(reader.feed(content))
+    reader.close()
+
+    started = time.perf_counter()
+    if trace_buffer is not None:
+        executions = trace_buffer.stitch(extractor, origin=trace_origin)
+    else:
+        executions = extractor.finish()
+    finished = time.perf_counter()
+    timings["extract"] += finished - started
+    if stage_timer is not None:
+        stage_timer.record("convert", started, finished, executions=len(executions), buffered=trace_buffer is not None)
+
+    return DecodeResult(
+        executions=executions,
+        decompressed_size=decompressor.total,
+        timings=timings,
+        offloaded_segments=offloaded_segments,
+        rejected_spans=extractor.rejected_spans,
+        dropped_auto_spans=extractor.dropped_auto_spans,
+        received_size=received_size,
+        spans=extractor.span_count,
+    )
@@ -0,0 +1,94 @@
+from typing import Optional
+
+from fastapi import Response
+from opentelemetry.proto.collector.trace.v1 import trace_service_pb2
+
+PROTOBUF_CONTENT_TYPE = "application/x-protobuf"
+
+# OTLP/HTTP 스펙상 collector가 재시도하는 상태 코드
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+# HTTP 상태 코드 → google.rpc.Code
+_GRPC_CODES = {
+    400: 3,    # INVALID_ARGUMENT
+    413: 3,    # INVALID_ARGUMENT
+    415: 3,    # INVALID_ARGUMENT
+    429: 8,    # RESOURCE_EXHAUSTED
+    500: 13,   # INTERNAL
+    503: 14,   # UNAVAILABLE
+}
+
+
+def grpc_status_code(status_code: int) -> int:
+    """HTTP 상태 코드에 대응하는 google.rpc.Code (gRPC 응답에서도 같은 분류 사용)"""
+    return _GRPC_CODES.get(status_code, 2)   # 2: UNKNOWN
+
+
+def _encode_varint(value: int) -> bytes:
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def _encode_length_delimited(field_number: int, data: bytes) -> bytes:
+    return _encode_varint(field_number << 3 | 2) + _encode_varint(len(data)) + data
+
+
+def _encode_retry_info(retry_after: int) -> bytes:
+    """google.protobuf.Any(google.rpc.RetryInfo(retry_delay=Duration(seconds)))"""
+    duration = b"\x08" + _encode_varint(retry_after)
+    retry_info = _encode_length_delimited(1, duration)
+    return (
+        _encode_length_delimited(1, b"type.googleapis.com/google.rpc.RetryInfo")
+        + _encode_length_delimited(2, retry_info)
+    )
+
+
+def encode_rpc_status(code: int, message: str, retry_after: Optional[int] = None) -> bytes:
+    """google.rpc.Status(code=1, message=2, details=3) 직렬화 (googleapis 의존성 없이 wire format으로 작성)
+
+    retry_after가 있으면 gRPC 클라이언트가 재시도 간격으로 사용하는 RetryInfo를 details에 담습니다.
+    """
+    encoded = (
+        b"\x08" + _encode_varint(code)
+        + _encode_length_delimited(2, message.encode("utf-8"))
+    )
+    if retry_after is not None:
+        encoded += _encode_length_delimited(3, _encode_retry_info(retry_after))
+    return encoded
+
+
+def build_export_response(rejected_spans: int = 0, error_message: str = "") -> trace_service_pb2.ExportTraceServiceResponse:
+    """ExportTraceServiceResponse 생성 (거부된 스팬이 있을 때만 partial_success 설정)"""
+    response = trace_service_pb2.ExportTraceServiceResponse()
+    if rejected_spans or error_message:
+        response.partial_success.rejected_spans = rejected_spans
+        response.partial_success.error_message = error_message
+    return response
+
+
+def export_success_response(rejected_spans: int = 0, error_message: str = "") -> Response:
+    """OTLP/HTTP 성공 응답 (200, protobuf ExportTraceServiceResponse)"""
+    return Response(
+        content=build_export_response(rejected_spans, error_message).SerializeToString(),
+        media_type=PROTOBUF_CONTENT_TYPE,
+    )
+
+
+def export_error_response(status_code: int, message: str, retry_after: Optional[int] = None) -> Response:
+    """OTLP/HTTP 실패 응답 (protobuf google.rpc.Status, 재시도 가능 코드면 Retry-After 포함)"""
+    headers = {}
+    if retry_after is not None and status_code in RETRYABLE_STATUS_CODES:
+        headers["Retry-After"] = str(retry_after)
+    return Response(
+        content=encode_rpc_status(grpc_status_code(status_code), message),
+        status_code=status_code,
+        media_type=PROTOBUF_CONTENT_TYPE,
+        headers=headers,
+    )
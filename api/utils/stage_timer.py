@@ -0,0 +1,79 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class Stage:
+    """단계 하나의 구간 (시각은 time.perf_counter 기준 초)"""
+    name: str
+    started: float
+    ended: float = 0.0
+    # 상위 단계의 StageTimer.stages 인덱스 (None이면 최상위 단계)
+    parent: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return self.ended - self.started
+
+
+class StageTimer:
+    """요청 하나의 처리 단계별 소요 시간 트리 (수신 파이프라인 자체 추적용)
+
+    perf_counter 값과 단계 이름만 목록에 쌓으므로 모든 요청에 만들어도 비용이 작고,
+    내보낼지 여부는 끝난 뒤 SelfTracer가 샘플링/지연 기준으로 결정합니다.
+    이벤트 루프에서 순서대로 진행되는 요청 하나에서만 사용합니다 (동시에 도는 작업끼리 공유하지 않음).
+    """
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        # perf_counter 기준 시각을 벽시계 시각으로 바꾸기 위한 기준점
+        self.wall_started = time.time_ns()
+        self.started = time.perf_counter()
+        self.ended = 0.0
+        self.stages: List[Stage] = []
+        self._open: List[int] = []
+
+    @property
+    def duration(self) -> float:
+        return (self.ended or time.perf_counter()) - self.started
+
+    def record(self, name: str, started: float, ended: float, **attributes) -> Stage:
+        """이미 측정한 구간(perf_counter 값)을 현재 열린 단계의 하위 단계로 추가"""
+        stage = Stage(name, started, ended, self._open[-1] if self._open else None, attributes)
+        self.stages.append(stage)
+        return stage
+
+    @contextmanager
+    def stage(self, name: str, **attributes) -> Iterator[Stage]:
+        """with 블록 구간을 단계로 기록 (블록 안에서 attributes에 결과 크기 등을 추가할 수 있음)"""
+        stage = self.record(name, time.perf_counter(), 0.0, **attributes)
+        self._open.append(len(self.stages) - 1)
+        try:
+            yield stage
+        except BaseException as e:
+            stage.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            self._open.pop()
+            stage.ended = time.perf_counter()
+
+    def finish(self, **attributes) -> "StageTimer":
+        """전체 구간 종료 및 요청 단위 속성(배치 크기 등) 추가"""
+        self.ended = time.perf_counter()
+        self.attributes.update(attributes)
+        return self
+
+    def wall_time_ns(self, perf_time: float) -> int:
+        """perf_counter 값을 Unix epoch 나노초로 변환"""
+        return self.wall_started + int((perf_time - self.started) * 1e9)
+
+    def summary(self) -> str:
+        """로그용 한 줄 요약 (이름별 합계 ms)"""
+        totals: Dict[str, float] = {}
+        for stage in self.stages:
+            totals[stage.name] = totals.get(stage.name, 0.0) + stage.duration
+        return ", ".join(f"{name}={elapsed * 1000:.1f}ms" for name, elapsed in totals.items())
@@ -0,0 +1,236 @@
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Hashable, List, Optional
+
+from utils.trace_processor import ExecutionExtractor, ProcessExecutionData
+
+
+@dataclass
+class TraceBufferStats:
+    """트레이스 버퍼 누적 통계 (TTL/메모리 한도 튜닝용)"""
+    # 이전 배치에서 보관한 자동계측 스팬을 수동계측 스팬에 연결한 수
+    stitched_auto_spans: int = 0
+    # 루트 스팬이 도착하지 않아 보류한 실행 정보 수
+    held_executions: int = 0
+    # 보류한 실행 정보를 저장으로 넘긴 수 (루트 도착 / TTL 만료 / 한도 초과로 조기 방출)
+    root_flushes: int = 0
+    expired_flushes: int = 0
+    evicted_flushes: int = 0
+    # 연결할 수동계측 스팬 없이 버린 자동계측 스팬 수 (루트 도착 / TTL 만료 / 한도 초과)
+    completed_orphan_spans: int = 0
+    expired_orphan_spans: int = 0
+    evicted_orphan_spans: int = 0
+    peak_traces: int = 0
+    peak_spans: int = 0
+
+
+@dataclass
+class _TraceEntry:
+    """trace_id 하나의 보류 상태 (executions가 비어 있으면 수동계측 스팬을 기다리는 자동계측 스팬만 있음)"""
+    created: float
+    executions: List[ProcessExecutionData] = field(default_factory=list)
+    auto_spans: List[Dict[str, Any]] = field(default_factory=list)
+    # 처음 보류한 실행 정보가 나온 요청의 위치 (스풀 레코드 시작 위치, 스풀을 쓰지 않으면 None)
+    origin: Optional[Any] = None
+
+
+class TraceBuffer:
+    """여러 Export 배치에 나뉘어 도착한 트레이스를 잠시 보관했다가 연결하는 버퍼
+
+    collector batch 프로세서가 한 트레이스를 여러 요청으로 나눠 보내면, 같은 요청 안에서만 자동계측 데이터를
+    연결하던 방식으로는 auto_spans가 빠집니다. 이 버퍼는
+    - 수동계측 스팬이 없고 루트 스팬도 아직 도착하지 않은 트레이스의 자동계측 스팬을 ttl초 동안 보관했다가
+      이후 배치의 수동계측 스팬에 연결하고,
+    - 루트가 아닌 수동계측 스팬은 루트 스팬이 끝날 때(또는 ttl 만료 시)까지 보류하며 그 사이 도착한 자동계측 스팬을 합칩니다.
+    수동계측 스팬이 루트이면 자식 스팬은 이미 끝났으므로 바로 내보냅니다.
+
+    보관 중인 trace_id가 max_traces, 자동계측 스팬이 max_spans를 넘으면 가장 오래된 것부터 방출합니다
+    (보류한 실행 정보는 그대로 저장, 자동계측 스팬만 있으면 버림). 수동계측 스팬을 기다리는 자동계측 스팬은
+    대부분 연결되지 않은 채 만료되므로 따로 max_orphan_spans까지만 보관하고 넘으면 오래된 trace부터 버립니다.
+    이벤트 루프에서만 사용합니다.
+
+    보류 중인 실행 정보는 메모리에만 있으므로, 스풀에서 읽은 요청은 stitch에 origin(레코드 위치)을 넘기고
+    oldest_origin() 이전까지만 checkpoint를 기록해야 비정상 종료 후 해당 레코드부터 다시 처리됩니다.
+    origin이 없는 요청(스풀 미사용, 이미 응답함)은 다시 처리할 수 없으므로 보류하지 않고 바로 내보냅니다.
+    """
+
+    def __init__(
+            self,
+            ttl: float,
+            max_traces: int,
+            max_spans: int,
+            max_auto_spans_per_trace: int = 0,
+            max_orphan_spans: Optional[int] = None,
+        ):
+        self.ttl = ttl
+        self.max_traces = max_traces
+        self.max_spans = max_spans
+        self.max_auto_spans_per_trace = max_auto_spans_per_trace
+        self.max_orphan_spans = max_spans if max_orphan_spans is None else max_orphan_spans
+        # 처음 보관한 순서(= 만료 순서)로 유지
+        self._entries: "OrderedDict[Hashable, _TraceEntry]" = OrderedDict()
+        # 자동계측 스팬만 있는 trace_id (처음 보관한 순서)
+        self._orphans: "OrderedDict[Hashable, None]" = OrderedDict()
+        # 보류 중인 실행 정보의 origin별 trace 수
+        self._origins: Dict[Any, int] = {}
+        self.spans = 0
+        self.orphan_spans = 0
+        self.stats = TraceBufferStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _capped(self, auto_spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.max_auto_spans_per_trace and len(auto_spans) > self.max_auto_spans_per_trace:
+            return auto_spans[:self.max_auto_spans_per_trace]
+        return auto_spans
+
+    def _entry(self, trace_id: Hashable, now: float) -> _TraceEntry:
+        entry = self._entries.get(trace_id)
+        if entry is None:
+            entry = self._entries[trace_id] = _TraceEntry(created=now)
+            self._orphans[trace_id] = None
+        return entry
+
+    def _add_auto_spans(self, entry: _TraceEntry, auto_spans: List[Dict[str, Any]]):
+        before = len(entry.auto_spans)
+        entry.auto_spans = self._capped(entry.auto_spans + auto_spans)
+        self.spans += len(entry.auto_spans) - before
+        if not entry.executions:
+            self.orphan_spans += len(entry.auto_spans) - before
+
+    def _hold(self, trace_id: Hashable, executions: List[ProcessExecutionData], origin: Optional[Any], now: float):
+        """루트 스팬을 기다리는 실행 정보 보류 (자동계측 스팬만 있던 trace는 보류 중인 trace로 전환)"""
+        entry = self._entry(trace_id, now)
+        if not entry.executions:
+            self._orphans.pop(trace_id, None)
+            self.orphan_spans -= len(entry.auto_spans)
+            if origin is not None:
+                entry.origin = origin
+                self._origins[origin] = self._origins.get(origin, 0) + 1
+        entry.executions.extend(executions)
+        self.stats.held_executions += len(executions)
+
+    def _pop(self, trace_id: Hashable) -> Optional[_TraceEntry]:
+        entry = self._entries.pop(trace_id, None)
+        if entry is not None:
+            self.spans -= len(entry.auto_spans)
+            if not entry.executions:
+                self._orphans.pop(trace_id, None)
+                self.orphan_spans -= len(entry.auto_spans)
+            elif entry.origin is not None:
+                self._origins[entry.origin] -= 1
+                if not self._origins[entry.origin]:
+                    del self._origins[entry.origin]
+        return entry
+
+    @staticmethod
+    def _release(entry: _TraceEntry) -> List[ProcessExecutionData]:
+        """보류한 실행 정보에 그동안 모인 자동계측 데이터를 반영해 반환"""
+        for execution_data in entry.executions:
+            execution_data.auto_spans = entry.auto_spans or None
+        return entry.executions
+
+    def _discard(self, trace_id: Hashable, flushed_stat: str, dropped_stat: str) -> List[ProcessExecutionData]:
+        """보관 중인 trace를 꺼내 보류한 실행 정보는 반환하고, 자동계측 스팬만 있으면 버림 (통계 필드명 지정)"""
+        entry = self._pop(trace_id)
+        if entry is None:
+            return []
+        if entry.executions:
+            setattr(self.stats, flushed_stat, getattr(self.stats, flushed_stat) + len(entry.executions))
+            return self._release(entry)
+        setattr(self.stats, dropped_stat, getattr(self.stats, dropped_stat) + len(entry.auto_spans))
+        return []
+
+    def stitch(
+            self,
+            extractor: ExecutionExtractor,
+            now: Optional[float] = None,
+            origin: Optional[Any] = None,
+        ) -> List[ProcessExecutionData]:
+        """요청 하나의 추출 결과를 버퍼와 합쳐 지금 저장할 실행 정보 목록 반환
+
+        origin은 이 요청을 다시 처리할 수 있는 위치이며, 이번에 보류한 실행 정보가 저장될 때까지 oldest_origin()에 남습니다
+        (None이면 실행 정보를 보류하지 않음).
+        """
+        now = time.monotonic() if now is None else now
+        # 수동계측 스팬이 없는 자동계측 스팬은 보류 중인 trace이거나 루트가 아직 도착하지 않은 것만 디코딩
+        extractor.link_auto_spans(
+            lambda trace_id: trace_id in self._entries or trace_id not in extractor.root_trace_ids
+        )
+        auto_index = extractor.auto_instrumentation_spans
+        manual_trace_ids = {span.trace_id for span in extractor.manual_spans if span.trace_id}
+
+        # 이전 배치의 자동계측 스팬을 이번 배치의 수동계측 스팬 앞에 연결 (보류 중인 trace는 아래에서 합침)
+        for trace_id in manual_trace_ids:
+            entry = self._entries.get(trace_id)
+            if entry is not None and not entry.executions:
+                self._pop(trace_id)
+                auto_index[trace_id] = self._capped(entry.auto_spans + auto_index.get(trace_id, []))
+                self.stats.stitched_auto_spans += len(entry.auto_spans)
+
+        ready = []
+        held = {}
+        for span, execution_data in extractor.convert():
+            entry = self._entries.get(span.trace_id)
+            if origin is None or (entry is None and (not span.trace_id or span.trace_id in extractor.root_trace_ids)):
+                ready.append(execution_data)
+            else:
+                held.setdefault(span.trace_id, []).append(execution_data)
+
+        # 이번 배치의 자동계측 스팬은 보류 중인 trace에 합치거나, 수동계측 스팬을 기다리도록 보관
+        for trace_id, auto_spans in auto_index.items():
+            if trace_id in manual_trace_ids and trace_id not in self._entries and trace_id not in held:
+                continue
+            self._add_auto_spans(self._entry(trace_id, now), auto_spans)
+
+        for trace_id, executions in held.items():
+            self._hold(trace_id, executions, origin, now)
+
+        # 루트 스팬이 끝난 trace는 보류를 풀어 바로 저장
+        for trace_id in extractor.root_trace_ids:
+            ready.extend(self._discard(trace_id, "root_flushes", "completed_orphan_spans"))
+
+        self.stats.peak_traces = max(self.stats.peak_traces, len(self._entries))
+        self.stats.peak_spans = max(self.stats.peak_spans, self.spans)
+        while self._orphans and self.orphan_spans > self.max_orphan_spans:
+            self._discard(next(iter(self._orphans)), "evicted_flushes", "evicted_orphan_spans")
+        while self._entries and (len(self._entries) > self.max_traces or self.spans > self.max_spans):
+            ready.extend(self._discard(next(iter(self._entries)), "evicted_flushes", "evicted_orphan_spans"))
+        return ready
+
+    def oldest_origin(self) -> Optional[Any]:
+        """보류 중인 실행 정보가 나온 요청 중 가장 앞선 origin (없으면 None)"""
+        return min(self._origins) if self._origins else None
+
+    def expire(self, now: Optional[float] = None) -> List[ProcessExecutionData]:
+        """ttl이 지난 trace를 방출하고 저장할 실행 정보 목록 반환 (주기적으로 호출)"""
+        now = time.monotonic() if now is None else now
+        expired = []
+        while self._entries:
+            trace_id, entry = next(iter(self._entries.items()))
+            if entry.created + self.ttl > now:
+                break
+            expired.extend(self._discard(trace_id, "expired_flushes", "expired_orphan_spans"))
+        return expired
+
+    def drain(self) -> List[ProcessExecutionData]:
+        """보관 중인 모든 trace를 방출 (종료 시 보류한 실행 정보 저장용)"""
+        drained = []
+        while self._entries:
+            drained.extend(self._discard(next(iter(self._entries)), "expired_flushes", "expired_orphan_spans"))
+        return drained
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 보관 수와 누적 통계"""
+        return {
+            "traces": len(self._entries),
+            "spans": self.spans,
+            "orphan_spans": self.orphan_spans,
+            "ttl_seconds": self.ttl,
+            "max_traces": self.max_traces,
+            "max_spans": self.max_spans,
+            "max_orphan_spans": self.max_orphan_spans,
+            **asdict(self.stats),
+        }
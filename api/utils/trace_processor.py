@@ -1,8 +1,14 @@
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Tuple, Literal
+from typing import Callable, Dict, Any, Optional, List, Set, Tuple, Literal, NamedTuple
+import base64
+import binascii
 import json
+import string
 from dataclasses import dataclass
 
+from opentelemetry.proto.common.v1 import common_pb2
+from opentelemetry.proto.trace.v1 import trace_pb2
+
 @dataclass
 class ProcessExecutionData:
     """ETL 프로세스 실행 데이터 모델"""
@@ -29,218 +35,484 @@ class ProcessExecutionData:
     target_endpoint: Optional[str] = None
     target_object_name: Optional[str] = None
     target_count: Optional[int] = None
-    auto_json: Optional[str] = None
+    # 같은 trace_id의 자동계측 스팬 속성 목록 (process_execution_details에 압축 저장)
+    auto_spans: Optional[List[Dict[str, Any]]] = None
+    # 재전송된 배치의 중복 저장 방지 키 (16진수 문자열)
+    trace_id: Optional[str] = None
+    span_id: Optional[str] = None
 
-def span_to_execution_data(
-        span: Dict[str, Any],
-        resource_attributes: Dict[str, str],
-        auto_instrumentation_spans: Dict[str, List[Dict[str, Any]]]
-    ) -> Optional[ProcessExecutionData]:
-    """스팬 데이터를 ProcessExecution 모델 포맷으로 변환"""
-    # 필수 필드 확인
-    if not all(key in span for key in ["name", "startTimeUnixNano", "endTimeUnixNano"]):
+
+# trace_id 하나에 보관할 자동계측 스팬 최대 수 (0이면 제한 없음)
+DEFAULT_MAX_AUTO_SPANS_PER_TRACE = 100
+
+
+def _has_etl_key(keys) -> bool:
+    """속성 값을 디코딩하지 않고 키만 보고 수동계측(etl.*) 스팬인지 판단"""
+    return any(key.startswith("etl.") for key in keys)
+
+
+def _to_str(value: Any) -> str:
+    """문자열 필드 변환 (배열/키-값 목록은 JSON 문자열로 저장)"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return str(value)
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """건수 필드 변환 (정수로 해석할 수 없는 값은 None)"""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _to_datetime(value: Any) -> datetime:
+    """etl.start_time/etl.end_time(ISO 8601 문자열) 변환 (형식이 잘못되면 ValueError/TypeError)"""
+    if not isinstance(value, str):
+        raise TypeError(f"expected ISO 8601 string, got {type(value).__name__}")
+    return datetime.fromisoformat(value)
+
+
+# etl.* 속성 키 → (ProcessExecutionData 필드명, 그대로 쓸 값 타입, 변환 함수)
+# 스팬 속성을 순회하며 키 하나당 한 번의 dict 조회로 필드 값을 채우고, 타입이 이미 맞으면 변환 함수를 호출하지 않음
+# (목록에 없는 etl.* 키는 값을 디코딩하지 않고 건너뜀)
+ETL_ATTRIBUTE_FIELDS: Dict[str, Tuple[str, type, Callable[[Any], Any]]] = {
+    "etl.process_name": ("process_name", str, _to_str),
+    "etl.group_name": ("group_name", str, _to_str),
+    "etl.script_name": ("script_name", str, _to_str),
+    "etl.platform": ("platform_type", str, _to_str),
+    "etl.start_time": ("start_time", datetime, _to_datetime),
+    "etl.end_time": ("end_time", datetime, _to_datetime),
+    "etl.error": ("error_message", str, _to_str),
+    "etl.error_type": ("error_type", str, _to_str),
+    "etl.source_system_type": ("source_system_type", str, _to_str),
+    "etl.source_system_name": ("source_system_name", str, _to_str),
+    "etl.source_endpoint": ("source_endpoint", str, _to_str),
+    "etl.source_object_name": ("source_object_name", str, _to_str),
+    "etl.source_count": ("source_count", int, _to_int),
+    "etl.target_system_type": ("target_system_type", str, _to_str),
+    "etl.target_system_name": ("target_system_name", str, _to_str),
+    "etl.target_endpoint": ("target_endpoint", str, _to_str),
+    "etl.target_object_name": ("target_object_name", str, _to_str),
+    "etl.target_count": ("target_count", int, _to_int),
+}
+
+
+def _decode_dict_value(value_obj: Dict[str, Any]) -> Any:
+    """MessageToDict 형식의 AnyValue 값을 파이썬 값으로 변환 (값이 없으면 None)"""
+    if not value_obj:
         return None
-        
-    # 속성 추출 
-    attributes = {}
-    for attr in span.get("attributes", []):
-        key = attr.get("key")
-        value_obj = attr.get("value", {})
-        
-        # 타입에 따라 값 추출
-        if "stringValue" in value_obj:
-            value = value_obj["stringValue"]
-        elif "intValue" in value_obj:
-            value = int(value_obj["intValue"])
-        elif "boolValue" in value_obj:
-            value = bool(value_obj["boolValue"])
-        elif "doubleValue" in value_obj:
-            value = float(value_obj["doubleValue"])
-        else:
+    kind, raw = next(iter(value_obj.items()))
+    decoder = _DICT_VALUE_DECODERS.get(kind)
+    return decoder(raw) if decoder is not None else None
+
+
+# MessageToDict AnyValue 키 → 변환 함수 (int64는 문자열, bytes는 base64 문자열로 표현됨)
+_DICT_VALUE_DECODERS: Dict[str, Callable[[Any], Any]] = {
+    "stringValue": str,
+    "intValue": int,
+    "boolValue": bool,
+    "doubleValue": float,
+    "bytesValue": str,
+    "arrayValue": lambda raw: [_decode_dict_value(value) for value in raw.get("values", [])],
+    "kvlistValue": lambda raw: {kv.get("key", ""): _decode_dict_value(kv.get("value", {})) for kv in raw.get("values", [])},
+}
+
+
+def _decode_dict_attributes(attributes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """MessageToDict 형식의 속성 리스트를 한 번에 dict로 변환"""
+    decoded = {}
+    for attr in attributes:
+        value = _decode_dict_value(attr.get("value", {}))
+        if value is not None:
+            decoded[attr.get("key", "")] = value
+    return decoded
+
+
+def _decode_dict_fields(attributes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """MessageToDict 형식의 수동계측 속성을 ETL_ATTRIBUTE_FIELDS에 따라 필드 값 dict로 변환"""
+    fields = {}
+    for attr in attributes:
+        mapping = ETL_ATTRIBUTE_FIELDS.get(attr.get("key"))
+        if mapping is None:
             continue
-            
-        attributes[key] = value
-    
-    # 기본 정보 추출
-    host_name = resource_attributes.get("host.name", "unknown")
-    
+        value = _decode_dict_value(attr.get("value", {}))
+        if value is not None:
+            field_name, value_type, coerce = mapping
+            fields[field_name] = value if type(value) is value_type else coerce(value)
+    return fields
+
+
+# 값을 그대로 꺼내면 되는 protobuf AnyValue oneof 필드명 (getattr 한 번으로 처리)
+_PROTO_SCALAR_KINDS = frozenset(("string_value", "int_value", "bool_value", "double_value"))
+
+
+def _decode_proto_value(value: common_pb2.AnyValue) -> Any:
+    """protobuf AnyValue 값을 파이썬 값으로 변환 (값이 없으면 None)"""
+    kind = value.WhichOneof("value")
+    if kind in _PROTO_SCALAR_KINDS:
+        return getattr(value, kind)
+    decoder = _PROTO_VALUE_DECODERS.get(kind)
+    return decoder(value) if decoder is not None else None
+
+
+# 스칼라 외 protobuf AnyValue oneof 필드명 → 변환 함수 (bytes는 OTLP/JSON과 같이 base64 문자열로 변환)
+_PROTO_VALUE_DECODERS: Dict[str, Callable[[common_pb2.AnyValue], Any]] = {
+    "bytes_value": lambda value: base64.b64encode(value.bytes_value).decode("ascii"),
+    "array_value": lambda value: [_decode_proto_value(item) for item in value.array_value.values],
+    "kvlist_value": lambda value: {kv.key: _decode_proto_value(kv.value) for kv in value.kvlist_value.values},
+}
+
+
+def _decode_proto_attributes(attributes) -> Dict[str, Any]:
+    """protobuf KeyValue 리스트를 한 번에 dict로 변환"""
+    decoded = {}
+    for attr in attributes:
+        value = _decode_proto_value(attr.value)
+        if value is not None:
+            decoded[attr.key] = value
+    return decoded
+
+
+def _decode_proto_fields(attributes) -> Dict[str, Any]:
+    """protobuf 수동계측 속성을 ETL_ATTRIBUTE_FIELDS에 따라 필드 값 dict로 변환"""
+    fields = {}
+    for attr in attributes:
+        mapping = ETL_ATTRIBUTE_FIELDS.get(attr.key)
+        if mapping is None:
+            continue
+        # 대부분인 스칼라 값은 함수 호출 없이 바로 꺼냄
+        any_value = attr.value
+        kind = any_value.WhichOneof("value")
+        value = getattr(any_value, kind) if kind in _PROTO_SCALAR_KINDS else _decode_proto_value(any_value)
+        if value is not None:
+            field_name, value_type, coerce = mapping
+            fields[field_name] = value if type(value) is value_type else coerce(value)
+    return fields
+
+
+class ManualSpan(NamedTuple):
+    """속성 디코딩이 끝난 수동계측(etl.*) 스팬 (fields는 ETL_ATTRIBUTE_FIELDS로 변환한 필드 값)"""
+    name: str
+    start_time_unix_nano: int
+    end_time_unix_nano: int
+    failed: bool
+    trace_id: Any
+    fields: Dict[str, Any]
+    resource_attributes: Dict[str, str]
+    span_id: Any = None
+
+
+def _hex_id(value: Any) -> Optional[str]:
+    """trace_id/span_id를 16진수 문자열로 변환 (protobuf는 bytes, MessageToDict는 base64, OTLP/JSON은 hex 문자열)"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        if len(value) in (16, 32) and all(c in string.hexdigits for c in value):
+            return value.lower()
+        try:
+            value = base64.b64decode(value, validate=True)
+        except (binascii.Error, ValueError):
+            return value.lower()
+    return value.hex()
+
+
+def span_to_execution_data(
+        span: ManualSpan,
+        auto_instrumentation_spans: Dict[Any, List[Dict[str, Any]]]
+    ) -> Optional[ProcessExecutionData]:
+    """디코딩된 수동계측 스팬을 ProcessExecution 모델 포맷으로 변환"""
+    fields = dict(span.fields)
+
     # ETL 프로세스 속성이 있는지 확인 (수동 계측된 스팬인지)
-    if "etl.process_name" not in attributes:
+    if "process_name" not in fields:
         return None
-        
-    # 시간 정보 변환
-    # 시작, 종료 시간 및 duration 계산
-    # 우선 etl.start_time과 etl.end_time (문자열)이 있는지 확인
-    start_time_str = next((attr["value"]["stringValue"] for attr in span.get("attributes", [])
-                            if attr["key"] == "etl.start_time"), None)
-    end_time_str = next((attr["value"]["stringValue"] for attr in span.get("attributes", [])
-                          if attr["key"] == "etl.end_time"), None)
-    
-    if start_time_str and end_time_str:
-        start_time = datetime.fromisoformat(start_time_str)
-        end_time = datetime.fromisoformat(end_time_str)
-    else:
-        # Fallback: convert UnixNano timestamps
-        start_time = datetime.fromtimestamp(int(span.get("startTimeUnixNano")) / 1e9)
-        end_time = datetime.fromtimestamp(int(span.get("endTimeUnixNano")) / 1e9)
-    
-    duration = (end_time - start_time).total_seconds()
-    
-    # 성공 여부
-    success = "SUCCESS"
-    status_code = span.get("status", {}).get("code", "STATUS_CODE_OK")
-    if status_code != "STATUS_CODE_OK":
-        success = "FAILED"
-    
+
+    # 시작, 종료 시간: etl.start_time과 etl.end_time이 모두 있으면 사용하고, 아니면 스팬 UnixNano 시각 사용
+    if not (fields.get("start_time") and fields.get("end_time")):
+        fields["start_time"] = datetime.fromtimestamp(span.start_time_unix_nano / 1e9)
+        fields["end_time"] = datetime.fromtimestamp(span.end_time_unix_nano / 1e9)
+
     # 플랫폼 유형 판별 (속성 또는 네이밍 기반)
-    if "etl.platform" in attributes:
-        platform_type = attributes["etl.platform"]
-    elif "airflow" in span["name"].lower() or "dag" in attributes.get("etl.group_name", "").lower():
-        platform_type = "AirFlow"
-    else:
-        platform_type = "NiFi"
-    
-    # 그룹명과 프로세스명 결정
-    group_name = attributes.get("etl.group_name", "unknown")
-    process_name = attributes.get("etl.process_name", span["name"])
-    script_name = attributes.get("etl.script_name", None)
-
-    # 에러 정보
-    error_message = attributes.get("etl.error", None)
-    error_type = attributes.get("etl.error_type", None)
-    
-    # 소스 시스템 정보 추출
-    source_system_type = attributes.get("etl.source_system_type",None)
-    source_system_name = attributes.get("etl.source_system_name",None)
-    source_endpoint = attributes.get("etl.source_endpoint",None)
-    source_object_name = attributes.get("etl.source_object_name",None)
-    source_count = attributes.get("etl.source_count",None)
-    
-    # 타겟 시스템 정보 추출
-    target_system_type = attributes.get("etl.target_system_type",None)
-    target_system_name = attributes.get("etl.target_system_name",None)
-    target_endpoint = attributes.get("etl.target_endpoint",None)
-    target_object_name = attributes.get("etl.target_object_name",None)
-    target_count = attributes.get("etl.target_count",None)
-    
-    # 문자열 count를 정수로 변환
-    if isinstance(source_count, str) and source_count.isdigit():
-        source_count = int(source_count)
-    if isinstance(target_count, str) and target_count.isdigit():
-        target_count = int(target_count)
-    
-    # 자동계측 데이터 추출 (같은 trace ID를 가진 자동계측 스팬들 찾기)
-    auto_json = None
-    if "traceId" in span:   
-        trace_id = span["traceId"]
-        if trace_id in auto_instrumentation_spans:
-            auto_spans = auto_instrumentation_spans[trace_id]
-            # 자동계측 스팬들의 주요 정보를 JSON으로 변환
-            auto_spans_data = []
-            for auto_span in auto_spans:
-                # span_data = {
-                #     "span_id": auto_span.get("spanId"),
-                #     "name": auto_span.get("name"),
-                #     "kind": auto_span.get("kind", "INTERNAL")
-                # }
-                
-                # 속성 추가
-                span_attributes = {}
-                for attr in auto_span.get("attributes", []):
-                    key = attr.get("key")
-                    value_obj = attr.get("value", {})
-                    if "stringValue" in value_obj:
-                        span_attributes[key] = value_obj["stringValue"]
-                    elif "intValue" in value_obj:
-                        span_attributes[key] = int(value_obj["intValue"])
-                    elif "boolValue" in value_obj:
-                        span_attributes[key] = bool(value_obj["boolValue"])
-                    elif "doubleValue" in value_obj:
-                        span_attributes[key] = float(value_obj["doubleValue"])
-                
-                auto_spans_data.append(span_attributes)
-            
-            if auto_spans_data:
-                auto_json = json.dumps(auto_spans_data)
-
-    # 결과 데이터
+    if "platform_type" not in fields:
+        if "airflow" in span.name.lower() or "dag" in fields.get("group_name", "").lower():
+            fields["platform_type"] = "AirFlow"
+        else:
+            fields["platform_type"] = "NiFi"
+    fields.setdefault("group_name", "unknown")
+    fields.setdefault("script_name", None)
+
+    # 자동계측 데이터 (같은 trace ID를 가진 자동계측 스팬들의 속성, 인덱스에서 바로 조회)
+    auto_spans_data = auto_instrumentation_spans.get(span.trace_id) if span.trace_id else None
+
     return ProcessExecutionData(
-        host_name=host_name,
-        platform_type=platform_type,
-        group_name=group_name,
-        process_name=process_name,
-        script_name=script_name,
-        success=success,
-        start_time=start_time,
-        end_time=end_time,
-        duration_seconds=duration,
-        error_message=error_message,
-        error_type=error_type,
-        source_system_type=source_system_type,
-        source_system_name=source_system_name,
-        source_endpoint=source_endpoint,
-        source_object_name=source_object_name,
-        source_count=source_count,
-        target_system_type=target_system_type,
-        target_system_name=target_system_name,
-        target_endpoint=target_endpoint,
-        target_object_name=target_object_name,
-        target_count=target_count,
-        auto_json=auto_json
+        host_name=span.resource_attributes.get("host.name", "unknown"),
+        success="FAILED" if span.failed else "SUCCESS",
+        duration_seconds=(fields["end_time"] - fields["start_time"]).total_seconds(),
+        auto_spans=auto_spans_data or None,
+        trace_id=_hex_id(span.trace_id),
+        span_id=_hex_id(span.span_id),
+        **fields,
     )
 
 
-def extract_process_executions(trace_data: Dict[str, Any]) -> List[ProcessExecutionData]:
-    """OpenTelemetry 트레이스 데이터에서 프로세스 실행 정보 추출"""
+def _link_executions(
+        manual_spans: List[ManualSpan],
+        auto_instrumentation_spans: Dict[Any, List[Dict[str, Any]]]
+    ) -> List[ProcessExecutionData]:
+    """수동계측 스팬 목록을 trace_id 인덱스의 자동계측 데이터와 연결해 실행 정보로 변환"""
     executions = []
-    
-    # 자동계측 스팬을 trace_id별로 먼저 수집
-    auto_instrumentation_spans = {}
-    
-    # 먼저 전체 trace 데이터에서 자동계측 스팬 찾기
-    for resource_span in trace_data.get("resourceSpans", []):
-        # 리소스 속성 추출
-        resource_attributes = {}
-        for attr in resource_span.get("resource", {}).get("attributes", []):
-            key = attr.get("key")
-            value_obj = attr.get("value", {})
-            if "stringValue" in value_obj:
-                resource_attributes[key] = value_obj["stringValue"]
-    
-        for scope_span in resource_span.get("scopeSpans", []):
-            for span in scope_span.get("spans", []):
-                # 수동계측 스팬 확인 (ETL 속성이 없는 스팬은 자동계측으로 간주)
-                is_manual_instrumentation = False
-                for attr in span.get("attributes", []):
-                    if attr.get("key", "").startswith("etl."):
-                        is_manual_instrumentation = True
-                        break
-                
-                # 자동계측 스팬이면 trace_id별로 저장
-                if not is_manual_instrumentation and "traceId" in span:
-                    trace_id = span["traceId"]
-                    if trace_id not in auto_instrumentation_spans:
-                        auto_instrumentation_spans[trace_id] = []
-                    auto_instrumentation_spans[trace_id].append(span)
-    
-    # 이제 수동계측 스팬을 처리하며 자동계측 데이터와 연결
+    for span in manual_spans:
+        try:
+            execution_data = span_to_execution_data(span, auto_instrumentation_spans)
+        except (TypeError, ValueError):
+            # 변환할 수 없는 스팬은 건너뜀 (ExecutionExtractor.convert와 동일)
+            continue
+        if execution_data:
+            executions.append(execution_data)
+    return executions
+
+
+def extract_process_executions(
+        trace_data: Dict[str, Any],
+        max_auto_spans_per_trace: int = DEFAULT_MAX_AUTO_SPANS_PER_TRACE
+    ) -> List[ProcessExecutionData]:
+    """OpenTelemetry 트레이스 데이터(MessageToDict 형식)에서 프로세스 실행 정보 추출
+
+    수신 경로는 utils.otlp_decoder.decode_stream에서 ExecutionExtractor로 protobuf를 직접 추출하며, 이 함수는 JSON 픽스처 기반 테스트용으로 유지
+    """
+    # 수동계측 스팬과 trace_id가 같은 자동계측 스팬만 인덱스(trace_id -> 속성 목록)에 보관
+    auto_instrumentation_spans: Dict[str, List[Dict[str, Any]]] = {}
+    manual_spans: List[ManualSpan] = []
+
+    resources = []
     for resource_span in trace_data.get("resourceSpans", []):
-        # 리소스 속성 추출
+        # 리소스 속성 추출 (문자열 값만 사용)
         resource_attributes = {}
         for attr in resource_span.get("resource", {}).get("attributes", []):
-            key = attr.get("key")
             value_obj = attr.get("value", {})
             if "stringValue" in value_obj:
-                resource_attributes[key] = value_obj["stringValue"]
-        
-        # 각 스코프의 스팬 처리
-        for scope_span in resource_span.get("scopeSpans", []):
-            for span in scope_span.get("spans", []):
-                execution_data = span_to_execution_data(span, resource_attributes, auto_instrumentation_spans)
-                if execution_data:
-                    executions.append(execution_data)
-    
-    return executions
+                resource_attributes[attr.get("key")] = value_obj["stringValue"]
+
+        spans = [span for scope_span in resource_span.get("scopeSpans", []) for span in scope_span.get("spans", [])]
+        is_manual = [_has_etl_key(attr.get("key", "") for attr in span.get("attributes", [])) for span in spans]
+        resources.append((resource_attributes, spans, is_manual))
+
+    # 1차: 요청 전체의 수동계측 스팬 trace_id 색인 (자동계측 스팬이 다른 리소스에 있을 수 있음)
+    manual_trace_ids = {
+        span.get("traceId")
+        for _, spans, is_manual in resources
+        for span, manual in zip(spans, is_manual) if manual
+    }
+
+    # 2차: 연결할 수 있는 자동계측 스팬만 디코딩
+    for resource_attributes, spans, is_manual in resources:
+        for span, manual in zip(spans, is_manual):
+            trace_id = span.get("traceId")
+
+            if not manual:
+                if trace_id and trace_id in manual_trace_ids:
+                    kept = auto_instrumentation_spans.setdefault(trace_id, [])
+                    if not max_auto_spans_per_trace or len(kept) < max_auto_spans_per_trace:
+                        kept.append(_decode_dict_attributes(span.get("attributes", [])))
+                continue
+
+            # 필수 필드 확인
+            if not all(key in span for key in ["name", "startTimeUnixNano", "endTimeUnixNano"]):
+                continue
+
+            try:
+                start_time_unix_nano = int(span["startTimeUnixNano"])
+                end_time_unix_nano = int(span["endTimeUnixNano"])
+                fields = _decode_dict_fields(span.get("attributes", []))
+            except (TypeError, ValueError):
+                # etl.start_time/etl.end_time 형식 오류 등 변환할 수 없는 스팬은 건너뜀 (protobuf 경로와 동일)
+                continue
+            manual_spans.append(ManualSpan(
+                name=span["name"],
+                start_time_unix_nano=start_time_unix_nano,
+                end_time_unix_nano=end_time_unix_nano,
+                failed=span.get("status", {}).get("code", "STATUS_CODE_OK") != "STATUS_CODE_OK",
+                trace_id=trace_id,
+                fields=fields,
+                resource_attributes=resource_attributes,
+                span_id=span.get("spanId"),
+            ))
+
+    return _link_executions(manual_spans, auto_instrumentation_spans)
+
+
+class ExecutionExtractor:
+    """protobuf ResourceSpans를 하나씩 받아 누적하고, 마지막에 실행 정보로 변환하는 추출기
+
+    요청 전체를 한 번에 파싱하지 않고 ResourceSpans 단위로 처리할 수 있도록 상태(자동계측 인덱스,
+    수동계측 스팬 목록)만 보관합니다. 프로세스 풀 워커에서 만든 부분 결과는 merge로 합칩니다.
+
+    자동계측 스팬은 요청 안에 trace_id가 같은 수동계측 스팬이 있을 때만 trace_id당 max_auto_spans_per_trace개까지
+    속성을 디코딩해 보관합니다. 수동계측 스팬이 이미 나온 trace_id는 바로 디코딩하고, 아직 나오지 않은 trace_id의
+    스팬은 디코딩하지 않은 채 보류했다가 convert(link_auto_spans)에서 요청 전체의 수동계측 trace_id로 거릅니다
+    (보류한 스팬 메시지가 해당 ResourceSpans를 참조하므로 최대 요청 크기만큼 메모리를 더 쓸 수 있음).
+    TraceBuffer는 link_auto_spans에 keep_orphan을 넘겨 연결할 스팬이 없는 자동계측 스팬 중 다른 배치와 연결할 것만 남깁니다.
+    """
+
+    def __init__(self, max_auto_spans_per_trace: int = DEFAULT_MAX_AUTO_SPANS_PER_TRACE):
+        self.max_auto_spans_per_trace = max_auto_spans_per_trace
+        self.auto_instrumentation_spans: Dict[bytes, List[Dict[str, Any]]] = {}
+        self.manual_spans: List[ManualSpan] = []
+        # 지금까지 받은 수동계측 스팬의 trace_id (ResourceSpans 전체 누적)
+        self.manual_trace_ids: Set[bytes] = set()
+        # 수동계측 스팬보다 먼저 도착한 자동계측 스팬 (속성 디코딩 전, trace_id당 max_auto_spans_per_trace개까지)
+        self.pending_auto_spans: Dict[bytes, List[trace_pb2.Span]] = {}
+        # 루트 스팬(parent_span_id 없음)이 끝난 trace_id
+        self.root_trace_ids: Set[bytes] = set()
+        # 실행 정보로 변환하지 못한 수동계측 스팬 수 (OTLP partial_success.rejected_spans)
+        self.rejected_spans = 0
+        # 보관하지 않은 자동계측 스팬 수 (연결할 수동계측 스팬 없음 / trace_id당 최대 수 초과)
+        self.dropped_auto_spans = 0
+        # 받은 전체 스팬 수
+        self.span_count = 0
+
+    def _keep_auto_span(self, trace_id: bytes, attributes) -> bool:
+        kept = self.auto_instrumentation_spans.setdefault(trace_id, [])
+        if self.max_auto_spans_per_trace and len(kept) >= self.max_auto_spans_per_trace:
+            return False
+        kept.append(_decode_proto_attributes(attributes))
+        return True
+
+    def _defer_auto_span(self, trace_id: bytes, span: trace_pb2.Span) -> bool:
+        pending = self.pending_auto_spans.setdefault(trace_id, [])
+        if self.max_auto_spans_per_trace and len(pending) >= self.max_auto_spans_per_trace:
+            return False
+        pending.append(span)
+        return True
+
+    def add_resource_spans(self, resource_span: trace_pb2.ResourceSpans):
+        """ResourceSpans 하나를 수동계측 trace_id 색인 → 스팬 변환 두 단계로 반영"""
+        # 리소스 속성 추출 (문자열 값만 사용)
+        resource_attributes = {
+            attr.key: attr.value.string_value
+            for attr in resource_span.resource.attributes
+            if attr.value.WhichOneof("value") == "string_value"
+        }
+
+        spans = [span for scope_span in resource_span.scope_spans for span in scope_span.spans]
+        self.span_count += len(spans)
+        is_manual = [_has_etl_key(attr.key for attr in span.attributes) for span in spans]
+        # 1차: 수동계측 스팬 trace_id 색인 (속성 값은 디코딩하지 않음, 이전 ResourceSpans 것과 누적)
+        manual_trace_ids = self.manual_trace_ids
+        manual_trace_ids.update(span.trace_id for span, manual in zip(spans, is_manual) if manual and span.trace_id)
+
+        # 2차: 수동계측 스팬 변환, 자동계측 스팬은 연결 가능한 것만 디코딩
+        for span, manual in zip(spans, is_manual):
+            trace_id = span.trace_id
+            if trace_id and not span.parent_span_id:
+                self.root_trace_ids.add(trace_id)
+
+            if not manual:
+                if not trace_id:
+                    kept = False
+                elif trace_id in manual_trace_ids:
+                    kept = self._keep_auto_span(trace_id, span.attributes)
+                else:
+                    # 뒤의 ResourceSpans에서 수동계측 스팬이 나올 수 있으므로 convert까지 보류
+                    kept = self._defer_auto_span(trace_id, span)
+                if not kept:
+                    self.dropped_auto_spans += 1
+                continue
+
+            # 필수 필드 확인 (기본값은 MessageToDict에서 누락되던 것과 동일하게 처리)
+            if not span.name or not span.start_time_unix_nano or not span.end_time_unix_nano:
+                self.rejected_spans += 1
+                continue
+
+            try:
+                fields = _decode_proto_fields(span.attributes)
+            except (TypeError, ValueError):
+                # etl.start_time/etl.end_time 형식 오류 등 변환할 수 없는 속성
+                self.rejected_spans += 1
+                continue
+            # UNSET/OK는 성공, ERROR만 실패로 처리
+            self.manual_spans.append(ManualSpan(
+                name=span.name,
+                start_time_unix_nano=span.start_time_unix_nano,
+                end_time_unix_nano=span.end_time_unix_nano,
+                failed=span.status.code == trace_pb2.Status.STATUS_CODE_ERROR,
+                trace_id=trace_id,
+                fields=fields,
+                resource_attributes=resource_attributes,
+                span_id=span.span_id,
+            ))
+
+    def merge(self, other: "ExecutionExtractor"):
+        """다른 추출기(예: 워커 프로세스 결과)의 누적 상태를 합침"""
+        self.manual_spans.extend(other.manual_spans)
+        self.rejected_spans += other.rejected_spans
+        self.dropped_auto_spans += other.dropped_auto_spans
+        self.span_count += other.span_count
+        self.root_trace_ids |= other.root_trace_ids
+        self.manual_trace_ids |= other.manual_trace_ids
+        for index, other_index in (
+                (self.auto_instrumentation_spans, other.auto_instrumentation_spans),
+                (self.pending_auto_spans, other.pending_auto_spans),
+            ):
+            for trace_id, auto_spans in other_index.items():
+                kept = index.setdefault(trace_id, [])
+                kept.extend(auto_spans)
+                self._trim(kept)
+
+    def _trim(self, auto_spans: List[Any]):
+        """trace_id당 최대 수를 넘는 자동계측 스팬을 버리고 dropped_auto_spans에 집계"""
+        if self.max_auto_spans_per_trace and len(auto_spans) > self.max_auto_spans_per_trace:
+            self.dropped_auto_spans += len(auto_spans) - self.max_auto_spans_per_trace
+            del auto_spans[self.max_auto_spans_per_trace:]
+
+    def link_auto_spans(self, keep_orphan: Optional[Callable[[bytes], bool]] = None):
+        """보류한 자동계측 스팬 중 요청 전체에서 수동계측 스팬과 trace_id가 같은 것만 디코딩해 인덱스에 반영
+
+        나머지는 keep_orphan(trace_id)가 참이면 디코딩해 보관하고, 아니면 dropped_auto_spans로 집계합니다.
+        convert 전에 한 번 호출되며 다시 호출해도 새로 보류한 스팬만 처리합니다.
+        """
+        for trace_id, spans in self.pending_auto_spans.items():
+            if trace_id not in self.manual_trace_ids and not (keep_orphan is not None and keep_orphan(trace_id)):
+                self.dropped_auto_spans += len(spans)
+                continue
+            # 먼저 도착한 보류 스팬을 앞에 둠
+            auto_spans = [_decode_proto_attributes(span.attributes) for span in spans]
+            auto_spans.extend(self.auto_instrumentation_spans.get(trace_id, []))
+            self._trim(auto_spans)
+            self.auto_instrumentation_spans[trace_id] = auto_spans
+        self.pending_auto_spans = {}
+
+    def convert(self) -> List[Tuple[ManualSpan, ProcessExecutionData]]:
+        """누적된 수동계측 스팬을 자동계측 데이터와 연결해 (스팬, 실행 정보) 목록 반환
+
+        etl.process_name이 없거나 etl.start_time/etl.end_time 형식이 잘못된 스팬은 요청 전체를
+        실패시키지 않고 rejected_spans로 집계합니다.
+        """
+        self.link_auto_spans()
+        converted = []
+        for span in self.manual_spans:
+            try:
+                execution_data = span_to_execution_data(span, self.auto_instrumentation_spans)
+            except (TypeError, ValueError):
+                execution_data = None
+            if execution_data is None:
+                self.rejected_spans += 1
+                continue
+            converted.append((span, execution_data))
+        return converted
+
+    def finish(self) -> List[ProcessExecutionData]:
+        """누적된 수동계측 스팬을 자동계측 데이터와 연결해 실행 정보 목록 반환"""
+        return [execution_data for _, execution_data in self.convert()]
+
 
 if __name__ == "__main__":
     with open("/home/younpark/OtelMon/api/utils/test.json", "r") as f: